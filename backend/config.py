@@ -29,11 +29,33 @@ PINECONE_API_KEY = os.getenv('PINECONE_API_KEY')
 PINECONE_ENVIRONMENT = os.getenv('PINECONE_ENVIRONMENT')
 PINECONE_INDEX_NAME = 'vibe-coding-projects'  # Name for your Pinecone index
 PINECONE_DIMENSION = 384  # Dimension for llama-text-embed-v2 embeddings
+PINECONE_INDEX_HOST = os.getenv('PINECONE_INDEX_HOST')  # Index data-plane URL; looked up by name if unset
+PINECONE_API_URL = os.getenv('PINECONE_API_URL', 'https://api.pinecone.io')  # Control-plane API
+PINECONE_API_VERSION = '2025-01'  # Value of the X-Pinecone-API-Version header
+PINECONE_NAMESPACE = os.getenv('PINECONE_NAMESPACE', '')  # Namespace holding the project vectors
+EMBEDDING_MODEL = 'llama-text-embed-v2'  # Pinecone-hosted embedding model
+EMBEDDING_BATCH_SIZE = 96  # Maximum texts per embedding request for llama-text-embed-v2
+EMBEDDING_MAX_INPUT_TOKENS = 2048  # Longest input llama-text-embed-v2 reads; longer texts are truncated before sending
+EMBEDDING_MAX_BATCH_TOKENS = 96 * 512  # Estimated tokens per embedding request; batches are packed up to this
+# Embedding backend: 'pinecone' (hosted EMBEDDING_MODEL) or 'onnx' (LOCAL_EMBEDDING_MODEL on the CPU).
+# Vectors of different models are not comparable: after switching, re-embed the stored
+# posts by replaying the post archive (python -m backend.services.refresh_pipeline replay)
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'pinecone').lower()
+# Concurrent create_embedding() calls (e.g., simultaneous searches) are coalesced into one
+# batched embedding call: a call waits up to EMBEDDING_COALESCE_WINDOW_MS for others to join
+EMBEDDING_COALESCE_WINDOW_MS = 5  # Longest extra wait per query embedding (0 disables coalescing)
+EMBEDDING_COALESCE_MAX_BATCH = 32  # Most queries embedded together
+# Query embeddings are also kept in memory by normalized text, so repeated searches (e.g.,
+# the suggested queries and default interest combinations) skip the embedding step
+QUERY_EMBEDDING_CACHE_SIZE = 1024  # Most query embeddings kept in memory (0 disables)
+QUERY_EMBEDDING_CACHE_TTL_SECONDS = 3600  # How long a query embedding is reused
 
 # OpenAI Configuration (to be implemented)
 # Required for project metadata extraction and plan generation
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 OPENAI_MODEL = 'o4-mini'  # Default model for generating implementation plans
+OPENAI_API_URL = os.getenv('OPENAI_API_URL', 'https://api.openai.com/v1')  # OpenAI REST API base URL
+OPENAI_METADATA_BATCH_SIZE = 10  # Posts sent per metadata extraction request
 
 # Flask Application Settings
 DEBUG = os.getenv('FLASK_DEBUG', True)  # Enable debug mode by default
@@ -42,6 +64,69 @@ PORT = int(os.getenv('PORT', 5000))     # Default port for Flask server
 # Data Refresh Settings
 REFRESH_INTERVAL_HOURS = 48  # Refresh Reddit data every 48 hours
 MAX_POSTS_PER_SUBREDDIT = 50  # Maximum number of posts to fetch per subreddit
+# Adaptive scheduling: each subreddit is refreshed when about ADAPTIVE_REFRESH_TARGET_POSTS
+# new posts are expected from its recent posting rate, but at most every
+# MIN_REFRESH_INTERVAL_HOURS and at least every REFRESH_INTERVAL_HOURS
+MIN_REFRESH_INTERVAL_HOURS = 1  # Shortest per-subreddit refresh interval
+ADAPTIVE_REFRESH_TARGET_POSTS = MAX_POSTS_PER_SUBREDDIT // 2  # New posts expected per refresh
+REFRESH_TICK_MINUTES = 15  # How often the scheduler checks which subreddits are due
+VELOCITY_SMOOTHING = 0.5  # Weight of the latest observed posting rate (0-1)
+# Scheduled jobs take a lease lock first, so with several app processes or replicas only
+# one of them refreshes or sweeps at a time; the others skip that run
+SCHEDULER_LEASE_SECONDS = 600  # Lease length; a crashed holder blocks others this long at most
+SCHEDULER_JITTER_SECONDS = 60  # Random delay added to each job start to spread out replicas
+
+# Refresh Pipeline Settings
+# Stages (scrape, process, deduplicate, enrich, embed, upsert) run concurrently,
+# connected by bounded queues so a slow stage throttles the ones before it
+PIPELINE_QUEUE_SIZE = 500  # Items buffered between two stages
+PIPELINE_BATCH_LINGER_SECONDS = 0.5  # How long a stage waits to fill a batch
+PIPELINE_ENRICH_WORKERS = 2  # Concurrent OpenAI metadata requests
+PIPELINE_EMBED_WORKERS = 2  # Concurrent embedding requests
+PIPELINE_UPSERT_WORKERS = 1  # Concurrent Pinecone upserts
+
+# Local State Storage
+# Directory for files that must survive between refresh runs (e.g., scrape cursors)
+DATA_DIR = Path(os.getenv('DATA_DIR', Path(__file__).resolve().parent / 'data'))
+SCRAPE_CURSOR_FILE = DATA_DIR / 'scrape_cursors.json'  # Newest seen post per subreddit
+REFRESH_SCHEDULE_FILE = DATA_DIR / 'refresh_schedule.json'  # Posting rate and next refresh per subreddit
+JOB_JOURNAL_FILE = DATA_DIR / 'job_journal.sqlite3'  # Per-post refresh progress, for resuming failed runs
+JOB_JOURNAL_RETENTION_DAYS = 7  # How long finished journal entries are kept
+POST_ARCHIVE_DIR = DATA_DIR / 'archive'  # Compressed raw posts, partitioned by creation date
+POST_ARCHIVE_COMPRESSION_LEVEL = 10  # zstd level for archived posts
+SCHEDULER_LOCK_FILE = DATA_DIR / 'scheduler_locks.sqlite3'  # Lease locks of scheduled jobs, shared by all processes
+EMBEDDING_CACHE_ENABLED = os.getenv('EMBEDDING_CACHE_ENABLED', 'true').lower() == 'true'  # Reuse embeddings of unchanged texts
+EMBEDDING_CACHE_FILE = DATA_DIR / 'embedding_cache.sqlite3'  # Embeddings keyed by model, input type and text
+EMBEDDING_CACHE_MAX_ENTRIES = 200000  # Least recently used embeddings are evicted beyond this (~170 MB at 384 dimensions)
+
+# HTTP Record/Replay Fixtures
+# With HTTP_FIXTURE_MODE=record every Reddit, OpenAI and Pinecone response is saved; with
+# HTTP_FIXTURE_MODE=replay requests are answered from the saved responses, offline
+HTTP_FIXTURE_MODE = os.getenv('HTTP_FIXTURE_MODE', '').lower()  # '', 'record' or 'replay'
+HTTP_FIXTURE_DIR = Path(os.getenv('HTTP_FIXTURE_DIR', DATA_DIR / 'fixtures'))  # Recorded responses
+HTTP_FIXTURE_LATENCY_SCALE = float(os.getenv('HTTP_FIXTURE_LATENCY_SCALE', 1.0))  # Replay delay as a multiple of the recorded latency (0 = none)
+
+# Local Embedding Backend (EMBEDDING_BACKEND=onnx)
+LOCAL_EMBEDDING_MODEL = 'all-MiniLM-L6-v2-int8'  # 384-dimensional sentence-embedding model, int8-quantized
+LOCAL_EMBEDDING_MODEL_DIR = Path(os.getenv('LOCAL_EMBEDDING_MODEL_DIR', DATA_DIR / 'models' / 'all-MiniLM-L6-v2'))  # model_int8.onnx and tokenizer.json
+LOCAL_EMBEDDING_MAX_TOKENS = 256  # Tokens per text the model reads (its training sequence length)
+LOCAL_EMBEDDING_THREADS = int(os.getenv('LOCAL_EMBEDDING_THREADS', 0))  # ONNX Runtime intra-op threads (0 = one per core)
+
+# Project Pre-Classification
+# Posts the local classifier scores at or above PROJECT_CONFIDENCE_CUTOFF are flagged as
+# projects. The refresh pipeline only drops posts below PROJECT_DROP_CONFIDENCE, which
+# takes several signs of a question or help request, before paid metadata extraction
+# and embedding; posts the classifier is unsure about are kept
+PROJECT_CONFIDENCE_CUTOFF = 0.5
+PROJECT_DROP_CONFIDENCE = 0.15
+
+# Near-Duplicate Detection
+# Cross-posts and reposts are collapsed into one project before enrichment and embedding
+DEDUP_SIMILARITY_THRESHOLD = 0.8  # Estimated Jaccard similarity at which posts are duplicates
+DEDUP_NUM_PERMUTATIONS = 64  # MinHash signature length
+DEDUP_LSH_BANDS = 16  # LSH bands (must divide DEDUP_NUM_PERMUTATIONS)
+DEDUP_SIGNATURE_FILE = DATA_DIR / 'dedup_signatures.sqlite3'  # Signatures of indexed posts, so later refreshes recognize reposts
+DEDUP_SIGNATURE_RETENTION_DAYS = 30  # How long a post's signature is matched against new posts
 
 # Vector Search Settings
 # Base similarity threshold - can be overridden by dynamic adjustment
@@ -71,4 +156,16 @@ DEFAULT_RESULT_MODE = RESULT_MODE_FIXED
 
 # API Rate Limiting
 REDDIT_RATE_LIMIT = 60  # Maximum requests per minute to Reddit API
+REDDIT_RATE_LIMIT_BURST = 5  # Maximum requests sent back-to-back before spacing kicks in
+REDDIT_ASYNC_BACKEND = os.getenv('REDDIT_ASYNC_BACKEND', 'false').lower() == 'true'  # Scrape with asyncpraw
+REDDIT_MAX_CONCURRENCY = max(1, REDDIT_RATE_LIMIT // 10)  # Reddit requests in flight at once (async backend)
 OPENAI_RATE_LIMIT = 20  # Maximum requests per minute to OpenAI API
+
+# Comment Enrichment
+# Optionally attach a digest of each post's top comments, which often hold the real
+# problem statement or feature wish-list. Costs at most 1 + COMMENT_REPLACE_MORE_LIMIT
+# Reddit requests per post.
+COMMENT_ENRICHMENT_ENABLED = os.getenv('COMMENT_ENRICHMENT_ENABLED', 'false').lower() == 'true'
+COMMENT_TOP_N = 5  # Top-level comments summarized per post
+COMMENT_REPLACE_MORE_LIMIT = 0  # "Load more comments" expansions per post (0 = none)
+COMMENT_DIGEST_MAX_CHARS = 1000  # Maximum length of a comment digest
@@ -0,0 +1,486 @@
+"""
+Near-Duplicate Detection Service for Vibe Coding Project Finder
+
+Cross-posts and reposts are common across the scraped subreddits: the same project is
+often shared in r/SideProject, r/webdev and r/ChatGPTCoding within a few hours. This
+module finds such near-duplicates among processed posts before they are enriched and
+embedded, and collapses each group into one canonical project so we neither pay for
+repeat embeddings and metadata extraction nor return clones in search results.
+
+Similarity is estimated with MinHash signatures over word shingles of each post's
+`content`, and candidate pairs are found with locality-sensitive hashing (LSH): the
+signature is split into bands, and posts that share any band bucket are compared.
+Only candidates whose estimated Jaccard similarity reaches the threshold are merged.
+Texts with fewer than MIN_SHINGLES distinct shingles (e.g., title-only link posts,
+emoji-only or non-Latin posts) have no signature and are never treated as duplicates:
+two short titles like "Roast my portfolio" say nothing about whether the posts behind
+them are the same project.
+
+Signatures of the posts a refresh keeps are saved in a SignatureStore (a small SQLite
+database in DATA_DIR) for DEDUP_SIGNATURE_RETENTION_DAYS, so the next refresh can seed
+its index with them and recognize a repost of a project it indexed days ago.
+
+Usage:
+    from services.dedup_service import collapse_near_duplicates
+
+    processed_posts = process_posts(scrape_subreddits())
+    unique_posts = collapse_near_duplicates(processed_posts)
+
+    # Across refreshes
+    store = SignatureStore()
+    index = NearDuplicateIndex()
+    store.seed(index)
+    ...
+    store.save(index, kept_post_ids)
+"""
+
+import logging  # For logging how many duplicates were collapsed
+import random  # For generating the MinHash permutation parameters
+import re  # For tokenizing post content
+import sqlite3  # For the on-disk signature store
+import struct  # For packing signatures as blobs
+import threading  # For sharing one connection between pipeline workers
+import time  # For signature retention
+import zlib  # For fast, stable 32-bit shingle hashes
+from collections import defaultdict  # For LSH band buckets
+from pathlib import Path  # For cross-platform file paths
+from typing import List, Dict, Any, Optional, Tuple, Iterable  # Type hints for better code documentation
+
+# Import configuration from config file
+from ..config import (
+    DEDUP_SIMILARITY_THRESHOLD,  # Estimated Jaccard similarity that counts as a duplicate
+    DEDUP_NUM_PERMUTATIONS,  # Length of each MinHash signature
+    DEDUP_LSH_BANDS,  # Number of LSH bands the signature is split into
+    DEDUP_SIGNATURE_FILE,  # SQLite file holding signatures of indexed posts
+    DEDUP_SIGNATURE_RETENTION_DAYS,  # How long signatures are kept
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Number of consecutive words per shingle
+SHINGLE_SIZE = 3
+
+# Distinct shingles a text needs before it can be matched (about a ten-word sentence)
+MIN_SHINGLES = 8
+
+# Mersenne prime used as the modulus of the MinHash permutations
+_MERSENNE_PRIME = (1 << 61) - 1
+
+# Lowercase words and numbers; punctuation and formatting are ignored
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    post_id TEXT PRIMARY KEY,
+    signature BLOB NOT NULL,
+    added_at REAL NOT NULL
+)
+"""
+
+
+class MinHasher:
+    """
+    Computes fixed-length MinHash signatures for text.
+
+    Each of the `num_perm` signature slots is the minimum of a random linear hash
+    (a * x + b mod p) over the text's shingle hashes. The fraction of slots on which
+    two signatures agree estimates the Jaccard similarity of their shingle sets.
+    """
+
+    def __init__(self, num_perm: int = DEDUP_NUM_PERMUTATIONS, seed: int = 1):
+        """
+        Args:
+            num_perm (int, optional): Signature length. Defaults to DEDUP_NUM_PERMUTATIONS.
+            seed (int, optional): Seed for the permutation parameters, so signatures
+                from different runs are comparable. Defaults to 1.
+        """
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text (str): Text to sign
+
+        Returns:
+            tuple: `num_perm` integers, or None if the text has fewer than
+            MIN_SHINGLES shingles (too short to tell a duplicate from a lookalike)
+        """
+        hashes = _shingle_hashes(text)
+        if len(hashes) < MIN_SHINGLES:
+            return None
+        return tuple(
+            min((a * x + b) % _MERSENNE_PRIME for x in hashes)
+            for a, b in self._permutations
+        )
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of MinHash signatures for finding near-duplicate texts.
+
+    Use add() to index texts one at a time (e.g., while streaming posts): it returns
+    the key of an already-indexed near-duplicate, or None if the text is new.
+
+    Example:
+        >>> index = NearDuplicateIndex()
+        >>> index.add("a", "I built a habit tracker with Next.js and Supabase")
+        >>> index.add("b", "I built a habit tracker with Next.js and Supabase!")
+        'a'
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEDUP_SIMILARITY_THRESHOLD,
+        num_perm: int = DEDUP_NUM_PERMUTATIONS,
+        bands: int = DEDUP_LSH_BANDS,
+    ):
+        """
+        Args:
+            threshold (float, optional): Minimum estimated Jaccard similarity for a
+                duplicate. Defaults to DEDUP_SIMILARITY_THRESHOLD.
+            num_perm (int, optional): Signature length. Defaults to DEDUP_NUM_PERMUTATIONS.
+            bands (int, optional): Number of LSH bands; must divide num_perm.
+                Defaults to DEDUP_LSH_BANDS.
+
+        Raises:
+            ValueError: If bands does not divide num_perm
+        """
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+        self._buckets: List[Dict[Tuple[int, ...], List[str]]] = [defaultdict(list) for _ in range(bands)]
+
+    def query(self, signature: Tuple[int, ...]) -> Optional[str]:
+        """
+        Find an indexed key whose signature is similar enough to `signature`.
+
+        Args:
+            signature (tuple): MinHash signature from self.hasher
+
+        Returns:
+            str: Key of the most similar indexed near-duplicate, or None
+        """
+        best_key, best_similarity = None, self.threshold
+        seen = set()
+        for band, bucket in enumerate(self._buckets):
+            for key in bucket.get(self._band(signature, band), ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                similarity = estimate_similarity(signature, self._signatures[key])
+                if similarity >= best_similarity:
+                    best_key, best_similarity = key, similarity
+        return best_key
+
+    def insert(self, key: str, signature: Tuple[int, ...]) -> None:
+        """
+        Index a signature under `key`.
+
+        Args:
+            key (str): Identifier returned by later queries
+            signature (tuple): MinHash signature from self.hasher
+        """
+        self._signatures[key] = signature
+        for band, bucket in enumerate(self._buckets):
+            bucket[self._band(signature, band)].append(key)
+
+    def signature(self, key: str) -> Optional[Tuple[int, ...]]:
+        """
+        Return the indexed signature of `key`.
+
+        Args:
+            key (str): Identifier passed to insert() or add()
+
+        Returns:
+            tuple: The signature, or None if `key` is not indexed
+        """
+        return self._signatures.get(key)
+
+    def add(self, key: str, text: str) -> Optional[str]:
+        """
+        Index a text unless it duplicates one that is already indexed.
+
+        A key that is already indexed (e.g., a post seeded from an earlier run)
+        is never reported as a duplicate of itself.
+
+        Args:
+            key (str): Identifier of the text (e.g., post ID)
+            text (str): Text to check
+
+        Returns:
+            str: Key of the existing near-duplicate, or None if the text was indexed
+            (or has no signature, in which case it is not indexed)
+        """
+        if key in self._signatures:
+            return None
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return None
+        duplicate_of = self.query(signature)
+        if duplicate_of is None:
+            self.insert(key, signature)
+        return duplicate_of
+
+    def _band(self, signature: Tuple[int, ...], band: int) -> Tuple[int, ...]:
+        """Return the slice of a signature that belongs to one LSH band."""
+        return signature[band * self.rows:(band + 1) * self.rows]
+
+
+class SignatureStore:
+    """
+    SQLite-backed record of the MinHash signatures of indexed posts.
+
+    Refreshes save the signatures of the posts they keep and seed their
+    NearDuplicateIndex with the saved ones, so reposts are recognized across
+    runs. Signatures older than the retention period are ignored and pruned.
+    All methods are thread-safe.
+
+    Example:
+        >>> store = SignatureStore()
+        >>> index = NearDuplicateIndex()
+        >>> store.seed(index)
+        >>> if index.add(post['id'], post['content']) is None:
+        ...     store.save(index, [post['id']])
+    """
+
+    def __init__(self, path: Optional[Path] = None, retention_days: float = DEDUP_SIGNATURE_RETENTION_DAYS):
+        """
+        Open (and create, if needed) the signature database.
+
+        Args:
+            path (Path, optional): Location of the store.
+                If None, uses DEDUP_SIGNATURE_FILE from config.py.
+            retention_days (float, optional): Age in days after which signatures
+                are no longer matched. Defaults to DEDUP_SIGNATURE_RETENTION_DAYS.
+        """
+        self.path = Path(path or DEDUP_SIGNATURE_FILE)
+        self.retention_days = retention_days
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def seed(self, index: NearDuplicateIndex) -> int:
+        """
+        Insert every signature within the retention period into an index.
+
+        Signatures of another length (saved before DEDUP_NUM_PERMUTATIONS changed)
+        are skipped.
+
+        Args:
+            index (NearDuplicateIndex): Index to seed
+
+        Returns:
+            int: Number of signatures inserted
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT post_id, signature FROM signatures WHERE added_at >= ?", (self._cutoff(),)
+            ).fetchall()
+        seeded = 0
+        for post_id, blob in rows:
+            signature = _unpack(blob)
+            if len(signature) == index.hasher.num_perm:
+                index.insert(post_id, signature)
+                seeded += 1
+        if seeded:
+            logger.info(f"Seeded the near-duplicate index with {seeded} signatures from earlier refreshes")
+        return seeded
+
+    def save(self, index: NearDuplicateIndex, post_ids: Iterable[str]) -> None:
+        """
+        Save the signatures an index holds for some posts.
+
+        Posts the index has no signature for (too short to match) are skipped.
+
+        Args:
+            index (NearDuplicateIndex): Index the posts were added to
+            post_ids (iterable): IDs of the posts to save
+        """
+        now = time.time()
+        rows = []
+        for post_id in post_ids:
+            signature = index.signature(post_id)
+            if signature is not None:
+                rows.append((post_id, _pack(signature), now))
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO signatures (post_id, signature, added_at) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def prune(self) -> int:
+        """
+        Delete signatures older than the retention period.
+
+        Returns:
+            int: Number of deleted signatures
+        """
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM signatures WHERE added_at < ?", (self._cutoff(),)
+            ).rowcount
+            self._conn.commit()
+        if deleted:
+            logger.info(f"Pruned {deleted} expired near-duplicate signatures")
+        return deleted
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _cutoff(self) -> float:
+        """Return the oldest timestamp still within the retention period."""
+        return time.time() - self.retention_days * 86400
+
+
+def estimate_similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """
+    Estimate the Jaccard similarity of two texts from their MinHash signatures.
+
+    Args:
+        first (tuple): MinHash signature
+        second (tuple): MinHash signature of the same length
+
+    Returns:
+        float: Fraction of matching signature slots, between 0 and 1
+    """
+    return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+def collapse_near_duplicates(
+    posts: List[Dict[str, Any]], threshold: float = DEDUP_SIMILARITY_THRESHOLD
+) -> List[Dict[str, Any]]:
+    """
+    Collapse groups of near-duplicate processed posts into canonical projects.
+
+    Posts are grouped transitively: if A duplicates B and B duplicates C, all three
+    form one group. The earliest post of each group (usually the original rather
+    than a cross-post) becomes the canonical project, and the engagement of the
+    whole group is merged into it. refresh_engagement() keeps these sums current
+    by re-summing over the stored duplicate_ids.
+
+    Args:
+        posts (list): Processed post dictionaries as returned by process_posts
+        threshold (float, optional): Minimum estimated Jaccard similarity of `content`
+            for two posts to count as duplicates. Defaults to DEDUP_SIMILARITY_THRESHOLD.
+
+    Returns:
+        list: One post per group, in the order of the canonical posts in the input.
+        Canonical posts that absorbed duplicates have:
+            - score (int): Sum of the group's scores
+            - comment_count (int): Sum of the group's comment counts
+            - is_project (bool): True if any post in the group is a project
+            - project_confidence (float): Highest confidence in the group
+            - duplicate_ids (list): IDs of the collapsed duplicates
+            - subreddits (list): All subreddits the project was posted in
+
+    Example:
+        >>> unique = collapse_near_duplicates(process_posts(raw_posts))
+        >>> len(unique) <= len(raw_posts)
+        True
+    """
+    index = NearDuplicateIndex(threshold=threshold)
+    parent = list(range(len(posts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Link every post to its most similar earlier post, building groups with union-find
+    for position, post in enumerate(posts):
+        signature = index.hasher.signature(post['content'])
+        if signature is None:
+            continue
+        match = index.query(signature)
+        if match is not None:
+            parent[find(position)] = find(int(match))
+        index.insert(str(position), signature)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for position in range(len(posts)):
+        groups[find(position)].append(position)
+
+    collapsed = []
+    for members in groups.values():
+        if len(members) == 1:
+            collapsed.append((members[0], posts[members[0]]))
+            continue
+        group = [posts[position] for position in members]
+        canonical_position = min(members, key=lambda p: (posts[p]['created_at'], posts[p]['id']))
+        collapsed.append((canonical_position, _merge_group(posts[canonical_position], group)))
+
+    collapsed.sort(key=lambda item: item[0])
+    duplicates = len(posts) - len(collapsed)
+    if duplicates:
+        logger.info(f"Collapsed {duplicates} near-duplicate posts into {len(collapsed)} projects")
+    return [post for _, post in collapsed]
+
+
+def _merge_group(canonical: Dict[str, Any], group: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge the engagement of a duplicate group into a copy of its canonical post.
+
+    Args:
+        canonical (dict): Post chosen to represent the group
+        group (list): All posts in the group, including the canonical one
+
+    Returns:
+        dict: Canonical post with merged engagement fields
+    """
+    merged = dict(canonical)
+    merged['score'] = sum(post['score'] for post in group)
+    merged['comment_count'] = sum(post['comment_count'] for post in group)
+    merged['is_project'] = any(post['is_project'] for post in group)
+    merged['project_confidence'] = max(post.get('project_confidence', 0.0) for post in group)
+    merged['duplicate_ids'] = [post['id'] for post in group if post['id'] != canonical['id']]
+    merged['subreddits'] = sorted({post['subreddit'] for post in group}, key=str.lower)
+    return merged
+
+
+def _shingle_hashes(text: str) -> List[int]:
+    """
+    Hash the distinct word shingles of a text.
+
+    Args:
+        text (str): Text to shingle
+
+    Returns:
+        list: 32-bit hashes of the distinct SHINGLE_SIZE-word shingles (empty for
+        texts shorter than one shingle)
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    shingles = {
+        ' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+    return [zlib.crc32(shingle.encode('utf-8')) for shingle in shingles]
+
+
+def _pack(signature: Tuple[int, ...]) -> bytes:
+    """Encode a signature as little-endian unsigned 64-bit integers."""
+    return struct.pack(f'<{len(signature)}Q', *signature)
+
+
+def _unpack(blob: bytes) -> Tuple[int, ...]:
+    """Decode a signature packed by _pack."""
+    return struct.unpack(f'<{len(blob) // 8}Q', blob)
@@ -0,0 +1,263 @@
+"""
+Persistent Embedding Cache for Vibe Coding Project Finder
+
+Every refresh and every archive replay embeds the posts it stores, yet most of those
+texts were embedded before: replays re-process posts that have not changed, and resumed
+or overlapping refreshes see the same posts again. This module keeps every embedding the
+service has paid for in a small SQLite database in DATA_DIR, so only new or edited texts
+trigger a remote embedding call.
+
+Entries are content-addressed: the key is a SHA-256 hash of the embedding backend, the
+vector dimension, the model, the input type ('passage' or 'query', which the model embeds
+differently) and the whitespace- and Unicode-normalized text. Editing a post changes its
+key, so a stale vector is never returned; switching EMBEDDING_BACKEND, EMBEDDING_MODEL or
+PINECONE_DIMENSION simply stops matching the old entries. A stored vector of the wrong
+length is treated as a miss.
+
+Vectors are stored as float16 blobs (768 bytes for 384 dimensions). The cache holds at
+most EMBEDDING_CACHE_MAX_ENTRIES vectors; when it grows beyond that, the least recently
+used entries are evicted. Several processes may share the file, so the size is counted
+in the database rather than tracked per process; to keep writes cheap it is only counted
+every EVICTION_CHECK_INTERVAL stored vectors, and the cache may overshoot its bound by
+that much per writing process in between. Likewise, lookups remember which entries they
+used and write the new last-used times back in batches instead of on every hit. Hits and
+misses are counted per process.
+
+Usage:
+    from services.embedding_cache import EmbeddingCache
+
+    cache = EmbeddingCache()
+    found = cache.get_many(EMBEDDING_MODEL, 'passage', texts)  # index -> vector
+    cache.put_many(EMBEDDING_MODEL, 'passage', new_texts, new_vectors)
+    print(cache.stats())
+"""
+
+import hashlib  # For content-addressed keys
+import logging  # For logging evictions
+import sqlite3  # For the on-disk cache
+import struct  # For packing vectors as float16 blobs
+import threading  # For sharing one connection between pipeline workers
+import time  # For least-recently-used timestamps
+import unicodedata  # For normalizing text before hashing
+from pathlib import Path  # For cross-platform file paths
+from typing import List, Dict, Any, Optional  # Type hints for better code documentation
+
+# Import configuration from config file
+from ..config import (
+    EMBEDDING_CACHE_FILE,  # SQLite file holding cached embeddings
+    EMBEDDING_CACHE_MAX_ENTRIES,  # Size bound of the cache
+    EMBEDDING_BACKEND,  # Backend that computed the vectors
+    PINECONE_DIMENSION,  # Length of every cached vector
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Keys looked up per query, well below SQLite's limit on query parameters
+LOOKUP_CHUNK_SIZE = 500
+
+# Vectors stored by one process between two checks of the cache size
+EVICTION_CHECK_INTERVAL = 1000
+
+# Last-used times are written back once this many are pending or the oldest
+# pending one is this many seconds old
+TOUCH_FLUSH_SIZE = 1000
+TOUCH_FLUSH_SECONDS = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key BLOB PRIMARY KEY,
+    vector BLOB NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+_INDEX = "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+
+
+class EmbeddingCache:
+    """
+    Disk-backed, size-bounded LRU cache of embeddings.
+
+    All methods are thread-safe, so pipeline workers can share one cache.
+
+    Example:
+        >>> cache = EmbeddingCache()
+        >>> cache.put_many('llama-text-embed-v2', 'passage', ["hello"], [vector])
+        >>> list(cache.get_many('llama-text-embed-v2', 'passage', ["other", "hello "]))
+        [1]
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: Optional[int] = None):
+        """
+        Open (and create, if needed) the cache database.
+
+        Args:
+            path (Path, optional): Location of the cache.
+                If None, uses EMBEDDING_CACHE_FILE from config.py.
+            max_entries (int, optional): Maximum number of cached vectors.
+                Defaults to EMBEDDING_CACHE_MAX_ENTRIES.
+        """
+        self.path = Path(path or EMBEDDING_CACHE_FILE)
+        self.max_entries = max_entries or EMBEDDING_CACHE_MAX_ENTRIES
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+        # Last-used times of cache hits not yet written to the database
+        self._touched: Dict[bytes, float] = {}
+        self._touched_since = 0.0
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(_SCHEMA)
+        self._conn.execute(_INDEX)
+        self._conn.commit()
+
+    def get_many(self, model: str, input_type: str, texts: List[str]) -> Dict[int, List[float]]:
+        """
+        Look up cached embeddings and mark the found ones as recently used.
+
+        Args:
+            model (str): Embedding model name
+            input_type (str): 'passage' or 'query'
+            texts (list): Texts to look up
+
+        Returns:
+            dict: Position in `texts` to vector, for the texts that are cached
+        """
+        keys = [cache_key(model, input_type, text) for text in texts]
+        found: Dict[bytes, List[float]] = {}
+        with self._lock:
+            unique = list(dict.fromkeys(keys))
+            for start in range(0, len(unique), LOOKUP_CHUNK_SIZE):
+                chunk = unique[start:start + LOOKUP_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                for key, blob in self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ):
+                    vector = _unpack(blob)
+                    if len(vector) == PINECONE_DIMENSION:
+                        found[bytes(key)] = vector
+            if found:
+                now = time.time()
+                if not self._touched:
+                    self._touched_since = now
+                self._touched.update((key, now) for key in found)
+                if len(self._touched) >= TOUCH_FLUSH_SIZE or now - self._touched_since >= TOUCH_FLUSH_SECONDS:
+                    self._flush_touched()
+                    self._conn.commit()
+
+            result = {position: found[key] for position, key in enumerate(keys) if key in found}
+            self.hits += len(result)
+            self.misses += len(keys) - len(result)
+        return result
+
+    def put_many(self, model: str, input_type: str, texts: List[str], vectors: List[List[float]]) -> None:
+        """
+        Store embeddings, evicting the least recently used entries if the cache is full.
+
+        Args:
+            model (str): Embedding model name
+            input_type (str): 'passage' or 'query'
+            texts (list): Embedded texts
+            vectors (list): One vector per text, in the same order
+
+        Raises:
+            ValueError: If the lists differ in length
+        """
+        if len(texts) != len(vectors):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(texts)} texts")
+        now = time.time()
+        rows = {cache_key(model, input_type, text): _pack(vector) for text, vector in zip(texts, vectors)}
+        with self._lock:
+            for key in rows:
+                self._touched.pop(key, None)
+            # Pending last-used times ride along with the write, so eviction sees them
+            self._flush_touched()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [(key, blob, now) for key, blob in rows.items()],
+            )
+            self._writes_since_check += len(rows)
+            if self._writes_since_check >= EVICTION_CHECK_INTERVAL:
+                self._evict_excess()
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report the cache's size and this process's hit rate.
+
+        Returns:
+            dict: 'entries', 'max_entries', 'hits', 'misses' and 'hit_rate'
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                'entries': entries,
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    def close(self) -> None:
+        """Write back pending last-used times and close the database connection."""
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+            self._conn.close()
+
+    def _evict_excess(self) -> None:
+        """Delete the least recently used entries beyond max_entries; lock must be held."""
+        self._writes_since_check = 0
+        # Counted inside the write transaction, so rows other processes added are included
+        excess = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            logger.debug(f"Evicted {excess} least recently used embeddings")
+
+    def _flush_touched(self) -> None:
+        """Write pending last-used times without committing; lock must be held."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()],
+            )
+            self._touched.clear()
+
+
+def cache_key(model: str, input_type: str, text: str) -> bytes:
+    """
+    Compute the content address of an embedding.
+
+    The configured EMBEDDING_BACKEND and PINECONE_DIMENSION are part of the key,
+    so vectors from another backend or of another size are never returned.
+
+    Args:
+        model (str): Embedding model name
+        input_type (str): 'passage' or 'query'
+        text (str): Embedded text; Unicode form and whitespace do not matter
+
+    Returns:
+        bytes: SHA-256 digest
+    """
+    normalized = ' '.join(unicodedata.normalize('NFC', text).split())
+    scope = f"{EMBEDDING_BACKEND}\0{PINECONE_DIMENSION}\0{model}\0{input_type}"
+    return hashlib.sha256(f"{scope}\0{normalized}".encode('utf-8')).digest()
+
+
+def _pack(vector: List[float]) -> bytes:
+    """Encode a vector as little-endian float16."""
+    return struct.pack(f'<{len(vector)}e', *vector)
+
+
+def _unpack(blob: bytes) -> List[float]:
+    """Decode a little-endian float16 vector."""
+    return list(struct.unpack(f'<{len(blob) // 2}e', blob))
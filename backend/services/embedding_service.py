@@ -0,0 +1,415 @@
+"""
+Embedding Service for Vibe Coding Project Finder
+
+This module turns text into vector embeddings with llama-text-embed-v2, hosted by
+Pinecone. Posts are embedded as 'passage' inputs when they are stored, and user
+queries as 'query' inputs at search time, as the model expects.
+
+With EMBEDDING_BACKEND=onnx, a local int8 model on the CPU is used instead (see
+local_embedding_service), which takes the network round-trip out of every search.
+The two backends' vectors are not comparable, so the index must be rebuilt after
+switching.
+
+Concurrent create_embedding() calls are coalesced: calls arriving within
+EMBEDDING_COALESCE_WINDOW_MS of each other are embedded together in one batch (see
+utils.helpers.MicroBatcher), so a burst of searches costs one model call, not one each.
+
+Query embeddings are additionally kept in an in-memory LRU cache keyed on the
+normalized query text (case, Unicode form and whitespace do not matter), for up to
+QUERY_EMBEDDING_CACHE_TTL_SECONDS. A repeated search skips the embedding step
+entirely, and concurrent searches for the same uncached text share one computation.
+
+Passage embeddings are cached on disk (see embedding_cache), so a post whose text has
+not changed since it was last embedded, e.g. during an archive replay, costs no request.
+Query embeddings skip the disk cache, whose reads and writes would add disk I/O to
+every search, and rely on the in-memory query cache instead.
+
+Texts are packed into requests by estimated token count rather than a fixed number of
+texts: a request holds at most EMBEDDING_BATCH_SIZE texts and about
+EMBEDDING_MAX_BATCH_TOKENS tokens, so batches of short titles fill up to the input
+limit while long selftexts never push a request over the token limit. Texts longer than
+EMBEDDING_MAX_INPUT_TOKENS are truncated up front, since the model ignores the rest.
+
+Usage:
+    from services.embedding_service import create_embedding, batch_process_embeddings
+
+    # Embed a search query
+    query_vector = create_embedding("A weekend project about curriculum planning")
+
+    # Embed processed posts in as few requests as the provider's limits allow
+    vectors = batch_process_embeddings(processed_posts)
+"""
+
+import atexit  # For writing back the cache's pending state at shutdown
+import logging  # For logging info, warnings, and errors during embedding
+import os  # For resetting shared state in forked children
+import threading  # For creating the shared cache only once
+import unicodedata  # For normalizing query cache keys
+from typing import List, Dict, Any, Optional, Iterator  # Type hints for better code documentation
+
+# Import configuration from config file
+from ..config import (
+    EMBEDDING_MODEL,  # Hosted model used by the pinecone backend
+    EMBEDDING_BATCH_SIZE,  # Maximum texts per embedding request
+    EMBEDDING_MAX_INPUT_TOKENS,  # Longest input the model reads
+    EMBEDDING_MAX_BATCH_TOKENS,  # Estimated tokens per embedding request
+    EMBEDDING_CACHE_ENABLED,  # Whether embeddings of unchanged texts are reused
+    EMBEDDING_BACKEND,  # 'pinecone' (hosted) or 'onnx' (local CPU model)
+    LOCAL_EMBEDDING_MODEL,  # Model the locally computed embeddings belong to
+    EMBEDDING_COALESCE_WINDOW_MS,  # How long a query embedding waits for others to join its batch
+    EMBEDDING_COALESCE_MAX_BATCH,  # Most query embeddings per coalesced batch
+    QUERY_EMBEDDING_CACHE_SIZE,  # Query embeddings kept in memory
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS,  # Lifetime of an in-memory query embedding
+)
+from ..utils.helpers import MicroBatcher, SingleFlight, TTLCache  # Coalescing, deduplication and caching of embedding calls
+from .embedding_cache import EmbeddingCache  # Disk-backed embedding cache
+from .pinecone_service import embed  # Pinecone-hosted inference
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Characters per token assumed when estimating token counts. Real English text averages
+# about four; three over-estimates slightly, so packed requests stay under the limit.
+CHARS_PER_TOKEN = 3
+
+# Supported values of EMBEDDING_BACKEND
+EMBEDDING_BACKENDS = ('pinecone', 'onnx')
+
+# Coalesced batches that may be embedded at the same time
+COALESCE_WORKERS = 2
+
+# Shared embedding cache, created on first use by get_embedding_cache()
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+# One coalescer per input type, created on first use by _get_batcher()
+_batchers: Dict[str, MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+# Recent query embeddings by normalized text, and the ones currently being computed
+_query_cache = TTLCache(QUERY_EMBEDDING_CACHE_SIZE, ttl_seconds=QUERY_EMBEDDING_CACHE_TTL_SECONDS)
+_query_flights = SingleFlight()
+
+
+def create_embedding(text: str, input_type: str = 'query') -> List[float]:
+    """
+    Create a vector embedding for a single text.
+
+    Query embeddings are served from the in-memory query cache when possible;
+    concurrent misses on the same query share one computation. Other concurrent
+    calls are coalesced into one batched embedding call, which adds at most
+    EMBEDDING_COALESCE_WINDOW_MS of latency.
+
+    Args:
+        text (str): Text to embed
+        input_type (str, optional): 'query' for search queries or 'passage' for
+            stored documents. Defaults to 'query'.
+
+    Returns:
+        list: PINECONE_DIMENSION floats
+
+    Raises:
+        ValueError: If the text is empty or EMBEDDING_BACKEND is unknown
+        PineconeError: If the embedding request fails
+
+    Example:
+        >>> vector = create_embedding("What is a cool project to work on this weekend?")
+        >>> len(vector)
+        384
+    """
+    if not text or not text.strip():
+        raise ValueError("Cannot embed empty text")
+    if input_type != 'query' or QUERY_EMBEDDING_CACHE_SIZE <= 0:
+        return _create_embedding_uncached(text, input_type)
+
+    key = normalize_query(text)
+    vector = _query_cache.get(key)
+    if vector is None:
+        vector = _query_flights.do(key, lambda: _compute_query_embedding(key, text))
+    # Callers get their own copy, so none of them can alter the cached vector
+    return list(vector)
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize a search query for use as a query cache key.
+
+    Args:
+        text (str): Query text
+
+    Returns:
+        str: The text in NFC form, case-folded, with runs of whitespace collapsed
+
+    Example:
+        >>> normalize_query("  What is a cool  project\tto work on this weekend ")
+        'what is a cool project to work on this weekend'
+    """
+    return ' '.join(unicodedata.normalize('NFC', text).casefold().split())
+
+
+def query_cache_stats() -> Dict[str, Any]:
+    """
+    Report the in-memory query cache's size and hit rate.
+
+    Returns:
+        dict: 'entries', 'hits', 'misses' and 'hit_rate'
+    """
+    return _query_cache.stats()
+
+
+def _compute_query_embedding(key: str, text: str) -> List[float]:
+    """Embed a query that missed the query cache and cache the result under `key`."""
+    vector = _create_embedding_uncached(text, 'query')
+    _query_cache.set(key, vector)
+    return vector
+
+
+def _create_embedding_uncached(text: str, input_type: str) -> List[float]:
+    """Embed one text through the coalescer (or directly, if coalescing is disabled)."""
+    if EMBEDDING_COALESCE_WINDOW_MS <= 0:
+        return _embed_cached([text], input_type)[0]
+    return _get_batcher(input_type).submit(text)
+
+
+def batch_process_embeddings(
+    posts: List[Dict[str, Any]], batch_size: Optional[int] = None
+) -> List[List[float]]:
+    """
+    Create embeddings for processed posts in batches.
+
+    Only posts whose embedding text is not in the embedding cache are sent to
+    the model; repeated texts within the call are embedded once. The rest are
+    packed into requests by estimated token count (see the module docstring).
+
+    Args:
+        posts (list): Processed post dictionaries as returned by process_posts
+        batch_size (int, optional): Maximum texts per request. Defaults to EMBEDDING_BATCH_SIZE.
+
+    Returns:
+        list: One embedding per post, in the same order
+
+    Raises:
+        PineconeError: If an embedding request fails
+
+    Example:
+        >>> vectors = batch_process_embeddings(processed_posts)
+        >>> len(vectors) == len(processed_posts)
+        True
+    """
+    texts = [post_embedding_text(post) for post in posts]
+    return _embed_cached(texts, 'passage', batch_size)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate how many tokens the embedding model will see for a text.
+
+    Args:
+        text (str): Text to embed
+
+    Returns:
+        int: Estimated token count (errs on the high side)
+    """
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def truncate_for_embedding(text: str, max_tokens: int = EMBEDDING_MAX_INPUT_TOKENS) -> str:
+    """
+    Cut a text to about the number of tokens the embedding model reads.
+
+    The model would ignore the rest anyway; cutting it off before sending saves
+    request size and keeps the estimate of the batch's tokens accurate. Texts
+    are cut at a word boundary.
+
+    Args:
+        text (str): Text to embed
+        max_tokens (int, optional): Token budget. Defaults to EMBEDDING_MAX_INPUT_TOKENS.
+
+    Returns:
+        str: The text, or its beginning if it is too long
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(' ', 1)[0]
+
+
+def token_batches(
+    texts: List[str], max_inputs: int = EMBEDDING_BATCH_SIZE, max_tokens: int = EMBEDDING_MAX_BATCH_TOKENS
+) -> Iterator[List[str]]:
+    """
+    Pack texts into request-sized batches by count and estimated tokens.
+
+    Texts keep their order; a batch is closed when the next text would exceed
+    either limit. A single text over `max_tokens` gets a batch of its own.
+
+    Args:
+        texts (list): Texts to embed
+        max_inputs (int, optional): Maximum texts per batch. Defaults to EMBEDDING_BATCH_SIZE.
+        max_tokens (int, optional): Maximum estimated tokens per batch.
+            Defaults to EMBEDDING_MAX_BATCH_TOKENS.
+
+    Yields:
+        list: Consecutive texts forming one request
+
+    Example:
+        >>> [len(batch) for batch in token_batches(["short"] * 200)]
+        [96, 96, 8]
+    """
+    batch: List[str] = []
+    tokens = 0
+    for text in texts:
+        text_tokens = estimate_tokens(text)
+        if batch and (len(batch) >= max_inputs or tokens + text_tokens > max_tokens):
+            yield batch
+            batch, tokens = [], 0
+        batch.append(text)
+        tokens += text_tokens
+    if batch:
+        yield batch
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Return the shared embedding cache, creating it on first use.
+
+    Returns:
+        EmbeddingCache: The cache, or None if EMBEDDING_CACHE_ENABLED is off
+    """
+    global _cache
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache()
+                atexit.register(_close_cache)
+    return _cache
+
+
+def _close_cache() -> None:
+    """Close the shared cache, if this process opened one, so its last-used times are saved."""
+    if _cache is not None:
+        _cache.close()
+
+
+def _reset_after_fork() -> None:
+    """Drop the parent's cache connection and replace locks other parent threads may have held."""
+    global _cache, _cache_lock, _batchers_lock
+    _cache_lock = threading.Lock()
+    _cache = None
+    # The batchers themselves restart their workers in the child (see MicroBatcher)
+    _batchers_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _get_batcher(input_type: str) -> MicroBatcher:
+    """Return the coalescer for single-text embeddings of one input type."""
+    batcher = _batchers.get(input_type)
+    if batcher is None:
+        with _batchers_lock:
+            batcher = _batchers.get(input_type)
+            if batcher is None:
+                batcher = _batchers[input_type] = MicroBatcher(
+                    lambda texts: _embed_cached(texts, input_type),
+                    max_batch_size=EMBEDDING_COALESCE_MAX_BATCH,
+                    max_wait_ms=EMBEDDING_COALESCE_WINDOW_MS,
+                    workers=COALESCE_WORKERS,
+                    name=f"embed-{input_type}",
+                )
+    return batcher
+
+
+def _embed_cached(texts: List[str], input_type: str, batch_size: Optional[int] = None) -> List[List[float]]:
+    """
+    Embed texts, reusing cached embeddings and caching the new ones.
+
+    Only passages go through the disk cache; queries are embedded directly and
+    cached in memory by create_embedding().
+
+    Args:
+        texts (list): Texts to embed
+        input_type (str): 'passage' or 'query'
+        batch_size (int, optional): Maximum texts per embedding request.
+            Defaults to EMBEDDING_BATCH_SIZE.
+
+    Returns:
+        list: One embedding per text, in the same order
+    """
+    texts = [truncate_for_embedding(text) for text in texts]
+    model = embedding_model_name()
+    cache = get_embedding_cache() if input_type == 'passage' else None
+    embeddings: List[Optional[List[float]]] = [None] * len(texts)
+    if cache is not None:
+        for position, vector in cache.get_many(model, input_type, texts).items():
+            embeddings[position] = vector
+
+    # Embed each missing text once, however often it occurs
+    missing: Dict[str, List[int]] = {}
+    for position, text in enumerate(texts):
+        if embeddings[position] is None:
+            missing.setdefault(text, []).append(position)
+    pending = list(missing)
+
+    request_count = 0
+    for batch in token_batches(pending, max_inputs=batch_size or EMBEDDING_BATCH_SIZE):
+        vectors = _embed_batch(batch, input_type)
+        request_count += 1
+        if cache is not None:
+            cache.put_many(model, input_type, batch, vectors)
+        for text, vector in zip(batch, vectors):
+            for position in missing[text]:
+                embeddings[position] = vector
+
+    if len(texts) > 1 and input_type == 'passage':
+        logger.info(
+            f"Embedded {len(texts)} texts: {len(texts) - len(pending)} from cache, "
+            f"{len(pending)} in {request_count} requests"
+        )
+    return embeddings
+
+
+def embedding_model_name() -> str:
+    """
+    Return the name of the model the configured backend embeds with.
+
+    Returns:
+        str: EMBEDDING_MODEL or LOCAL_EMBEDDING_MODEL
+
+    Raises:
+        ValueError: If EMBEDDING_BACKEND is unknown
+    """
+    if EMBEDDING_BACKEND not in EMBEDDING_BACKENDS:
+        raise ValueError(f"EMBEDDING_BACKEND must be one of {EMBEDDING_BACKENDS}, got {EMBEDDING_BACKEND!r}")
+    return LOCAL_EMBEDDING_MODEL if EMBEDDING_BACKEND == 'onnx' else EMBEDDING_MODEL
+
+
+def _embed_batch(texts: List[str], input_type: str) -> List[List[float]]:
+    """Embed one batch with the configured backend."""
+    if EMBEDDING_BACKEND == 'onnx':
+        # Imported here so the hosted backend needs no ONNX Runtime installation
+        from .local_embedding_service import get_local_model
+        return get_local_model().embed(texts)
+    return embed(texts, input_type=input_type)
+
+
+def post_embedding_text(post: Dict[str, Any]) -> str:
+    """
+    Build the text that represents a post in the vector index.
+
+    The digest of the post's top comments, when present, is appended because
+    comments often describe the problem or the wished-for features better than
+    the post itself.
+
+    Args:
+        post (dict): Processed post dictionary
+
+    Returns:
+        str: Text to embed
+    """
+    if post.get('comment_digest'):
+        return f"{post['content']}\n\nTop comments:\n{post['comment_digest']}"
+    return post['content']
@@ -0,0 +1,228 @@
+"""
+Refresh Job Journal for Vibe Coding Project Finder
+
+This module records how far every post of a refresh has made it through the pipeline,
+so a refresh that dies halfway (rate-limit storm, OpenAI outage, deploy) can be resumed
+instead of starting from zero. The journal is a small SQLite database in DATA_DIR with
+one row per post: the last stage the post completed and the post as that stage left it.
+
+Stages, in order:
+    scraped -> processed -> enriched -> embedded -> upserted
+
+A post that was filtered out (not a project, invalid, or a near-duplicate) is marked
+'skipped'. 'upserted' and 'skipped' are final; every other stage is unfinished work that
+the next refresh picks up where it stopped, so a failed run only loses its in-flight
+batches rather than every OpenAI and embedding call it had already paid for.
+
+Usage:
+    from services.job_journal import JobJournal
+
+    journal = JobJournal()
+    for stage, post in journal.unfinished():
+        ...  # continue the post after `stage`
+    journal.record('enriched', enriched_posts)
+"""
+
+import datetime  # For timestamping journal entries
+import json  # For storing post payloads
+import logging  # For logging resumed and pruned work
+import sqlite3  # For the on-disk journal
+import threading  # For sharing one connection between pipeline workers
+from pathlib import Path  # For cross-platform file paths
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple  # Type hints for better code documentation
+
+# Import configuration from config file
+from ..config import (
+    JOB_JOURNAL_FILE,  # SQLite file holding per-post refresh progress
+    JOB_JOURNAL_RETENTION_DAYS,  # How long finished entries are kept
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Pipeline stages in the order posts complete them
+STAGES = ('scraped', 'processed', 'enriched', 'embedded', 'upserted')
+
+# Marks posts that were dropped by a stage and need no further work
+SKIPPED = 'skipped'
+
+# Stages after which a post needs no further work
+FINAL_STAGES = ('upserted', SKIPPED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    post_id TEXT PRIMARY KEY,
+    stage TEXT NOT NULL,
+    payload TEXT,
+    updated_at TEXT NOT NULL
+)
+"""
+
+
+class JobJournal:
+    """
+    SQLite-backed record of each post's progress through the refresh pipeline.
+
+    All methods are thread-safe, so pipeline workers can share one journal.
+    Payloads are only kept while a post is unfinished; final stages store no payload.
+
+    Example:
+        >>> journal = JobJournal()
+        >>> journal.record('scraped', [raw_post])
+        >>> journal.stages([raw_post['id']])
+        {'abc123': 'scraped'}
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Open (and create, if needed) the journal database.
+
+        Args:
+            path (Path, optional): Location of the journal.
+                If None, uses JOB_JOURNAL_FILE from config.py.
+        """
+        self.path = Path(path or JOB_JOURNAL_FILE)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def record(self, stage: str, posts: Iterable[Dict[str, Any]]) -> None:
+        """
+        Mark posts as having completed a stage.
+
+        Args:
+            stage (str): One of STAGES
+            posts (iterable): Post dictionaries as the stage produced them (need 'id')
+
+        Raises:
+            ValueError: If the stage is unknown
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown journal stage: {stage}")
+        now = _now()
+        rows = [
+            (post['id'], stage, None if stage in FINAL_STAGES else json.dumps(post, default=str), now)
+            for post in posts
+        ]
+        self._write(rows)
+
+    def skip(self, post_ids: Iterable[str]) -> None:
+        """
+        Mark posts as dropped, so they are never resumed.
+
+        Args:
+            post_ids (iterable): IDs of the dropped posts
+        """
+        now = _now()
+        self._write([(post_id, SKIPPED, None, now) for post_id in post_ids])
+
+    def stages(self, post_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Look up the last completed stage of posts.
+
+        Args:
+            post_ids (iterable): Post IDs
+
+        Returns:
+            dict: Post ID to stage, for the posts that are in the journal
+        """
+        post_ids = list(post_ids)
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's limit on query parameters
+            for start in range(0, len(post_ids), 500):
+                chunk = post_ids[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                found.update(self._conn.execute(
+                    f"SELECT post_id, stage FROM posts WHERE post_id IN ({placeholders})", chunk
+                ).fetchall())
+        return found
+
+    def unfinished(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Return the posts an earlier refresh left unfinished.
+
+        Returns:
+            iterator: (stage, post) pairs, where `post` is the payload recorded
+            when the post completed `stage`
+        """
+        placeholders = ','.join('?' * len(FINAL_STAGES))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT stage, payload FROM posts WHERE stage NOT IN ({placeholders}) ORDER BY updated_at",
+                FINAL_STAGES,
+            ).fetchall()
+        if rows:
+            logger.info(f"Resuming {len(rows)} unfinished posts from the job journal")
+        return ((stage, json.loads(payload)) for stage, payload in rows)
+
+    def prune(self, retention_days: float = JOB_JOURNAL_RETENTION_DAYS) -> int:
+        """
+        Delete finished entries older than the retention period.
+
+        Finished entries are kept for a while so a re-scraped post (e.g., after a
+        refresh whose scrape cursors were discarded) is not processed twice.
+
+        Args:
+            retention_days (float, optional): Age in days after which finished
+                entries are deleted. Defaults to JOB_JOURNAL_RETENTION_DAYS.
+
+        Returns:
+            int: Number of deleted entries
+        """
+        cutoff = (
+            datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=retention_days)
+        ).isoformat()
+        placeholders = ','.join('?' * len(FINAL_STAGES))
+        with self._lock:
+            deleted = self._conn.execute(
+                f"DELETE FROM posts WHERE stage IN ({placeholders}) AND updated_at < ?",
+                (*FINAL_STAGES, cutoff),
+            ).rowcount
+            self._conn.commit()
+        if deleted:
+            logger.info(f"Pruned {deleted} finished entries from the job journal")
+        return deleted
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, rows: List[Tuple[str, str, Optional[str], str]]) -> None:
+        """Insert or replace journal rows in a single transaction."""
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO posts (post_id, stage, payload, updated_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+
+def stage_reached(stage: Optional[str], target: str) -> bool:
+    """
+    Check whether a post at `stage` has already completed `target`.
+
+    Args:
+        stage (str): Post's last completed stage from the journal, or None
+        target (str): One of STAGES
+
+    Returns:
+        bool: True if the post needs no more work for `target`
+    """
+    if stage is None:
+        return False
+    if stage == SKIPPED:
+        return True
+    return STAGES.index(stage) >= STAGES.index(target)
+
+
+def _now() -> str:
+    """Return the current UTC time as an ISO string."""
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
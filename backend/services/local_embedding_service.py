@@ -0,0 +1,259 @@
+"""
+Local CPU Embedding Backend for Vibe Coding Project Finder
+
+With the default 'pinecone' backend every search first waits for a round-trip to the
+hosted embedding model, which dominates search latency and fails whenever the provider
+is down. This module is the alternative 'onnx' backend (EMBEDDING_BACKEND=onnx): a
+384-dimensional sentence-embedding model (all-MiniLM-L6-v2 by default) quantized to int8
+and run on the CPU with ONNX Runtime. Embedding a query takes a few milliseconds and
+needs no network.
+
+The model directory (LOCAL_EMBEDDING_MODEL_DIR) must contain the model's tokenizer.json
+and model_int8.onnx, which the `quantize` command creates from an exported model.onnx:
+
+    python -m backend.services.local_embedding_service quantize path/to/model.onnx
+
+Embeddings are mean-pooled over the tokens and L2-normalized, as sentence-transformers
+does for this model family. The model is symmetric, so queries and passages are
+embedded alike.
+
+Note:
+    Vectors from different models are not comparable. After switching
+    EMBEDDING_BACKEND, every stored post must be re-embedded with the new backend,
+    e.g. by replaying the post archive into a fresh index or namespace:
+
+        EMBEDDING_BACKEND=onnx python -m backend.services.refresh_pipeline replay
+
+Usage:
+    from services.local_embedding_service import get_local_model
+
+    vectors = get_local_model().embed(["A weekend project about curriculum planning"])
+
+    # Quantize an exported model and time a query
+    python -m backend.services.local_embedding_service quantize model.onnx
+    python -m backend.services.local_embedding_service embed "habit tracker ideas"
+"""
+
+import argparse  # For the quantize/embed command line
+import logging  # For logging model loading
+import shutil  # For copying the tokenizer next to the quantized model
+import threading  # For loading the model only once
+import time  # For timing the embed command
+from pathlib import Path  # For cross-platform file paths
+from typing import List, Optional  # Type hints for better code documentation
+
+import numpy as np  # Pooling and normalization of the model output
+import onnxruntime  # CPU inference
+from tokenizers import Tokenizer  # Fast WordPiece tokenization
+
+# Import configuration from config file
+from ..config import (
+    PINECONE_DIMENSION,  # Dimension the index expects
+    LOCAL_EMBEDDING_MODEL_DIR,  # Directory with model_int8.onnx and tokenizer.json
+    LOCAL_EMBEDDING_MAX_TOKENS,  # Tokens per text the model reads
+    LOCAL_EMBEDDING_THREADS,  # ONNX Runtime intra-op threads (0 = default)
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Files expected in the model directory
+MODEL_FILE = 'model_int8.onnx'
+TOKENIZER_FILE = 'tokenizer.json'
+
+# Texts run through the model at once. Texts are sorted by length first, so each
+# sub-batch is padded only to its own longest text.
+INFERENCE_BATCH_SIZE = 32
+
+
+class LocalEmbeddingModel:
+    """
+    Sentence-embedding model running on the CPU with ONNX Runtime.
+
+    Inference is thread-safe; ONNX Runtime sessions can be run concurrently.
+
+    Example:
+        >>> model = LocalEmbeddingModel()
+        >>> vectors = model.embed(["I built a habit tracker", "How do I center a div?"])
+        >>> len(vectors[0])
+        384
+    """
+
+    def __init__(
+        self,
+        model_dir: Optional[Path] = None,
+        max_tokens: int = LOCAL_EMBEDDING_MAX_TOKENS,
+        threads: int = LOCAL_EMBEDDING_THREADS,
+    ):
+        """
+        Load the tokenizer and the quantized model.
+
+        Args:
+            model_dir (Path, optional): Directory with model_int8.onnx and tokenizer.json.
+                If None, uses LOCAL_EMBEDDING_MODEL_DIR from config.py.
+            max_tokens (int, optional): Tokens per text; longer texts are truncated.
+                Defaults to LOCAL_EMBEDDING_MAX_TOKENS.
+            threads (int, optional): ONNX Runtime intra-op threads, 0 for its default.
+                Defaults to LOCAL_EMBEDDING_THREADS.
+
+        Raises:
+            FileNotFoundError: If the model or tokenizer file is missing
+            ValueError: If the model's output dimension differs from PINECONE_DIMENSION
+        """
+        model_dir = Path(model_dir or LOCAL_EMBEDDING_MODEL_DIR)
+        for name in (MODEL_FILE, TOKENIZER_FILE):
+            if not (model_dir / name).is_file():
+                raise FileNotFoundError(
+                    f"Local embedding model file {model_dir / name} is missing "
+                    f"(see `python -m backend.services.local_embedding_service quantize`)"
+                )
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=max_tokens)
+        self.tokenizer.no_padding()
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            str(model_dir / MODEL_FILE), options, providers=['CPUExecutionProvider']
+        )
+        self._input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+        dimension = self.session.get_outputs()[0].shape[-1]
+        if isinstance(dimension, int) and dimension != PINECONE_DIMENSION:
+            raise ValueError(
+                f"Local embedding model produces {dimension}-dimensional vectors, "
+                f"but PINECONE_DIMENSION is {PINECONE_DIMENSION}"
+            )
+        logger.info(f"Loaded local embedding model from {model_dir}")
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts.
+
+        Args:
+            texts (list): Texts to embed
+
+        Returns:
+            list: One L2-normalized vector per text, in the same order
+        """
+        encodings = self.tokenizer.encode_batch(texts)
+        order = sorted(range(len(texts)), key=lambda position: len(encodings[position].ids))
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        for start in range(0, len(order), INFERENCE_BATCH_SIZE):
+            positions = order[start:start + INFERENCE_BATCH_SIZE]
+            pooled = self._run([encodings[position] for position in positions])
+            for position, vector in zip(positions, pooled.tolist()):
+                vectors[position] = vector
+        return vectors
+
+    def _run(self, encodings: list) -> np.ndarray:
+        """Run one padded batch through the model and pool the token embeddings."""
+        length = max(len(encoding.ids) for encoding in encodings)
+        input_ids = np.zeros((len(encodings), length), dtype=np.int64)
+        attention_mask = np.zeros((len(encodings), length), dtype=np.int64)
+        for row, encoding in enumerate(encodings):
+            input_ids[row, :len(encoding.ids)] = encoding.ids
+            attention_mask[row, :len(encoding.ids)] = 1
+
+        feeds = {'input_ids': input_ids, 'attention_mask': attention_mask}
+        if 'token_type_ids' in self._input_names:
+            feeds['token_type_ids'] = np.zeros_like(input_ids)
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean over the real (unpadded) tokens, then unit length
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled / np.maximum(norms, 1e-12)
+
+
+# Shared model, loaded on first use by get_local_model()
+_model: Optional[LocalEmbeddingModel] = None
+_model_lock = threading.Lock()
+
+
+def get_local_model() -> LocalEmbeddingModel:
+    """
+    Return the shared local embedding model, loading it on first use.
+
+    Returns:
+        LocalEmbeddingModel: The model from LOCAL_EMBEDDING_MODEL_DIR
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = LocalEmbeddingModel()
+    return _model
+
+
+def quantize_model(source: Path, model_dir: Optional[Path] = None) -> Path:
+    """
+    Quantize an exported ONNX model's weights to int8 for the local backend.
+
+    Dynamic quantization stores the weights as int8 and quantizes activations on
+    the fly, which makes the model about four times smaller and markedly faster on
+    CPUs, at a negligible cost in embedding quality. A tokenizer.json next to the
+    source model is copied along.
+
+    Args:
+        source (Path): Exported float32 model.onnx
+        model_dir (Path, optional): Destination directory. Defaults to
+            LOCAL_EMBEDDING_MODEL_DIR.
+
+    Returns:
+        Path: Location of the quantized model
+    """
+    # Imported here because only this one-off command needs the quantization tools
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    source = Path(source)
+    model_dir = Path(model_dir or LOCAL_EMBEDDING_MODEL_DIR)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    target = model_dir / MODEL_FILE
+    quantize_dynamic(str(source), str(target), weight_type=QuantType.QInt8)
+
+    tokenizer = source.parent / TOKENIZER_FILE
+    if tokenizer.is_file() and tokenizer.resolve() != (model_dir / TOKENIZER_FILE).resolve():
+        shutil.copyfile(tokenizer, model_dir / TOKENIZER_FILE)
+    logger.info(
+        f"Quantized {source} ({source.stat().st_size / 1e6:.1f} MB) to {target} "
+        f"({target.stat().st_size / 1e6:.1f} MB)"
+    )
+    return target
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Command-line entry point.
+
+    Example:
+        python -m backend.services.local_embedding_service quantize model.onnx
+        python -m backend.services.local_embedding_service embed "weekend project ideas"
+    """
+    parser = argparse.ArgumentParser(description="Local CPU embedding backend")
+    commands = parser.add_subparsers(dest='command', required=True)
+    quantize = commands.add_parser('quantize', help="Quantize an exported model.onnx to int8")
+    quantize.add_argument('source', type=Path, help="Exported float32 ONNX model")
+    quantize.add_argument('--model-dir', type=Path, help="Destination (defaults to LOCAL_EMBEDDING_MODEL_DIR)")
+    embed = commands.add_parser('embed', help="Embed a text and report the latency")
+    embed.add_argument('text', help="Text to embed")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    if args.command == 'quantize':
+        print(quantize_model(args.source, args.model_dir))
+        return
+
+    model = get_local_model()
+    model.embed([args.text])  # Warm-up
+    started = time.perf_counter()
+    vector = model.embed([args.text])[0]
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"{len(vector)} dimensions in {elapsed_ms:.1f} ms: {[round(value, 4) for value in vector[:5]]} ...")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""
+OpenAI Service for Vibe Coding Project Finder
+
+This module handles interactions with the OpenAI API. Scraped posts are sent in batches
+(several posts per request) to a language model that returns structured project
+metadata: category, estimated project time, skill level and technologies used. The
+metadata is stored alongside each post's vector and used for filtering searches.
+
+Requests go to OpenAI's REST API through a pooled HTTP session and are throttled by a
+token bucket sized from OPENAI_RATE_LIMIT.
+
+Usage:
+    from services.openai_service import extract_metadata
+
+    processed_posts = process_posts(scrape_subreddits())
+    metadata = extract_metadata(processed_posts)
+    # metadata[i] describes processed_posts[i]
+"""
+
+import json  # For building the prompt and parsing the model's JSON reply
+import logging  # For logging info, warnings, and errors during API calls
+import threading  # For creating the shared HTTP session only once
+from typing import List, Dict, Any, Optional  # Type hints for better code documentation
+
+import requests  # HTTP client for OpenAI's REST API
+
+# Import configuration from config file
+from ..config import (
+    OPENAI_API_KEY,  # API key for OpenAI
+    OPENAI_MODEL,  # Model used for metadata extraction
+    OPENAI_API_URL,  # Base URL of the OpenAI REST API
+    OPENAI_RATE_LIMIT,  # Maximum requests per minute to OpenAI API
+    OPENAI_METADATA_BATCH_SIZE,  # Posts sent per metadata request
+)
+from ..utils.helpers import TokenBucketRateLimiter, create_http_session  # Throttling and pooled HTTP
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a completion
+REQUEST_TIMEOUT = 120
+
+# Characters of each post's content included in the prompt
+MAX_CONTENT_CHARS = 2000
+
+# Metadata returned for posts the model did not describe
+EMPTY_METADATA = {
+    'category': None,
+    'estimated_time': None,
+    'skill_level': None,
+    'tech_stack': [],
+}
+
+METADATA_SYSTEM_PROMPT = (
+    "You label Reddit posts about software projects. For every post you receive, return "
+    "its id and: category (a short topic such as 'education', 'productivity', 'devtools', "
+    "'games'), estimated_time (one of 'hours', 'weekend', 'week', 'month+'), skill_level "
+    "(one of 'beginner', 'intermediate', 'advanced') and tech_stack (a list of languages, "
+    "frameworks and services mentioned or implied). Use a post's top_comments, when given, "
+    "as extra context about the project. Reply with a JSON object of the form "
+    "{\"posts\": [{\"id\": ..., \"category\": ..., \"estimated_time\": ..., "
+    "\"skill_level\": ..., \"tech_stack\": [...]}]}."
+)
+
+# All OpenAI requests made by this process share this limiter
+openai_rate_limiter = TokenBucketRateLimiter(OPENAI_RATE_LIMIT, name='OpenAI API')
+
+
+class OpenAIError(Exception):
+    """Raised when an OpenAI API request fails or returns an unusable reply."""
+
+
+# Shared HTTP session, created on first use by _get_session()
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def extract_metadata(posts: List[Dict[str, Any]], batch_size: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Extract project metadata for processed posts using the OpenAI API.
+
+    Posts are sent `batch_size` at a time in a single chat completion, so labelling
+    N posts costs about N / batch_size requests instead of N.
+
+    Args:
+        posts (list): Processed post dictionaries (needs 'id', 'title' and 'content')
+        batch_size (int, optional): Posts per request. Defaults to OPENAI_METADATA_BATCH_SIZE.
+
+    Returns:
+        list: One metadata dictionary per post, in the same order, with the keys:
+            - category (str): Project category
+            - estimated_time (str): Rough effort ('hours', 'weekend', 'week', 'month+')
+            - skill_level (str): 'beginner', 'intermediate' or 'advanced'
+            - tech_stack (list): Technologies used or implied
+        Fields the model did not provide are None (or an empty list).
+
+    Example:
+        >>> metadata = extract_metadata(processed_posts)
+        >>> metadata[0]['skill_level']
+        'beginner'
+
+    Raises:
+        ValueError: If the OpenAI API key is missing
+        OpenAIError: If a request fails or the reply is not valid JSON
+    """
+    batch_size = batch_size or OPENAI_METADATA_BATCH_SIZE
+    metadata = []
+    for start in range(0, len(posts), batch_size):
+        metadata.extend(_extract_batch(posts[start:start + batch_size]))
+    return metadata
+
+
+def _extract_batch(posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Label one batch of posts with a single chat completion.
+
+    Args:
+        posts (list): Processed post dictionaries
+
+    Returns:
+        list: Metadata dictionaries in the same order as `posts`
+    """
+    prompt_posts = []
+    for post in posts:
+        prompt_post = {'id': post['id'], 'title': post['title'], 'content': post['content'][:MAX_CONTENT_CHARS]}
+        if post.get('comment_digest'):
+            prompt_post['top_comments'] = post['comment_digest']
+        prompt_posts.append(prompt_post)
+    reply = _chat_completion([
+        {'role': 'system', 'content': METADATA_SYSTEM_PROMPT},
+        {'role': 'user', 'content': json.dumps({'posts': prompt_posts})},
+    ])
+
+    try:
+        labelled = {str(item.get('id')): item for item in json.loads(reply).get('posts', [])}
+    except (ValueError, AttributeError) as e:
+        logger.error(f"OpenAI returned invalid metadata JSON: {str(e)}")
+        raise OpenAIError(f"OpenAI returned invalid metadata JSON: {str(e)}") from e
+
+    metadata = []
+    for post in posts:
+        item = labelled.get(str(post['id']))
+        if item is None:
+            logger.warning(f"No metadata returned for post {post['id']}")
+            metadata.append(dict(EMPTY_METADATA))
+            continue
+        tech_stack = item.get('tech_stack') or []
+        metadata.append({
+            'category': item.get('category'),
+            'estimated_time': item.get('estimated_time'),
+            'skill_level': item.get('skill_level'),
+            'tech_stack': [str(tech) for tech in tech_stack] if isinstance(tech_stack, list) else [str(tech_stack)],
+        })
+    return metadata
+
+
+def _chat_completion(messages: List[Dict[str, str]]) -> str:
+    """
+    Request a JSON-mode chat completion and return the reply text.
+
+    Args:
+        messages (list): Chat messages
+
+    Returns:
+        str: Content of the first choice
+
+    Raises:
+        ValueError: If the OpenAI API key is missing
+        OpenAIError: If the request fails
+    """
+    session = _get_session()
+    openai_rate_limiter.acquire()
+    try:
+        response = session.post(
+            f"{OPENAI_API_URL.rstrip('/')}/chat/completions",
+            json={
+                'model': OPENAI_MODEL,
+                'messages': messages,
+                'response_format': {'type': 'json_object'},
+            },
+            timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        return response.json()['choices'][0]['message']['content']
+    except (requests.RequestException, KeyError, IndexError, ValueError) as e:
+        logger.error(f"OpenAI chat completion failed: {str(e)}")
+        raise OpenAIError(f"OpenAI chat completion failed: {str(e)}") from e
+
+
+def _get_session() -> requests.Session:
+    """
+    Return the shared OpenAI HTTP session, creating it on first use.
+
+    Raises:
+        ValueError: If the OpenAI API key is missing
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                if not OPENAI_API_KEY:
+                    raise ValueError("Missing required OpenAI credential: OPENAI_API_KEY")
+                session = create_http_session()
+                session.headers['Authorization'] = f"Bearer {OPENAI_API_KEY}"
+                _session = session
+    return _session
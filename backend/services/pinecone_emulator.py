@@ -0,0 +1,565 @@
+"""
+Local Pinecone Emulator for Vibe Coding Project Finder
+
+pinecone_service talks to Pinecone over plain HTTP, so anything that serves the same
+endpoints can stand in for it. This module is such a server: a small, in-memory,
+single-index implementation of Pinecone's data-plane API for tests, CI and load tests,
+where the real service is unavailable, rate-limited or too noisy to measure against.
+
+Vectors are kept per namespace in a NumPy matrix, so a query is one matrix-vector
+product followed by a partial sort; metadata filters are evaluated in Python before
+scoring. Supported endpoints:
+
+    POST /vectors/upsert        POST /query             GET /vectors/fetch
+    POST /vectors/update        POST /vectors/delete    GET /vectors/list
+    POST /describe_index_stats  GET /describe_index_stats
+    GET  /indexes/<name>        (control plane: returns this server as the host)
+
+Metadata filters support $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin, $exists, $and and
+$or, with Pinecone's semantics for list values (a list matches if any element does).
+Nothing is persisted; the index is empty whenever the server starts.
+
+Usage:
+    # Serve on localhost and point the app at it
+    python -m backend.services.pinecone_emulator --port 5081
+    export PINECONE_INDEX_HOST=http://127.0.0.1:5081
+
+    # Or run it in-process, e.g. in a benchmark
+    from services.pinecone_emulator import start_emulator
+
+    server = start_emulator(port=0)
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+    ...
+    server.shutdown()
+"""
+
+import argparse  # For the emulator command line
+import json  # For request and response bodies
+import logging  # For logging requests and startup
+import threading  # For serving in the background and guarding the index
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Minimal HTTP server
+from typing import List, Dict, Any, Optional, Tuple  # Type hints for better code documentation
+from urllib.parse import parse_qs, urlsplit  # For query string parameters
+
+import numpy as np  # Vector storage and similarity scoring
+
+# Import configuration from config file
+from ..config import (
+    PINECONE_DIMENSION,  # Default dimension of the emulated index
+    PINECONE_INDEX_NAME,  # Name the emulated index answers to
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Port the command-line server listens on by default
+DEFAULT_PORT = 5081
+
+# Similarity metrics Pinecone offers
+METRICS = ('cosine', 'dotproduct', 'euclidean')
+
+# Default and maximum page size of /vectors/list
+LIST_DEFAULT_LIMIT = 100
+LIST_MAX_LIMIT = 1000
+
+# Rows added to a namespace's matrix whenever it runs out of space (at least)
+MIN_GROWTH = 1024
+
+
+class EmulatorError(Exception):
+    """Raised for requests the emulator rejects; mapped to an HTTP error response."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class _Namespace:
+    """
+    The vectors of one namespace.
+
+    Rows 0..count-1 of `values` are in use; deleting a vector moves the last
+    row into its slot, so the used rows stay contiguous and queries never
+    have to skip holes.
+    """
+
+    def __init__(self, dimension: int):
+        self.values = np.zeros((0, dimension), dtype=np.float32)
+        self.norms = np.zeros(0, dtype=np.float32)
+        self.ids: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self.rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def upsert(self, vector_id: str, values: np.ndarray, metadata: Dict[str, Any]) -> None:
+        """Insert a vector or overwrite an existing one."""
+        row = self.rows.get(vector_id)
+        if row is None:
+            row = len(self.ids)
+            if row == len(self.values):
+                self._grow()
+            self.ids.append(vector_id)
+            self.metadata.append(metadata)
+            self.rows[vector_id] = row
+        else:
+            self.metadata[row] = metadata
+        self.values[row] = values
+        self.norms[row] = np.linalg.norm(values)
+
+    def delete(self, vector_id: str) -> bool:
+        """Remove a vector; returns False if it did not exist."""
+        row = self.rows.pop(vector_id, None)
+        if row is None:
+            return False
+        last = len(self.ids) - 1
+        if row != last:
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self.metadata[row] = self.metadata[last]
+            self.values[row] = self.values[last]
+            self.norms[row] = self.norms[last]
+            self.rows[moved] = row
+        self.ids.pop()
+        self.metadata.pop()
+        return True
+
+    def _grow(self) -> None:
+        """Double the capacity of the vector matrix."""
+        capacity = max(len(self.values) * 2, MIN_GROWTH)
+        values = np.zeros((capacity, self.values.shape[1]), dtype=np.float32)
+        values[:len(self.values)] = self.values
+        norms = np.zeros(capacity, dtype=np.float32)
+        norms[:len(self.norms)] = self.norms
+        self.values, self.norms = values, norms
+
+
+class EmulatedIndex:
+    """
+    In-memory vector index implementing the operations behind Pinecone's endpoints.
+
+    Methods take and return the JSON bodies of the corresponding endpoints, so
+    the HTTP handler only has to decode and encode them. All methods are
+    thread-safe.
+
+    Example:
+        >>> index = EmulatedIndex(dimension=3)
+        >>> index.upsert({'vectors': [{'id': 'a', 'values': [1, 0, 0], 'metadata': {'x': 1}}]})
+        {'upsertedCount': 1}
+        >>> index.query({'vector': [1, 0, 0], 'topK': 1})['matches'][0]['id']
+        'a'
+    """
+
+    def __init__(self, dimension: int = PINECONE_DIMENSION, metric: str = 'cosine', name: str = PINECONE_INDEX_NAME):
+        """
+        Args:
+            dimension (int, optional): Vector dimension. Defaults to PINECONE_DIMENSION.
+            metric (str, optional): 'cosine', 'dotproduct' or 'euclidean'. Defaults to 'cosine'.
+            name (str, optional): Index name reported by the control-plane endpoint.
+                Defaults to PINECONE_INDEX_NAME.
+
+        Raises:
+            ValueError: If the metric is not supported
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Metric must be one of {METRICS}, got {metric!r}")
+        self.dimension = dimension
+        self.metric = metric
+        self.name = name
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._lock = threading.Lock()
+
+    def upsert(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /vectors/upsert"""
+        vectors = body.get('vectors')
+        if not isinstance(vectors, list):
+            raise EmulatorError("'vectors' must be a list")
+        parsed = [
+            (str(vector['id']), self._to_array(vector.get('values')), vector.get('metadata') or {})
+            for vector in vectors
+        ]
+        with self._lock:
+            namespace = self._namespaces.setdefault(body.get('namespace', ''), _Namespace(self.dimension))
+            for vector_id, values, metadata in parsed:
+                namespace.upsert(vector_id, values, metadata)
+        return {'upsertedCount': len(parsed)}
+
+    def query(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /query"""
+        top_k = body.get('topK')
+        if not isinstance(top_k, int) or top_k < 1:
+            raise EmulatorError("'topK' must be a positive integer")
+        namespace_name = body.get('namespace', '')
+        metadata_filter = body.get('filter')
+        include_values = bool(body.get('includeValues'))
+        include_metadata = bool(body.get('includeMetadata'))
+
+        with self._lock:
+            namespace = self._namespaces.get(namespace_name)
+            if body.get('id') is not None:
+                row = namespace.rows.get(str(body['id'])) if namespace else None
+                if row is None:
+                    return {'matches': [], 'namespace': namespace_name}
+                vector = namespace.values[row].copy()
+            else:
+                vector = self._to_array(body.get('vector'))
+            if not namespace:
+                return {'matches': [], 'namespace': namespace_name}
+
+            count = len(namespace)
+            if metadata_filter:
+                candidates = np.fromiter(
+                    (row for row in range(count) if matches_filter(namespace.metadata[row], metadata_filter)),
+                    dtype=np.intp,
+                )
+            else:
+                candidates = np.arange(count)
+            if not len(candidates):
+                return {'matches': [], 'namespace': namespace_name}
+
+            scores, order = self._score(namespace, candidates, vector)
+            k = min(top_k, len(candidates))
+            # Partial sort: only the top k are ordered
+            best = np.argpartition(order, k - 1)[:k] if k < len(candidates) else np.arange(len(candidates))
+            best = best[np.argsort(order[best], kind='stable')]
+
+            matches = []
+            for position in best:
+                row = int(candidates[position])
+                match = {'id': namespace.ids[row], 'score': float(scores[position])}
+                if include_values:
+                    match['values'] = namespace.values[row].tolist()
+                if include_metadata:
+                    match['metadata'] = namespace.metadata[row]
+                matches.append(match)
+        return {'matches': matches, 'namespace': namespace_name}
+
+    def fetch(self, ids: List[str], namespace_name: str = '') -> Dict[str, Any]:
+        """GET /vectors/fetch"""
+        vectors = {}
+        with self._lock:
+            namespace = self._namespaces.get(namespace_name)
+            for vector_id in ids:
+                row = namespace.rows.get(vector_id) if namespace else None
+                if row is not None:
+                    vectors[vector_id] = {
+                        'id': vector_id,
+                        'values': namespace.values[row].tolist(),
+                        'metadata': namespace.metadata[row],
+                    }
+        return {'vectors': vectors, 'namespace': namespace_name}
+
+    def update(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /vectors/update"""
+        vector_id = body.get('id')
+        if vector_id is None:
+            raise EmulatorError("'id' is required")
+        values = self._to_array(body['values']) if body.get('values') is not None else None
+        with self._lock:
+            namespace = self._namespaces.get(body.get('namespace', ''))
+            row = namespace.rows.get(str(vector_id)) if namespace else None
+            if row is None:
+                raise EmulatorError(f"Vector {vector_id} not found", status=404)
+            metadata = dict(namespace.metadata[row])
+            metadata.update(body.get('setMetadata') or {})
+            namespace.upsert(str(vector_id), namespace.values[row] if values is None else values, metadata)
+        return {}
+
+    def delete(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /vectors/delete"""
+        namespace_name = body.get('namespace', '')
+        with self._lock:
+            namespace = self._namespaces.get(namespace_name)
+            if namespace is None:
+                return {}
+            if body.get('deleteAll'):
+                del self._namespaces[namespace_name]
+            elif body.get('filter'):
+                for vector_id in [
+                    namespace.ids[row] for row in range(len(namespace))
+                    if matches_filter(namespace.metadata[row], body['filter'])
+                ]:
+                    namespace.delete(vector_id)
+            else:
+                for vector_id in body.get('ids') or []:
+                    namespace.delete(str(vector_id))
+        return {}
+
+    def list_ids(
+        self, namespace_name: str = '', prefix: str = '', limit: int = LIST_DEFAULT_LIMIT, token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """GET /vectors/list (IDs in sorted order; the pagination token is the last ID returned)"""
+        limit = min(max(limit, 1), LIST_MAX_LIMIT)
+        with self._lock:
+            namespace = self._namespaces.get(namespace_name)
+            ids = sorted(
+                vector_id for vector_id in (namespace.ids if namespace else [])
+                if vector_id.startswith(prefix) and (token is None or vector_id > token)
+            )
+        response = {'vectors': [{'id': vector_id} for vector_id in ids[:limit]], 'namespace': namespace_name}
+        if len(ids) > limit:
+            response['pagination'] = {'next': ids[limit - 1]}
+        return response
+
+    def describe_index_stats(self, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """POST/GET /describe_index_stats (a filter narrows the counts)"""
+        metadata_filter = (body or {}).get('filter')
+        with self._lock:
+            namespaces = {}
+            for name, namespace in self._namespaces.items():
+                if metadata_filter:
+                    count = sum(matches_filter(metadata, metadata_filter) for metadata in namespace.metadata)
+                else:
+                    count = len(namespace)
+                namespaces[name] = {'vectorCount': count}
+        return {
+            'namespaces': namespaces,
+            'dimension': self.dimension,
+            'indexFullness': 0.0,
+            'totalVectorCount': sum(entry['vectorCount'] for entry in namespaces.values()),
+            'metric': self.metric,
+        }
+
+    def _score(
+        self, namespace: _Namespace, candidates: np.ndarray, vector: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score candidate rows against a query vector.
+
+        Returns:
+            tuple: (scores as reported to the client, sort keys where lower is better)
+        """
+        values = namespace.values[candidates]
+        if self.metric == 'euclidean':
+            # Pinecone reports the squared distance; closer is better
+            scores = ((values - vector) ** 2).sum(axis=1)
+            return scores, scores
+        scores = values @ vector
+        if self.metric == 'cosine':
+            denominator = namespace.norms[candidates] * np.linalg.norm(vector)
+            scores = np.divide(scores, denominator, out=np.zeros_like(scores), where=denominator > 0)
+        return scores, -scores
+
+    def _to_array(self, values: Any) -> np.ndarray:
+        """Validate a vector and convert it to float32."""
+        if not isinstance(values, list) or len(values) != self.dimension:
+            raise EmulatorError(
+                f"Vector dimension {len(values) if isinstance(values, list) else 'unknown'} "
+                f"does not match the dimension of the index {self.dimension}"
+            )
+        try:
+            return np.asarray(values, dtype=np.float32)
+        except (TypeError, ValueError) as e:
+            raise EmulatorError(f"Invalid vector values: {str(e)}") from e
+
+
+def matches_filter(metadata: Dict[str, Any], metadata_filter: Dict[str, Any]) -> bool:
+    """
+    Evaluate a Pinecone metadata filter against one vector's metadata.
+
+    Args:
+        metadata (dict): The vector's metadata
+        metadata_filter (dict): Filter such as {"skill_level": {"$in": ["beginner"]}}
+
+    Returns:
+        bool: True if the metadata satisfies the filter
+
+    Raises:
+        EmulatorError: If the filter uses an unknown operator
+
+    Example:
+        >>> matches_filter({"tech_stack": ["python", "react"]}, {"tech_stack": "react"})
+        True
+        >>> matches_filter({"score": 12}, {"$or": [{"score": {"$gte": 50}}, {"subreddit": "webdev"}]})
+        False
+    """
+    for key, condition in metadata_filter.items():
+        if key == '$and':
+            if not all(matches_filter(metadata, part) for part in condition):
+                return False
+        elif key == '$or':
+            if not any(matches_filter(metadata, part) for part in condition):
+                return False
+        elif key.startswith('$'):
+            raise EmulatorError(f"Unsupported filter operator {key}")
+        elif isinstance(condition, dict):
+            if not all(_matches_operator(metadata, key, op, operand) for op, operand in condition.items()):
+                return False
+        elif not _matches_operator(metadata, key, '$eq', condition):
+            return False
+    return True
+
+
+def _matches_operator(metadata: Dict[str, Any], field: str, op: str, operand: Any) -> bool:
+    """Apply one comparison operator to a metadata field."""
+    if op == '$exists':
+        return (field in metadata) == bool(operand)
+    if field not in metadata:
+        # Missing fields only satisfy negative conditions
+        return op in ('$ne', '$nin')
+    value = metadata[field]
+    candidates = value if isinstance(value, list) else [value]
+
+    if op == '$eq':
+        return operand in candidates
+    if op == '$ne':
+        return operand not in candidates
+    if op == '$in':
+        return any(item in operand for item in candidates)
+    if op == '$nin':
+        return not any(item in operand for item in candidates)
+    if op in ('$gt', '$gte', '$lt', '$lte'):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        return {
+            '$gt': value > operand,
+            '$gte': value >= operand,
+            '$lt': value < operand,
+            '$lte': value <= operand,
+        }[op]
+    raise EmulatorError(f"Unsupported filter operator {op}")
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Maps Pinecone endpoints onto the server's EmulatedIndex."""
+
+    protocol_version = 'HTTP/1.1'  # Keep connections alive, like the pooled client expects
+    disable_nagle_algorithm = True  # Headers and body are written separately; don't delay the body
+
+    def do_GET(self) -> None:
+        """Handle fetch, list, describe_index_stats and the index lookup."""
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        namespace = params.get('namespace', [''])[0]
+        index = self.server.index
+
+        def handle() -> Dict[str, Any]:
+            if url.path == '/vectors/fetch':
+                return index.fetch(params.get('ids', []), namespace)
+            if url.path == '/vectors/list':
+                return index.list_ids(
+                    namespace,
+                    prefix=params.get('prefix', [''])[0],
+                    limit=int(params.get('limit', [LIST_DEFAULT_LIMIT])[0]),
+                    token=params.get('paginationToken', [None])[0],
+                )
+            if url.path == '/describe_index_stats':
+                return index.describe_index_stats()
+            if url.path == f"/indexes/{index.name}":
+                host, port = self.server.server_address[:2]
+                return {
+                    'name': index.name,
+                    'dimension': index.dimension,
+                    'metric': index.metric,
+                    'host': f"http://{host}:{port}",
+                    'status': {'ready': True, 'state': 'Ready'},
+                }
+            raise EmulatorError(f"Not found: GET {url.path}", status=404)
+
+        self._respond(handle)
+
+    def do_POST(self) -> None:
+        """Handle upsert, query, update, delete and describe_index_stats."""
+        path = urlsplit(self.path).path
+        routes = {
+            '/vectors/upsert': self.server.index.upsert,
+            '/query': self.server.index.query,
+            '/vectors/update': self.server.index.update,
+            '/vectors/delete': self.server.index.delete,
+            '/describe_index_stats': self.server.index.describe_index_stats,
+        }
+
+        def handle() -> Dict[str, Any]:
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError as e:
+                raise EmulatorError(f"Invalid JSON body: {str(e)}") from e
+            if path not in routes:
+                raise EmulatorError(f"Not found: POST {path}", status=404)
+            return routes[path](body)
+
+        self._respond(handle)
+
+    def _respond(self, handle) -> None:
+        """Run a handler and send its result (or the error it raised) as JSON."""
+        try:
+            status, payload = 200, handle()
+        except EmulatorError as e:
+            status, payload = e.status, {'code': 3 if e.status == 400 else 5, 'message': str(e)}
+        except (KeyError, TypeError, ValueError) as e:
+            status, payload = 400, {'code': 3, 'message': f"Bad request: {str(e)}"}
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests through the module logger instead of stderr."""
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def start_emulator(
+    host: str = '127.0.0.1',
+    port: int = DEFAULT_PORT,
+    index: Optional[EmulatedIndex] = None,
+) -> ThreadingHTTPServer:
+    """
+    Start the emulator in a background thread.
+
+    Args:
+        host (str, optional): Interface to listen on. Defaults to '127.0.0.1'.
+        port (int, optional): Port to listen on (0 picks a free one). Defaults to DEFAULT_PORT.
+        index (EmulatedIndex, optional): Index to serve. Defaults to an empty cosine
+            index of PINECONE_DIMENSION.
+
+    Returns:
+        ThreadingHTTPServer: The running server; its `index` attribute is the
+        served index. Call shutdown() to stop it.
+    """
+    server = _create_server(host, port, index)
+    thread = threading.Thread(target=server.serve_forever, name='pinecone-emulator', daemon=True)
+    thread.start()
+    logger.info(f"Pinecone emulator listening on http://{host}:{server.server_address[1]}")
+    return server
+
+
+def _create_server(host: str, port: int, index: Optional[EmulatedIndex]) -> ThreadingHTTPServer:
+    """Create the HTTP server with its index attached."""
+    server = ThreadingHTTPServer((host, port), _RequestHandler)
+    server.daemon_threads = True
+    server.index = index or EmulatedIndex()
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Command-line entry point.
+
+    Example:
+        python -m backend.services.pinecone_emulator --port 5081 --metric cosine
+    """
+    parser = argparse.ArgumentParser(description="Serve an in-memory Pinecone-compatible index")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to listen on")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument('--dimension', type=int, default=PINECONE_DIMENSION, help="Vector dimension")
+    parser.add_argument('--metric', choices=METRICS, default='cosine', help="Similarity metric")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    server = _create_server(args.host, args.port, EmulatedIndex(args.dimension, args.metric))
+    url = f"http://{args.host}:{server.server_address[1]}"
+    logger.info(f"Pinecone emulator listening on {url} (set PINECONE_INDEX_HOST={url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
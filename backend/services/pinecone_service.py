@@ -0,0 +1,494 @@
+"""
+Pinecone Vector Database Service for Vibe Coding Project Finder
+
+This module manages all interactions with the Pinecone index that stores one vector per
+Reddit post. It talks to Pinecone's HTTP API directly through a pooled requests session,
+so the same code works against Pinecone itself or any server that implements the same
+endpoints (set PINECONE_INDEX_HOST to point at it).
+
+Vectors are keyed by Reddit post ID, and their metadata holds the processed post fields
+(title, subreddit, score, comment_count, ...) used for filtering and display.
+
+Usage:
+    from services.pinecone_service import (
+        initialize_pinecone, fetch_metadata, update_metadata, delete_embeddings,
+    )
+
+    # Connect to the configured index
+    index = initialize_pinecone()
+
+    # Read and update stored metadata
+    stored = fetch_metadata(["1abcde", "1abcdf"])
+    update_metadata("1abcde", {"score": 42})
+
+    # Remove posts that no longer exist
+    delete_embeddings(["1abcde"])
+
+    # Store and search vectors
+    store_embeddings(embeddings, processed_posts)
+    matches = query_similar(query_embedding, {"skill_level": "beginner"}, top_k=10)
+"""
+
+import logging  # For logging info, warnings, and errors during index operations
+import threading  # For creating the shared index client only once
+from typing import List, Dict, Any, Optional, Iterable, Iterator  # Type hints for better code documentation
+
+import requests  # HTTP client for Pinecone's REST API
+
+# Import configuration from config file
+from ..config import (
+    PINECONE_API_KEY,  # API key for Pinecone
+    PINECONE_INDEX_NAME,  # Name of the index holding project vectors
+    PINECONE_INDEX_HOST,  # Data-plane URL of the index (optional)
+    PINECONE_API_URL,  # Control-plane API used to look up the index host
+    PINECONE_API_VERSION,  # API version sent with every request
+    PINECONE_NAMESPACE,  # Namespace holding the project vectors
+    PINECONE_DIMENSION,  # Dimension of the stored vectors
+    EMBEDDING_MODEL,  # Pinecone-hosted embedding model
+)
+from ..utils.helpers import create_http_session  # Pooled HTTP session with retries
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Maximum number of IDs sent in a single fetch request
+FETCH_BATCH_SIZE = 100
+
+# Maximum number of vectors sent in a single upsert request
+UPSERT_BATCH_SIZE = 100
+
+# Maximum number of IDs sent in a single delete request
+DELETE_BATCH_SIZE = 1000
+
+# Maximum number of IDs returned per list page
+LIST_PAGE_SIZE = 100
+
+# Seconds to wait for Pinecone to respond
+REQUEST_TIMEOUT = 30
+
+# Characters of post content kept in vector metadata (Pinecone allows 40KB per vector)
+MAX_METADATA_CONTENT_CHARS = 8000
+
+
+class PineconeError(Exception):
+    """Raised when a Pinecone API request fails."""
+
+
+class PineconeIndex:
+    """
+    Minimal client for the data-plane endpoints of one Pinecone index.
+
+    Each method maps to a single HTTP request; batching is left to the module-level
+    functions below.
+    """
+
+    def __init__(self, host: str, api_key: Optional[str], session: Optional[requests.Session] = None):
+        """
+        Args:
+            host (str): Index URL, with or without the scheme (https is assumed)
+            api_key (str, optional): Pinecone API key
+            session (requests.Session, optional): Session to send requests with
+        """
+        self.host = host if host.startswith(('http://', 'https://')) else f"https://{host}"
+        self.host = self.host.rstrip('/')
+        self.session = session or create_http_session()
+        self.session.headers.update(_api_headers(api_key))
+
+    def request(self, method: str, path: str, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Send a request to the index and return the decoded JSON response.
+
+        Args:
+            method (str): HTTP method
+            path (str): Endpoint path, e.g. '/vectors/fetch'
+            **kwargs: Passed through to requests (params, json, ...)
+
+        Returns:
+            dict: Decoded response body (empty for empty responses)
+
+        Raises:
+            PineconeError: If the request fails or returns an error status
+        """
+        try:
+            response = self.session.request(
+                method, f"{self.host}{path}", timeout=REQUEST_TIMEOUT, **kwargs
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.error(f"Pinecone {method} {path} failed: {str(e)}")
+            raise PineconeError(f"Pinecone {method} {path} failed: {str(e)}") from e
+        return response.json() if response.content else {}
+
+    def upsert(self, vectors: List[Dict[str, Any]], namespace: str = '') -> Dict[str, Any]:
+        """Insert or overwrite vectors ({'id', 'values', 'metadata'} dictionaries)."""
+        return self.request('POST', '/vectors/upsert', json={'vectors': vectors, 'namespace': namespace})
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        namespace: str = '',
+    ) -> Dict[str, Any]:
+        """Find the `top_k` most similar vectors, optionally restricted by a metadata filter."""
+        body = {
+            'vector': vector,
+            'topK': top_k,
+            'includeMetadata': True,
+            'includeValues': False,
+            'namespace': namespace,
+        }
+        if metadata_filter:
+            body['filter'] = metadata_filter
+        return self.request('POST', '/query', json=body)
+
+    def fetch(self, ids: List[str], namespace: str = '') -> Dict[str, Any]:
+        """Fetch vectors (values and metadata) by ID."""
+        return self.request('GET', '/vectors/fetch', params={'ids': ids, 'namespace': namespace})
+
+    def update(self, vector_id: str, set_metadata: Dict[str, Any], namespace: str = '') -> Dict[str, Any]:
+        """Overwrite the given metadata fields of one vector, leaving other fields unchanged."""
+        return self.request('POST', '/vectors/update', json={
+            'id': vector_id,
+            'setMetadata': set_metadata,
+            'namespace': namespace,
+        })
+
+    def delete(self, ids: List[str], namespace: str = '') -> Dict[str, Any]:
+        """Delete vectors by ID."""
+        return self.request('POST', '/vectors/delete', json={'ids': ids, 'namespace': namespace})
+
+    def list_ids(self, namespace: str = '', pagination_token: Optional[str] = None) -> Dict[str, Any]:
+        """List one page of vector IDs in a namespace."""
+        params = {'namespace': namespace, 'limit': LIST_PAGE_SIZE}
+        if pagination_token:
+            params['paginationToken'] = pagination_token
+        return self.request('GET', '/vectors/list', params=params)
+
+
+# Shared index client, created on first use by initialize_pinecone()
+_index: Optional[PineconeIndex] = None
+_index_lock = threading.Lock()
+
+# Shared session for the control-plane and inference APIs
+_api_session: Optional[requests.Session] = None
+_api_session_lock = threading.Lock()
+
+
+def initialize_pinecone() -> PineconeIndex:
+    """
+    Set up the connection to the configured Pinecone index.
+
+    The index client is created once and shared by all callers. If
+    PINECONE_INDEX_HOST is not set, the host is looked up by PINECONE_INDEX_NAME
+    through the control-plane API.
+
+    Returns:
+        PineconeIndex: Client for the project index
+
+    Raises:
+        ValueError: If the Pinecone API key is missing
+        PineconeError: If the index host cannot be looked up
+    """
+    global _index
+    if _index is not None:
+        return _index
+
+    with _index_lock:
+        if _index is None:
+            host = PINECONE_INDEX_HOST
+            if not host:
+                if not PINECONE_API_KEY:
+                    raise ValueError("Missing required Pinecone credential: PINECONE_API_KEY")
+                host = _describe_index_host(PINECONE_INDEX_NAME)
+            logger.info(f"Connecting to Pinecone index {PINECONE_INDEX_NAME} at {host}")
+            _index = PineconeIndex(host, PINECONE_API_KEY)
+    return _index
+
+
+def store_embeddings(
+    embeddings: List[List[float]], metadata: List[Dict[str, Any]], namespace: Optional[str] = None
+) -> int:
+    """
+    Store post vectors with their metadata, UPSERT_BATCH_SIZE vectors per request.
+
+    Args:
+        embeddings (list): One vector per post
+        metadata (list): One metadata dictionary per post, in the same order; each
+            must contain the post 'id', which becomes the vector ID
+        namespace (str, optional): Namespace to write to. Defaults to PINECONE_NAMESPACE.
+
+    Returns:
+        int: Number of vectors stored
+
+    Raises:
+        ValueError: If the lists differ in length or a vector has the wrong dimension
+        PineconeError: If a request fails
+    """
+    if len(embeddings) != len(metadata):
+        raise ValueError(f"Got {len(embeddings)} embeddings for {len(metadata)} metadata entries")
+    index = initialize_pinecone()
+    namespace = PINECONE_NAMESPACE if namespace is None else namespace
+
+    vectors = []
+    for values, fields in zip(embeddings, metadata):
+        if len(values) != PINECONE_DIMENSION:
+            raise ValueError(
+                f"Vector for post {fields.get('id')} has {len(values)} dimensions, "
+                f"expected {PINECONE_DIMENSION}"
+            )
+        vectors.append({
+            'id': str(fields['id']),
+            'values': [float(value) for value in values],
+            'metadata': _to_pinecone_metadata(fields),
+        })
+
+    for start in range(0, len(vectors), UPSERT_BATCH_SIZE):
+        index.upsert(vectors[start:start + UPSERT_BATCH_SIZE], namespace=namespace)
+    logger.info(f"Stored {len(vectors)} vectors in Pinecone")
+    return len(vectors)
+
+
+def query_similar(
+    query_embedding: List[float],
+    metadata_filter: Optional[Dict[str, Any]] = None,
+    top_k: int = 10,
+    namespace: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Find the stored posts most similar to a query vector.
+
+    Args:
+        query_embedding (list): Query vector
+        metadata_filter (dict, optional): Pinecone metadata filter,
+            e.g. {"skill_level": {"$in": ["beginner", "intermediate"]}}
+        top_k (int, optional): Number of matches to return. Defaults to 10.
+        namespace (str, optional): Namespace to search. Defaults to PINECONE_NAMESPACE.
+
+    Returns:
+        list: Matches ordered by similarity, each with 'id', 'score' and 'metadata'
+
+    Raises:
+        PineconeError: If the request fails
+    """
+    index = initialize_pinecone()
+    namespace = PINECONE_NAMESPACE if namespace is None else namespace
+    response = index.query(query_embedding, top_k, metadata_filter, namespace=namespace)
+    return [
+        {'id': match['id'], 'score': match.get('score'), 'metadata': match.get('metadata') or {}}
+        for match in response.get('matches', [])
+    ]
+
+
+def embed(texts: List[str], input_type: str = 'passage') -> List[List[float]]:
+    """
+    Embed texts with the Pinecone-hosted EMBEDDING_MODEL in a single request.
+
+    Args:
+        texts (list): Texts to embed (at most EMBEDDING_BATCH_SIZE)
+        input_type (str, optional): 'passage' for stored documents or 'query' for
+            search queries. Defaults to 'passage'.
+
+    Returns:
+        list: One PINECONE_DIMENSION-dimensional vector per text
+
+    Raises:
+        ValueError: If the Pinecone API key is missing
+        PineconeError: If the request fails
+    """
+    session = _get_api_session()
+    try:
+        response = session.post(
+            f"{PINECONE_API_URL.rstrip('/')}/embed",
+            json={
+                'model': EMBEDDING_MODEL,
+                'parameters': {
+                    'input_type': input_type,
+                    'truncate': 'END',
+                    'dimension': PINECONE_DIMENSION,
+                },
+                'inputs': [{'text': text} for text in texts],
+            },
+            timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        return [item['values'] for item in response.json()['data']]
+    except (requests.RequestException, KeyError, ValueError) as e:
+        logger.error(f"Pinecone embedding request failed: {str(e)}")
+        raise PineconeError(f"Pinecone embedding request failed: {str(e)}") from e
+
+
+def fetch_metadata(ids: Iterable[str], namespace: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch the stored metadata for a set of post IDs.
+
+    Args:
+        ids (iterable): Post IDs (vector IDs)
+        namespace (str, optional): Namespace to read from. Defaults to PINECONE_NAMESPACE.
+
+    Returns:
+        dict: Mapping of post ID to its metadata; IDs not in the index are omitted
+
+    Raises:
+        PineconeError: If a request fails
+    """
+    index = initialize_pinecone()
+    namespace = PINECONE_NAMESPACE if namespace is None else namespace
+    ids = list(ids)
+
+    metadata = {}
+    for start in range(0, len(ids), FETCH_BATCH_SIZE):
+        response = index.fetch(ids[start:start + FETCH_BATCH_SIZE], namespace=namespace)
+        for vector_id, vector in response.get('vectors', {}).items():
+            metadata[vector_id] = vector.get('metadata') or {}
+    return metadata
+
+
+def update_metadata(post_id: str, fields: Dict[str, Any], namespace: Optional[str] = None) -> None:
+    """
+    Update selected metadata fields of a stored post without touching its vector.
+
+    Args:
+        post_id (str): Post ID (vector ID)
+        fields (dict): Metadata fields to overwrite
+        namespace (str, optional): Namespace to write to. Defaults to PINECONE_NAMESPACE.
+
+    Raises:
+        PineconeError: If the request fails
+    """
+    index = initialize_pinecone()
+    namespace = PINECONE_NAMESPACE if namespace is None else namespace
+    index.update(post_id, fields, namespace=namespace)
+
+
+def delete_embeddings(ids: Iterable[str], namespace: Optional[str] = None) -> int:
+    """
+    Delete stored posts by ID, DELETE_BATCH_SIZE IDs per request.
+
+    Args:
+        ids (iterable): Post IDs (vector IDs) to delete
+        namespace (str, optional): Namespace to delete from. Defaults to PINECONE_NAMESPACE.
+
+    Returns:
+        int: Number of IDs sent for deletion
+
+    Raises:
+        PineconeError: If a request fails
+    """
+    index = initialize_pinecone()
+    namespace = PINECONE_NAMESPACE if namespace is None else namespace
+    ids = list(ids)
+
+    for start in range(0, len(ids), DELETE_BATCH_SIZE):
+        index.delete(ids[start:start + DELETE_BATCH_SIZE], namespace=namespace)
+    if ids:
+        logger.info(f"Deleted {len(ids)} vectors from Pinecone")
+    return len(ids)
+
+
+def list_post_ids(namespace: Optional[str] = None) -> Iterator[str]:
+    """
+    Iterate over the IDs of all posts stored in the index.
+
+    Args:
+        namespace (str, optional): Namespace to list. Defaults to PINECONE_NAMESPACE.
+
+    Yields:
+        str: Post ID (vector ID)
+
+    Raises:
+        PineconeError: If a request fails
+    """
+    index = initialize_pinecone()
+    namespace = PINECONE_NAMESPACE if namespace is None else namespace
+
+    pagination_token = None
+    while True:
+        response = index.list_ids(namespace=namespace, pagination_token=pagination_token)
+        for vector in response.get('vectors', []):
+            yield vector['id']
+        pagination_token = (response.get('pagination') or {}).get('next')
+        if not pagination_token:
+            break
+
+
+def _api_headers(api_key: Optional[str]) -> Dict[str, str]:
+    """Build the headers every Pinecone API request needs."""
+    headers = {
+        'X-Pinecone-API-Version': PINECONE_API_VERSION,
+        'Content-Type': 'application/json',
+    }
+    if api_key:
+        headers['Api-Key'] = api_key
+    return headers
+
+
+def _describe_index_host(index_name: str) -> str:
+    """
+    Look up the data-plane host of an index through the control-plane API.
+
+    Args:
+        index_name (str): Name of the index
+
+    Returns:
+        str: Index host
+
+    Raises:
+        PineconeError: If the lookup fails
+    """
+    try:
+        response = _get_api_session().get(
+            f"{PINECONE_API_URL.rstrip('/')}/indexes/{index_name}",
+            timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        return response.json()['host']
+    except (requests.RequestException, KeyError, ValueError) as e:
+        logger.error(f"Failed to look up Pinecone index {index_name}: {str(e)}")
+        raise PineconeError(f"Failed to look up Pinecone index {index_name}: {str(e)}") from e
+
+
+def _get_api_session() -> requests.Session:
+    """
+    Return the shared control-plane/inference session, creating it on first use.
+
+    Raises:
+        ValueError: If the Pinecone API key is missing
+    """
+    global _api_session
+    if _api_session is None:
+        with _api_session_lock:
+            if _api_session is None:
+                if not PINECONE_API_KEY:
+                    raise ValueError("Missing required Pinecone credential: PINECONE_API_KEY")
+                session = create_http_session()
+                session.headers.update(_api_headers(PINECONE_API_KEY))
+                _api_session = session
+    return _api_session
+
+
+def _to_pinecone_metadata(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert post fields into metadata Pinecone accepts.
+
+    Pinecone metadata values must be strings, numbers, booleans or lists of
+    strings, so None values and nested objects are dropped and long content
+    is truncated.
+
+    Args:
+        fields (dict): Post and metadata fields
+
+    Returns:
+        dict: Metadata safe to upsert
+    """
+    metadata = {}
+    for key, value in fields.items():
+        if key in ('id', 'embedding') or value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            metadata[key] = [str(item) for item in value]
+        elif isinstance(value, (str, int, float, bool)):
+            metadata[key] = value
+    if isinstance(metadata.get('content'), str):
+        metadata['content'] = metadata['content'][:MAX_METADATA_CONTENT_CHARS]
+    return metadata
@@ -0,0 +1,189 @@
+"""
+Raw Post Archive for Vibe Coding Project Finder
+
+This module keeps every raw post returned by scrape_subreddits in a local, compressed
+archive, so the index can be rebuilt without going back to Reddit. Changing the cleaning
+rules in process_posts, the embedding model or the metadata prompt then only requires
+replaying the archive through the pipeline (see refresh_pipeline.replay_archive), which
+runs at local-disk speed instead of against a rate-limited API.
+
+Posts are stored as JSON lines in zstd-compressed files, partitioned by the UTC date the
+post was created:
+
+    POST_ARCHIVE_DIR/
+        2025/04/14/posts.jsonl.zst
+        2025/04/15/posts.jsonl.zst
+
+Each append writes one complete zstd frame to the end of the partition file, so files can
+be appended to across runs and are still readable with `zstd -dc`.
+
+Usage:
+    from services.post_archive import PostArchive
+
+    archive = PostArchive()
+    archive.append(raw_posts)
+
+    for post in archive.iter_posts(since=datetime.date(2025, 4, 1)):
+        ...
+"""
+
+import datetime  # For partitioning posts by creation date
+import io  # For reading the decompressed stream line by line
+import json  # For encoding posts as JSON lines
+import logging  # For logging archive writes and unreadable files
+import threading  # For serializing appends from pipeline threads
+from collections import defaultdict  # For grouping a batch by partition
+from pathlib import Path  # For cross-platform file paths
+from typing import List, Dict, Any, Optional, Iterable, Iterator  # Type hints for better code documentation
+
+import zstandard  # zstd compression for archive files
+
+# Import configuration from config file
+from ..config import (
+    POST_ARCHIVE_DIR,  # Root directory of the raw post archive
+    POST_ARCHIVE_COMPRESSION_LEVEL,  # zstd level used when appending
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Name of the data file inside every date partition
+PARTITION_FILE_NAME = 'posts.jsonl.zst'
+
+
+class PostArchive:
+    """
+    Append-only, date-partitioned archive of raw Reddit posts.
+
+    Example:
+        >>> archive = PostArchive()
+        >>> archive.append(scrape_subreddits())
+        >>> sum(1 for _ in archive.iter_posts())
+        250
+    """
+
+    def __init__(self, root: Optional[Path] = None, level: int = POST_ARCHIVE_COMPRESSION_LEVEL):
+        """
+        Args:
+            root (Path, optional): Archive directory. If None, uses POST_ARCHIVE_DIR
+                from config.py.
+            level (int, optional): zstd compression level for new data.
+                Defaults to POST_ARCHIVE_COMPRESSION_LEVEL.
+        """
+        self.root = Path(root or POST_ARCHIVE_DIR)
+        self.level = level
+        self._lock = threading.Lock()
+
+    def append(self, posts: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add raw posts to the archive.
+
+        Posts are grouped by the UTC date of their 'created_utc' and each group is
+        appended to its partition as one compressed frame.
+
+        Args:
+            posts (iterable): Raw post dictionaries as returned by scrape_subreddits
+
+        Returns:
+            int: Number of posts written
+        """
+        partitions: Dict[datetime.date, List[str]] = defaultdict(list)
+        for post in posts:
+            partitions[_created_date(post)].append(json.dumps(post, separators=(',', ':'), default=str))
+
+        written = 0
+        compressor = zstandard.ZstdCompressor(level=self.level)
+        with self._lock:
+            for date, lines in partitions.items():
+                path = self.partition_path(date)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                frame = compressor.compress(('\n'.join(lines) + '\n').encode('utf-8'))
+                with open(path, 'ab') as f:
+                    f.write(frame)
+                written += len(lines)
+        if written:
+            logger.debug(f"Archived {written} raw posts in {len(partitions)} partitions")
+        return written
+
+    def partition_path(self, date: datetime.date) -> Path:
+        """
+        Return the data file of one date partition.
+
+        Args:
+            date (date): UTC creation date
+
+        Returns:
+            Path: Location of the partition file (which may not exist yet)
+        """
+        return self.root / f"{date.year:04d}" / f"{date.month:02d}" / f"{date.day:02d}" / PARTITION_FILE_NAME
+
+    def partitions(
+        self, since: Optional[datetime.date] = None, until: Optional[datetime.date] = None
+    ) -> List[Path]:
+        """
+        List existing partition files in date order.
+
+        Args:
+            since (date, optional): First date to include
+            until (date, optional): Last date to include
+
+        Returns:
+            list: Paths of the matching partition files
+        """
+        paths = []
+        for path in sorted(self.root.glob(f"*/*/*/{PARTITION_FILE_NAME}")):
+            try:
+                year, month, day = (int(part) for part in path.parts[-4:-1])
+                date = datetime.date(year, month, day)
+            except ValueError:
+                logger.warning(f"Ignoring unexpected archive file {path}")
+                continue
+            if (since and date < since) or (until and date > until):
+                continue
+            paths.append(path)
+        return paths
+
+    def iter_posts(
+        self,
+        since: Optional[datetime.date] = None,
+        until: Optional[datetime.date] = None,
+        subreddits: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream archived raw posts, oldest partition first.
+
+        A post scraped by several runs is archived more than once; only its most
+        recently archived copy is returned, so replays use the latest score and
+        comment count. Every copy lands in the partition of the post's creation
+        date, so each partition is read fully before its posts are yielded and
+        memory stays bounded by the largest day, however long the range.
+
+        Args:
+            since (date, optional): Only posts created on or after this UTC date
+            until (date, optional): Only posts created on or before this UTC date
+            subreddits (iterable, optional): Only posts from these subreddits
+                (case-insensitive)
+
+        Yields:
+            dict: Raw post dictionaries, as originally returned by scrape_subreddits
+        """
+        wanted = {name.lower() for name in subreddits} if subreddits else None
+        decompressor = zstandard.ZstdDecompressor()
+        for path in self.partitions(since, until):
+            # Later copies replace earlier ones but keep the position of the first
+            latest: Dict[str, Dict[str, Any]] = {}
+            with open(path, 'rb') as f:
+                reader = decompressor.stream_reader(f, read_across_frames=True)
+                for line in io.TextIOWrapper(reader, encoding='utf-8'):
+                    if not line.strip():
+                        continue
+                    post = json.loads(line)
+                    if wanted is not None and post.get('subreddit', '').lower() not in wanted:
+                        continue
+                    latest[post['id']] = post
+            yield from latest.values()
+
+
+def _created_date(post: Dict[str, Any]) -> datetime.date:
+    """Return the UTC creation date of a raw post."""
+    return datetime.datetime.fromtimestamp(post['created_utc'], tz=datetime.timezone.utc).date()
@@ -0,0 +1,119 @@
+"""
+Project Pre-Classifier for Vibe Coding Project Finder
+
+Most scraped posts are not project ideas: r/learnprogramming in particular is mostly
+questions, career advice and debugging help. This module scores how likely a processed
+post is to describe a project, locally and on the CPU, so posts below a confidence cutoff
+can be dropped before they reach the paid metadata extraction and embedding stages.
+
+The classifier is a small linear model over hand-picked regex features (first-person
+"I built ...", links to a repo, asking for feedback, question phrasing, career talk, and
+so on). All features are compiled into one alternation with a named group per feature,
+so scoring a post is a single regex pass over its text followed by a logistic function.
+That is fast enough to score tens of thousands of posts per second.
+
+Usage:
+    from services.project_classifier import project_confidence
+
+    confidence = project_confidence(post['title'], post['content'])
+    if confidence >= PROJECT_CONFIDENCE_CUTOFF:
+        ...
+"""
+
+import math  # For the logistic function
+import re  # For the feature patterns
+from typing import Dict, Tuple  # Type hints for better code documentation
+
+# Model intercept; with no features matched a post scores about 0.55, so a post the
+# features say nothing about is kept rather than silently dropped
+BIAS = 0.2
+
+# (name, weight, pattern) of each feature; a feature counts once, however often it matches.
+# Patterns run on lowercased text and only match at the start of a word.
+FEATURES: Tuple[Tuple[str, float, str], ...] = (
+    # Someone presenting their own work
+    ('built', 2.2, r"i(?:'ve| have)? (?:just |finally )?(?:built|made|created|launched|shipped|developed|wrote|coded)\b"),
+    ('we_built', 1.8, r"we(?:'ve| have)? (?:just |finally )?(?:built|made|created|launched|shipped)\b"),
+    ('my_project', 1.6, r"(?:my|our) (?:side |weekend |hobby |first |new |latest )?"
+                        r"(?:project|app|tool|game|website|site|saas|extension|library|bot|plugin)\b"),
+    ('showcase', 1.4, r"(?:show(?:case| off)|introducing|check (?:it )?out|demo|live at|try it)\b"),
+    ('source', 1.0, r"(?:github|gitlab|open[- ]source|repo(?:sitory)?)\b"),
+    ('feedback', 0.9, r"(?:feedback|roast|thoughts on|what do you think)\b"),
+    ('idea', 0.8, r"(?:project idea|idea for|side project|weekend project|app idea)\b"),
+    ('stack', 0.6, r"(?:built (?:it )?(?:with|using)|tech stack|made with|powered by)\b"),
+    ('product', 0.5, r"(?:saas|mvp|beta|launch(?:ed|ing)?|waitlist|early users)\b"),
+    # Questions, help requests and career talk. Help and career words only count when
+    # someone is asking ("can someone help", "job hunting"), not in descriptions of a
+    # tool that helps job seekers.
+    ('question', -1.2, r"(?:how (?:do|can|should|would) (?:i|you|we)|what (?:is|are|should)|is it (?:possible|worth)"
+                       r"|can (?:someone|anyone)|why (?:does|is|do|doesn't))\b"),
+    ('help', -1.4, r"(?:help me|(?:need|any|some) help|please help|(?:someone|anyone) help|help needed"
+                   r"|stuck (?:on|with)|getting (?:an? )?error|doesn't work|not working|issue with|bug in)\b"),
+    ('career', -1.6, r"(?:job (?:hunt(?:ing)?|search(?:ing)?|market|offer)|career (?:advice|change|switch)"
+                     r"|resume review|review my resume|interview (?:prep|tips|questions)|(?:do|join) a bootcamp"
+                     r"|worth (?:a|the) degree|get(?:ting)? hired|hiring|salary|internship)\b"),
+    ('learning', -0.8, r"(?:should i learn|which language|where (?:do i|to) start|beginner question"
+                       r"|tutorial recommendations?|best course)\b"),
+)
+
+# Weight of a title phrased as a question
+TITLE_QUESTION_WEIGHT = -1.0
+
+_WEIGHTS: Dict[str, float] = {name: weight for name, weight, _ in FEATURES}
+
+# Characters of content scanned; posts say what they are about in their opening lines
+MAX_SCANNED_CHARS = 500
+
+# All features in one pattern, so a post is scanned only once. The shared word-boundary
+# check is hoisted out of the alternation so most positions are rejected immediately.
+_FEATURE_PATTERN = re.compile(
+    r'\b(?=[a-z])(?:' + '|'.join(f'(?P<{name}>{pattern})' for name, _, pattern in FEATURES) + ')'
+)
+
+
+def project_confidence(title: str, content: str) -> float:
+    """
+    Estimate the probability that a post describes a project.
+
+    Only the first MAX_SCANNED_CHARS characters of the content are scanned.
+
+    Args:
+        title (str): Cleaned post title
+        content (str): Cleaned post content (title and body)
+
+    Returns:
+        float: Confidence between 0 and 1
+
+    Example:
+        >>> project_confidence("I built a habit tracker", "I built a habit tracker with Next.js. Feedback welcome!")
+        0.96...
+        >>> project_confidence("How do I center a div?", "How do I center a div? Please help")
+        0.032...
+    """
+    return _logistic(BIAS + sum(explain(title, content).values()))
+
+
+def explain(title: str, content: str) -> Dict[str, float]:
+    """
+    List the features that matched a post and their weights.
+
+    Useful for checking why a post was kept or dropped when tuning the
+    weights, PROJECT_CONFIDENCE_CUTOFF or PROJECT_DROP_CONFIDENCE.
+
+    Args:
+        title (str): Cleaned post title
+        content (str): Cleaned post content (title and body)
+
+    Returns:
+        dict: Feature name to weight, for every matched feature
+    """
+    text = content[:MAX_SCANNED_CHARS].lower()
+    matched = {match.lastgroup: _WEIGHTS[match.lastgroup] for match in _FEATURE_PATTERN.finditer(text)}
+    if title.rstrip().endswith('?'):
+        matched['title_question'] = TITLE_QUESTION_WEIGHT
+    return matched
+
+
+def _logistic(value: float) -> float:
+    """Map a linear score to a probability."""
+    return 1.0 / (1.0 + math.exp(-value))
@@ -0,0 +1,487 @@
+"""
+Asyncio Reddit Scraping Backend for Vibe Coding Project Finder
+
+This module provides an asyncio implementation of scrape_subreddits built on Async PRAW.
+It returns exactly the same raw post dictionaries as the synchronous scraper in
+reddit_service, but independent Reddit requests are sent concurrently instead of one
+at a time, so a refresh is bounded by the Reddit rate limit rather than by the latency
+of each request.
+
+Concurrency is bounded twice: a semaphore sized by REDDIT_MAX_CONCURRENCY caps the
+number of requests in flight, and every request still waits for a token from the
+shared reddit_rate_limiter, so the async backend never sends faster than the sync one
+is allowed to.
+
+The async backend is opt-in (REDDIT_ASYNC_BACKEND) and the sync walk in reddit_service
+is kept rather than delegating to this one: streaming scrapes hand pages to the caller
+as they arrive through a plain generator, and HTTP fixtures can only be recorded and
+replayed on PRAW's requests transport. Only independent requests gain from asyncio;
+the pages of one listing are still fetched one after another, because each page
+request needs the `after` cursor returned by the previous one.
+
+Usage:
+    from services.reddit_async_service import scrape_subreddits_async
+    
+    # From async code
+    posts = await scrape_subreddits_async(["SideProject", "webdev"], limit=50)
+    
+    # From sync code (with REDDIT_ASYNC_BACKEND=true in .env)
+    posts = scrape_subreddits()
+    
+    # Digest of the top comments of already-scraped posts
+    digests = await fetch_comment_digests_async(["1k2j3h4", "1k2j5x9"])
+    
+    # From sync code, on one long-lived event loop and client shared by all calls
+    digests = get_comment_digest_fetcher().fetch(["1k2j3h4", "1k2j5x9"])
+"""
+
+import asyncio  # For running Reddit requests concurrently
+import atexit  # For closing the comment fetcher's client at shutdown
+import logging  # For logging info, warnings, and errors during scraping
+import os  # For dropping the comment fetcher in forked children
+import threading  # For the comment fetcher's event loop thread
+from typing import List, Dict, Any, Optional, Tuple  # Type hints for better code documentation
+
+import aiohttp  # Async PRAW's HTTP library, for connection-level errors
+import asyncpraw  # Asyncio version of the Python Reddit API Wrapper
+from asyncpraw.exceptions import AsyncPRAWException  # Async PRAW-specific exceptions
+from asyncprawcore import Requestor  # Async PRAW's HTTP transport, extended below for rate limiting
+from asyncprawcore.exceptions import AsyncPrawcoreException  # HTTP-level errors raised by Async PRAW
+
+# Import configuration from config file
+from ..config import (
+    REDDIT_CLIENT_ID,  # OAuth client ID from Reddit API
+    REDDIT_CLIENT_SECRET,  # OAuth client secret from Reddit API
+    REDDIT_USER_AGENT,  # User agent string for API requests
+    REDDIT_MAX_CONCURRENCY,  # Maximum Reddit requests in flight at once
+    COMMENT_TOP_N,  # Top comments summarized per post
+    COMMENT_REPLACE_MORE_LIMIT,  # "Load more comments" expansions per post
+    COMMENT_DIGEST_MAX_CHARS,  # Maximum length of a comment digest
+)
+from ..utils.text_cleaning import clean_texts  # Markdown stripping shared with process_posts
+from .reddit_service import (
+    DELETED_MARKERS,  # Placeholder text of deleted and removed content
+    LISTING_PAGE_SIZE,  # Reddit's maximum listing page size
+    ScrapeCursorStore,  # Per-subreddit high-water marks for incremental scraping
+    reddit_rate_limiter,  # Token bucket shared with the sync client
+    _ListingCollector,  # Shared per-subreddit bookkeeping for listing walks
+    _require_reddit_credentials,  # Credential validation shared with the sync client
+    _resolve_scrape_args,  # Shared argument defaults and validation
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Accounts whose comments are boilerplate rather than discussion
+BOT_AUTHORS = {'automoderator'}
+
+# Separates the comments in a digest
+DIGEST_SEPARATOR = '\n'
+
+
+class AsyncRateLimitedRequestor(Requestor):
+    """
+    Async PRAW requestor that sends every HTTP request through reddit_rate_limiter.
+    
+    This is the asyncio counterpart of reddit_service.RateLimitedRequestor. Both draw
+    from the same token bucket, so sync and async scrapes running in one process
+    share a single Reddit budget.
+    """
+    
+    async def request(self, *args: Any, **kwargs: Any):
+        """Wait for a rate limit token, send the request and record the quota headers."""
+        await reddit_rate_limiter.acquire_async()
+        response = await super().request(*args, **kwargs)
+        reddit_rate_limiter.update_from_headers(response.headers)
+        return response
+
+
+def create_async_reddit_client() -> asyncpraw.Reddit:
+    """
+    Create an Async PRAW Reddit instance with read-only authentication.
+    
+    Async clients own an aiohttp session bound to the running event loop, so unlike
+    the sync client they are not cached; use the result as an async context manager
+    so the session is closed when the scrape finishes.
+    
+    Returns:
+        asyncpraw.Reddit: Reddit instance for use inside the current event loop
+    
+    Raises:
+        ValueError: If required credentials are missing
+    
+    Example:
+        >>> async with create_async_reddit_client() as reddit:
+        ...     listing = await reddit.get("r/webdev/new")
+    """
+    _require_reddit_credentials()
+    return asyncpraw.Reddit(
+        client_id=REDDIT_CLIENT_ID,
+        client_secret=REDDIT_CLIENT_SECRET,
+        user_agent=REDDIT_USER_AGENT,
+        requestor_class=AsyncRateLimitedRequestor,  # Route all requests through the shared limiter
+        check_for_updates=False,  # Skip the PyPI version check on every client creation
+    )
+
+
+async def scrape_subreddits_async(
+    subreddits: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    cursor_store: Optional[ScrapeCursorStore] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Scrape posts from multiple subreddits using Async PRAW.
+    
+    Like reddit_service.scrape_subreddits, this walks one combined
+    r/SideProject+learnprogramming+... listing and splits it back out by subreddit.
+    When Reddit stops paginating the combined listing while some subreddits are
+    still short of `limit`, their individual listings are continued concurrently
+    rather than one after another.
+    
+    Args:
+        subreddits (list, optional): Subreddit names (without the 'r/' prefix) to scrape.
+            If None, uses the SUBREDDITS list from config.py.
+        limit (int, optional): Maximum number of posts to retrieve from each subreddit.
+            If None, uses MAX_POSTS_PER_SUBREDDIT from config.py.
+        cursor_store (ScrapeCursorStore, optional): If given, only posts newer than each
+            subreddit's high-water mark are returned (see reddit_service.scrape_subreddits).
+    
+    Returns:
+        list: Raw post dictionaries with the same keys as reddit_service.scrape_subreddits
+    
+    Raises:
+        asyncpraw.exceptions.AsyncPRAWException: If there's an issue with the Reddit API
+        asyncprawcore.exceptions.AsyncPrawcoreException: If a request fails
+        ValueError: If an invalid subreddit name or limit is provided
+    
+    Example:
+        >>> posts = asyncio.run(scrape_subreddits_async(["SideProject", "webdev"], limit=50))
+    """
+    subreddits, limit = _resolve_scrape_args(subreddits, limit)
+    collector = _ListingCollector(subreddits, limit, cursor_store)
+    semaphore = asyncio.Semaphore(REDDIT_MAX_CONCURRENCY)
+    posts: List[Dict[str, Any]] = []
+    
+    multireddit = "+".join(subreddits)
+    logger.info(
+        f"Scraping r/{multireddit} asynchronously (up to {limit} posts per subreddit"
+        + (", new posts only)" if cursor_store else ")")
+    )
+    async with create_async_reddit_client() as reddit:
+        exhausted = await _walk_listing_async(reddit, multireddit, None, collector, posts, semaphore)
+        
+        # Continue subreddits left short by Reddit's listing depth cap, all at once
+        if exhausted:
+            await asyncio.gather(*(
+                _walk_listing_async(
+                    reddit, name, collector.oldest.get(name.lower()), collector, posts, semaphore
+                )
+                for name in collector.pending()
+            ))
+    
+    collector.log_summary()
+    return posts
+
+
+async def _walk_listing_async(
+    reddit: asyncpraw.Reddit,
+    listing_name: str,
+    after: Optional[str],
+    collector: _ListingCollector,
+    posts: List[Dict[str, Any]],
+    semaphore: asyncio.Semaphore,
+) -> bool:
+    """
+    Page through one listing, appending the posts the collector keeps to `posts`.
+    
+    Args:
+        reddit (asyncpraw.Reddit): Reddit client used for the requests
+        listing_name (str): Subreddit name or '+'-joined subreddit names
+        after (str, optional): Fullname to start after, or None for the newest posts
+        collector (_ListingCollector): Shared progress tracker
+        posts (list): Output list, shared by concurrent walks
+        semaphore (asyncio.Semaphore): Bounds the number of requests in flight
+    
+    Returns:
+        bool: True if the listing ran out of pages before every subreddit in it was done
+    """
+    names = listing_name.split('+')
+    while True:
+        try:
+            submissions, after = await _fetch_listing_page_async(reddit, listing_name, after, semaphore)
+        except (AsyncPRAWException, AsyncPrawcoreException) as e:
+            logger.error(f"Failed to scrape r/{listing_name} after {collector.pages} pages: {str(e)}")
+            raise
+        collector.pages += 1
+        
+        for submission in submissions:
+            post = collector.accept(submission)
+            if post is not None:
+                posts.append(post)
+        
+        if not any(collector.is_pending(name) for name in names):
+            return False
+        if after is None:
+            return True
+
+
+async def _fetch_listing_page_async(
+    reddit: asyncpraw.Reddit,
+    listing_name: str,
+    after: Optional[str],
+    semaphore: asyncio.Semaphore,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of the newest posts from a (multi)subreddit listing.
+    
+    Args:
+        reddit (asyncpraw.Reddit): Reddit client used for the request
+        listing_name (str): Subreddit name or '+'-joined subreddit names
+        after (str, optional): Fullname of the last post on the previous page
+        semaphore (asyncio.Semaphore): Bounds the number of requests in flight
+    
+    Returns:
+        tuple: The submissions on this page and the `after` cursor for the next
+        page, which is None when the listing is exhausted
+    """
+    params = {"limit": LISTING_PAGE_SIZE, "raw_json": 1}
+    if after:
+        params["after"] = after
+    async with semaphore:
+        listing = await reddit.get(f"r/{listing_name}/new", params=params)
+    return list(listing), listing.after
+
+
+async def fetch_comment_digests_async(
+    post_ids: List[str],
+    top_n: Optional[int] = None,
+    replace_more_limit: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Fetch the top comments of posts and summarize each post's as a short digest.
+    
+    Each post costs one request for its top `top_n` comments plus at most
+    `replace_more_limit` requests to expand "load more comments" stubs, so the
+    cost of enriching N posts is bounded by N * (1 + replace_more_limit)
+    requests. Posts are fetched concurrently, with at most
+    REDDIT_MAX_CONCURRENCY in flight and every request drawing from the shared
+    reddit_rate_limiter.
+    
+    A post whose comments cannot be fetched (e.g., it was deleted since it was
+    scraped) gets a None digest instead of failing the whole batch.
+    
+    Args:
+        post_ids (list): Post IDs (without 't3_')
+        top_n (int, optional): Top-level comments per post. Defaults to COMMENT_TOP_N.
+        replace_more_limit (int, optional): "Load more comments" expansions per post.
+            Defaults to COMMENT_REPLACE_MORE_LIMIT.
+        max_chars (int, optional): Maximum digest length. Defaults to COMMENT_DIGEST_MAX_CHARS.
+    
+    Returns:
+        dict: Post ID to digest (cleaned comment bodies, best first, one per line),
+        '' for posts without usable comments or None if the fetch failed
+    
+    Raises:
+        ValueError: If required credentials are missing
+    
+    Example:
+        >>> digests = asyncio.run(fetch_comment_digests_async(["1k2j3h4"]))
+        >>> print(digests["1k2j3h4"])
+        Would love a calendar export
+        How does it handle time zones?
+    """
+    top_n = top_n or COMMENT_TOP_N
+    replace_more_limit = COMMENT_REPLACE_MORE_LIMIT if replace_more_limit is None else replace_more_limit
+    max_chars = max_chars or COMMENT_DIGEST_MAX_CHARS
+    semaphore = asyncio.Semaphore(REDDIT_MAX_CONCURRENCY)
+    
+    async with create_async_reddit_client() as reddit:
+        return await _gather_comment_digests(reddit, post_ids, top_n, replace_more_limit, max_chars, semaphore)
+
+
+class CommentDigestFetcher:
+    """
+    Comment digests for sync callers, from one long-lived event loop and client.
+    
+    Running fetch_comment_digests_async with asyncio.run() for every batch would
+    create a new event loop, a new Async PRAW client and a new OAuth token request
+    each time. The fetcher instead runs one event loop in a daemon thread and
+    keeps one client on it, so consecutive batches (e.g., from the refresh
+    pipeline's comments stage) reuse its token and connections. Batches may be
+    submitted from several threads; all of them share the REDDIT_MAX_CONCURRENCY
+    bound.
+    
+    Example:
+        >>> fetcher = CommentDigestFetcher()
+        >>> fetcher.fetch(["1k2j3h4"])
+        {'1k2j3h4': 'Would love a calendar export'}
+        >>> fetcher.close()
+    """
+    
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='reddit-comments', daemon=True)
+        self._thread.start()
+        # Created on the loop by the first batch; only ever touched from the loop thread
+        self._reddit: Optional[asyncpraw.Reddit] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    def fetch(self, post_ids: List[str], timeout: Optional[float] = None) -> Dict[str, Optional[str]]:
+        """
+        Fetch the comment digests of posts (see fetch_comment_digests_async).
+        
+        Args:
+            post_ids (list): Post IDs (without 't3_')
+            timeout (float, optional): Seconds to wait for the batch. Defaults to no limit.
+        
+        Returns:
+            dict: Post ID to digest ('' if the post has no usable comments, None if
+            its comments could not be fetched)
+        
+        Raises:
+            ValueError: If required credentials are missing
+        """
+        future = asyncio.run_coroutine_threadsafe(self._fetch(list(post_ids)), self._loop)
+        return future.result(timeout)
+    
+    async def _fetch(self, post_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Fetch one batch on the fetcher's loop, creating the client on first use."""
+        if self._reddit is None:
+            self._reddit = create_async_reddit_client()
+            self._semaphore = asyncio.Semaphore(REDDIT_MAX_CONCURRENCY)
+        return await _gather_comment_digests(
+            self._reddit, post_ids, COMMENT_TOP_N, COMMENT_REPLACE_MORE_LIMIT, COMMENT_DIGEST_MAX_CHARS,
+            self._semaphore,
+        )
+    
+    def close(self) -> None:
+        """Close the client and stop the event loop thread."""
+        if not self._thread.is_alive():
+            return
+        if self._reddit is not None:
+            asyncio.run_coroutine_threadsafe(self._reddit.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+# Shared comment fetcher, created on first use by get_comment_digest_fetcher()
+_comment_fetcher: Optional[CommentDigestFetcher] = None
+_comment_fetcher_lock = threading.Lock()
+
+
+def get_comment_digest_fetcher() -> CommentDigestFetcher:
+    """
+    Return the process-wide comment digest fetcher, starting it on first use.
+    
+    Returns:
+        CommentDigestFetcher: Fetcher closed automatically at interpreter exit
+    """
+    global _comment_fetcher
+    if _comment_fetcher is None:
+        with _comment_fetcher_lock:
+            if _comment_fetcher is None:
+                _comment_fetcher = CommentDigestFetcher()
+                atexit.register(_comment_fetcher.close)
+    return _comment_fetcher
+
+
+def _reset_comment_fetcher_after_fork() -> None:
+    """Drop the fetcher inherited from the parent; its loop thread does not exist in the child."""
+    global _comment_fetcher, _comment_fetcher_lock
+    _comment_fetcher_lock = threading.Lock()
+    _comment_fetcher = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_comment_fetcher_after_fork)
+
+
+async def _gather_comment_digests(
+    reddit: asyncpraw.Reddit,
+    post_ids: List[str],
+    top_n: int,
+    replace_more_limit: int,
+    max_chars: int,
+    semaphore: asyncio.Semaphore,
+) -> Dict[str, Optional[str]]:
+    """
+    Fetch the digests of posts concurrently with an existing client.
+    
+    Returns:
+        dict: Post ID to digest (see fetch_comment_digests_async)
+    """
+    digests = await asyncio.gather(*(
+        _fetch_comment_digest_async(reddit, post_id, top_n, replace_more_limit, max_chars, semaphore)
+        for post_id in post_ids
+    ))
+    
+    failed = sum(digest is None for digest in digests)
+    logger.info(
+        f"Fetched comment digests for {len(post_ids) - failed} of {len(post_ids)} posts"
+    )
+    return dict(zip(post_ids, digests))
+
+
+async def _fetch_comment_digest_async(
+    reddit: asyncpraw.Reddit,
+    post_id: str,
+    top_n: int,
+    replace_more_limit: int,
+    max_chars: int,
+    semaphore: asyncio.Semaphore,
+) -> Optional[str]:
+    """
+    Fetch one post's top comments and build its digest.
+    
+    Returns:
+        str: Digest ('' if there are no usable comments), or None if the fetch failed
+    """
+    try:
+        async with semaphore:
+            submission = await reddit.submission(post_id, fetch=False)
+            # Sort and limit must be set before the comments are fetched
+            submission.comment_sort = 'top'
+            submission.comment_limit = top_n
+            await submission.load()
+            await submission.comments.replace_more(limit=replace_more_limit)
+    except (AsyncPRAWException, AsyncPrawcoreException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+        # Connection errors and timeouts are caught here too, so one bad post
+        # cannot fail the other fetches gathered with it
+        logger.warning(f"Failed to fetch comments for post {post_id}: {str(e)}")
+        return None
+    return build_comment_digest(list(submission.comments), top_n, max_chars)
+
+
+def build_comment_digest(comments: List[Any], top_n: int, max_chars: int) -> str:
+    """
+    Summarize top-level comments as a digest of their cleaned bodies.
+    
+    Deleted, removed, stickied and bot comments are skipped; the remaining
+    comments are ordered by score and the best `top_n` are kept. The digest is
+    cut at a word boundary to at most `max_chars` characters.
+    
+    Args:
+        comments (list): Top-level comments (objects with body, score, stickied
+            and author attributes)
+        top_n (int): Maximum number of comments in the digest
+        max_chars (int): Maximum digest length
+    
+    Returns:
+        str: One cleaned comment per line, best first ('' if none are usable)
+    """
+    usable = [
+        comment for comment in comments
+        if isinstance(getattr(comment, 'body', None), str)
+        and comment.body.strip() not in DELETED_MARKERS
+        and not getattr(comment, 'stickied', False)
+        and (getattr(comment.author, 'name', '') or '').lower() not in BOT_AUTHORS
+    ]
+    usable.sort(key=lambda comment: comment.score, reverse=True)
+    bodies = [body for body in clean_texts([comment.body for comment in usable[:top_n]]) if body]
+    
+    digest = DIGEST_SEPARATOR.join(bodies)
+    if len(digest) > max_chars:
+        digest = digest[:max_chars].rsplit(' ', 1)[0].rstrip()
+    return digest
@@ -0,0 +1,399 @@
+"""
+Reddit Dump Backfill for Vibe Coding Project Finder
+
+Reddit listings only go back about 1000 posts per subreddit, far less history than a new
+index needs. This module cold-starts the index from offline Reddit submission dumps
+instead: zstd-compressed NDJSON files with one submission per line (for example the
+monthly RS_YYYY-MM.zst files published by the Pushshift / Arctic Shift archives).
+
+Decompression and parsing both run in a pool of worker processes, so ingesting millions
+of posts is a CPU-bound local job rather than an API crawl:
+
+- Several dumps (the usual multi-month backfill): each worker takes a whole file,
+  decompresses it, keeps the submissions of the configured subreddits, converts them
+  to the raw post format of scrape_subreddits, and spills them to a small compressed
+  temporary file that the main process then reads back in file order.
+- A single dump: a zstd stream can only be decompressed from its start, so the main
+  process decompresses it and hands chunks of lines to the workers for parsing.
+
+By default the posts are appended to the raw post archive; `--replay` then runs the
+archived range through the ingestion pipeline (see refresh_pipeline.replay_archive).
+
+Usage:
+    # Archive three years of history for the configured subreddits, then index it
+    python -m backend.services.reddit_backfill dumps/RS_2022-*.zst dumps/RS_2023-*.zst --replay
+
+    # Or consume the posts directly
+    from services.reddit_backfill import iter_dump_posts
+
+    for post in iter_dump_posts(["RS_2024-01.zst"]):
+        ...
+"""
+
+import argparse  # For the backfill command line
+import datetime  # For date filters
+import io  # For reading the decompressed stream line by line
+import json  # For parsing dump lines
+import logging  # For logging backfill progress
+import os  # For the default number of worker processes
+import tempfile  # For the workers' spill files
+import time  # For reporting throughput
+from collections import deque  # For bounding the chunks in flight
+from concurrent.futures import ProcessPoolExecutor  # For parsing chunks in parallel
+from pathlib import Path  # For cross-platform file paths
+from typing import List, Dict, Any, Optional, Iterable, Iterator, FrozenSet  # Type hints for better code documentation
+
+import zstandard  # Decompression of the dump files
+
+# Import configuration from config file
+from ..config import (
+    SUBREDDITS,  # List of subreddits to keep
+)
+from .post_archive import PostArchive  # Destination of backfilled posts
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Dump lines handed to a worker process at a time
+CHUNK_LINES = 20000
+
+# Dumps are compressed with long-distance matching and need a 2 GiB window
+MAX_WINDOW_SIZE = 2 ** 31
+
+# Bytes read from the decompressor at a time
+READ_SIZE = 1 << 20
+
+# zstd level of the workers' temporary spill files; fast, since they are read once
+SPILL_COMPRESSION_LEVEL = 1
+
+
+def iter_dump_posts(
+    paths: Iterable[Path],
+    subreddits: Optional[Iterable[str]] = None,
+    since: Optional[datetime.date] = None,
+    until: Optional[datetime.date] = None,
+    workers: Optional[int] = None,
+    chunk_lines: int = CHUNK_LINES,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream raw posts from zstd-compressed NDJSON submission dumps.
+
+    With several dumps, each worker process decompresses and filters whole files
+    (see the module docstring); with one, workers parse chunks of its lines. At
+    most two files or chunks per worker are in flight, so memory use stays flat
+    however large the dumps are. Posts are yielded in file order.
+
+    Args:
+        paths (iterable): Dump files to read, in order
+        subreddits (iterable, optional): Subreddits to keep (case-insensitive).
+            If None, uses the SUBREDDITS list from config.py.
+        since (date, optional): Only posts created on or after this UTC date
+        until (date, optional): Only posts created on or before this UTC date
+        workers (int, optional): Number of parser processes. Defaults to the CPU count.
+        chunk_lines (int, optional): Lines per parser task. Defaults to CHUNK_LINES.
+
+    Yields:
+        dict: Raw post dictionaries with the same keys as scrape_subreddits returns
+
+    Example:
+        >>> posts = iter_dump_posts(["RS_2024-01.zst"], subreddits=["SideProject"])
+        >>> next(posts)['subreddit']
+        'SideProject'
+    """
+    wanted = frozenset(name.lower() for name in (subreddits or SUBREDDITS))
+    since_ts = _day_start(since) if since else None
+    until_ts = _day_start(until + datetime.timedelta(days=1)) if until else None
+    workers = workers or os.cpu_count() or 1
+    paths = [Path(path) for path in paths]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if len(paths) > 1:
+            yield from _iter_filtered_files(pool, paths, workers, wanted, since_ts, until_ts, chunk_lines)
+            return
+
+        in_flight = deque()
+        for path in paths:
+            logger.info(f"Backfilling from {path}")
+            for chunk in _iter_line_chunks(path, chunk_lines):
+                in_flight.append(pool.submit(_parse_chunk, chunk, wanted, since_ts, until_ts))
+                if len(in_flight) >= workers * 2:
+                    yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def _iter_filtered_files(
+    pool: ProcessPoolExecutor,
+    paths: List[Path],
+    workers: int,
+    subreddits: FrozenSet[str],
+    since_ts: Optional[float],
+    until_ts: Optional[float],
+    chunk_lines: int,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Decompress and filter whole dump files in the pool and yield their posts in order.
+
+    Args:
+        pool (ProcessPoolExecutor): Worker pool
+        paths (list): Dump files, in order
+        workers (int): Number of worker processes
+        subreddits (frozenset): Lowercase names of the subreddits to keep
+        since_ts (float): Earliest creation timestamp to keep, or None
+        until_ts (float): Creation timestamp to stop before, or None
+        chunk_lines (int): Lines parsed at a time inside a worker
+
+    Yields:
+        dict: Raw post dictionaries
+    """
+    with tempfile.TemporaryDirectory(prefix='backfill-') as spill_dir:
+        in_flight = deque()
+        for number, path in enumerate(paths):
+            spill_path = Path(spill_dir) / f"{number}.ndjson.zst"
+            in_flight.append((path, spill_path, pool.submit(
+                _filter_file, path, spill_path, subreddits, since_ts, until_ts, chunk_lines
+            )))
+            if len(in_flight) >= workers * 2:
+                yield from _read_spill(*in_flight.popleft())
+        while in_flight:
+            yield from _read_spill(*in_flight.popleft())
+
+
+def _filter_file(
+    path: Path,
+    spill_path: Path,
+    subreddits: FrozenSet[str],
+    since_ts: Optional[float],
+    until_ts: Optional[float],
+    chunk_lines: int,
+) -> int:
+    """
+    Decompress one dump and spill its wanted posts to a file (runs in a worker process).
+
+    Args:
+        path (Path): zstd-compressed NDJSON dump
+        spill_path (Path): Where to write the kept posts, as zstd NDJSON
+        subreddits (frozenset): Lowercase names of the subreddits to keep
+        since_ts (float): Earliest creation timestamp to keep, or None
+        until_ts (float): Creation timestamp to stop before, or None
+        chunk_lines (int): Lines parsed at a time
+
+    Returns:
+        int: Number of posts written
+    """
+    written = 0
+    with open(spill_path, 'wb') as f:
+        with zstandard.ZstdCompressor(level=SPILL_COMPRESSION_LEVEL).stream_writer(f) as writer:
+            for chunk in _iter_line_chunks(path, chunk_lines):
+                for post in _parse_chunk(chunk, subreddits, since_ts, until_ts):
+                    writer.write(json.dumps(post).encode('utf-8') + b'\n')
+                    written += 1
+    return written
+
+
+def _read_spill(path: Path, spill_path: Path, future: Any) -> Iterator[Dict[str, Any]]:
+    """Wait for a file's worker, then yield the posts it spilled and delete the spill file."""
+    written = future.result()
+    logger.info(f"Backfilling {written} posts from {path}")
+    try:
+        for chunk in _iter_line_chunks(spill_path, CHUNK_LINES):
+            for line in chunk:
+                yield json.loads(line)
+    finally:
+        spill_path.unlink()
+
+
+def backfill(
+    paths: List[Path],
+    subreddits: Optional[Iterable[str]] = None,
+    since: Optional[datetime.date] = None,
+    until: Optional[datetime.date] = None,
+    workers: Optional[int] = None,
+    archive: Optional[PostArchive] = None,
+) -> Dict[str, Any]:
+    """
+    Append the matching posts of submission dumps to the raw post archive.
+
+    Args:
+        paths (list): Dump files to read
+        subreddits (iterable, optional): Subreddits to keep. Defaults to SUBREDDITS.
+        since (date, optional): Only posts created on or after this UTC date
+        until (date, optional): Only posts created on or before this UTC date
+        workers (int, optional): Number of parser processes. Defaults to the CPU count.
+        archive (PostArchive, optional): Destination archive. If None, the archive in
+            POST_ARCHIVE_DIR is used.
+
+    Returns:
+        dict: Summary with 'archived' (int) and 'seconds' (float)
+    """
+    archive = archive or PostArchive()
+    started = time.monotonic()
+    archived = 0
+    batch = []
+    for post in iter_dump_posts(paths, subreddits, since, until, workers):
+        batch.append(post)
+        if len(batch) >= CHUNK_LINES:
+            archived += archive.append(batch)
+            batch = []
+            logger.info(f"Archived {archived} backfilled posts")
+    archived += archive.append(batch)
+
+    seconds = round(time.monotonic() - started, 1)
+    logger.info(f"Backfill finished: {archived} posts archived in {seconds}s")
+    return {'archived': archived, 'seconds': seconds}
+
+
+def _iter_line_chunks(path: Path, chunk_lines: int) -> Iterator[List[bytes]]:
+    """
+    Decompress a dump file and yield its lines in chunks.
+
+    Args:
+        path (Path): zstd-compressed NDJSON file
+        chunk_lines (int): Lines per chunk
+
+    Yields:
+        list: Up to `chunk_lines` raw lines
+    """
+    decompressor = zstandard.ZstdDecompressor(max_window_size=MAX_WINDOW_SIZE)
+    with open(path, 'rb') as f:
+        reader = io.BufferedReader(decompressor.stream_reader(f, read_size=READ_SIZE), buffer_size=READ_SIZE)
+        chunk = []
+        for line in reader:
+            chunk.append(line)
+            if len(chunk) >= chunk_lines:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _parse_chunk(
+    lines: List[bytes],
+    subreddits: FrozenSet[str],
+    since_ts: Optional[float],
+    until_ts: Optional[float],
+) -> List[Dict[str, Any]]:
+    """
+    Parse dump lines and convert the wanted submissions (runs in a worker process).
+
+    Args:
+        lines (list): Raw NDJSON lines
+        subreddits (frozenset): Lowercase names of the subreddits to keep
+        since_ts (float): Earliest creation timestamp to keep, or None
+        until_ts (float): Creation timestamp to stop before, or None
+
+    Returns:
+        list: Raw post dictionaries
+    """
+    # Cheap byte-level check first: most lines belong to other subreddits
+    needles = [name.encode('utf-8') for name in subreddits]
+    posts = []
+    for line in lines:
+        lowered = line.lower()
+        if not any(needle in lowered for needle in needles):
+            continue
+        try:
+            submission = json.loads(line)
+        except ValueError:
+            continue
+        if str(submission.get('subreddit', '')).lower() not in subreddits:
+            continue
+        post = _dump_to_dict(submission)
+        if post is None:
+            continue
+        if (since_ts and post['created_utc'] < since_ts) or (until_ts and post['created_utc'] >= until_ts):
+            continue
+        posts.append(post)
+    return posts
+
+
+def _dump_to_dict(submission: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Convert a dump submission into the raw post dictionary returned by scrape_subreddits.
+
+    Older dumps store some numbers as strings and omit fields, so values are
+    coerced and defaulted.
+
+    Args:
+        submission (dict): Parsed dump line
+
+    Returns:
+        dict: Raw post data, or None if the line is not a usable submission
+    """
+    try:
+        post_id = str(submission['id'])
+        created_utc = float(submission['created_utc'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    permalink = submission.get('permalink') or f"/r/{submission['subreddit']}/comments/{post_id}/"
+    return {
+        "id": post_id,
+        "title": submission.get('title') or "",
+        "selftext": submission.get('selftext') or "",
+        "url": f"https://www.reddit.com{permalink}",
+        "author": submission.get('author') or "[deleted]",
+        "created_utc": created_utc,
+        "subreddit": submission['subreddit'],
+        "score": _to_int(submission.get('score')),
+        "num_comments": _to_int(submission.get('num_comments')),
+    }
+
+
+def _to_int(value: Any) -> int:
+    """
+    Coerce a dump number to int, treating missing or malformed values as 0.
+
+    Older dumps store numbers as strings, including float strings ("12.0") and
+    placeholders ("null"); one bad field must not abort a whole chunk.
+
+    Args:
+        value: Number, numeric string, None or anything else found in a dump
+
+    Returns:
+        int: The value, or 0 if it is not a finite number
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+def _day_start(date: datetime.date) -> float:
+    """Return the UTC timestamp at the start of a date."""
+    return datetime.datetime(date.year, date.month, date.day, tzinfo=datetime.timezone.utc).timestamp()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Command-line entry point.
+
+    Example:
+        python -m backend.services.reddit_backfill RS_2024-01.zst --since 2024-01-15
+    """
+    parser = argparse.ArgumentParser(description="Backfill the post archive from Reddit submission dumps")
+    parser.add_argument('paths', nargs='+', type=Path, help="zstd-compressed NDJSON submission dumps")
+    parser.add_argument('--subreddit', action='append', dest='subreddits',
+                        help="Subreddit to keep (repeatable; defaults to SUBREDDITS from config.py)")
+    parser.add_argument('--since', type=datetime.date.fromisoformat, help="First creation date (YYYY-MM-DD)")
+    parser.add_argument('--until', type=datetime.date.fromisoformat, help="Last creation date (YYYY-MM-DD)")
+    parser.add_argument('--workers', type=int, help="Parser processes (defaults to the CPU count)")
+    parser.add_argument('--replay', action='store_true',
+                        help="Run the archived range through the ingestion pipeline afterwards")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    summary = backfill(args.paths, args.subreddits, args.since, args.until, args.workers)
+    if args.replay:
+        # Imported here so plain backfills need no OpenAI or Pinecone setup
+        from .refresh_pipeline import replay_archive
+        replay = replay_archive(since=args.since, until=args.until, subreddits=args.subreddits)
+        summary.update({key: value for key, value in replay.items() if key != 'stages'})
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -18,6 +18,10 @@ Usage:
     # Process the posts
     processed_posts = process_posts(posts)
     
+    # Or stream posts through cleaning as each listing page arrives
+    for post in process_posts(scrape_subreddits(stream=True), stream=True):
+        ...
+    
     # Schedule regular refresh
     schedule_refresh()
 """
@@ -26,8 +30,19 @@ import praw  # Python Reddit API Wrapper for interacting with Reddit's API
 import logging  # For logging info, warnings, and errors during scraping
 import datetime  # For converting UTC timestamps to readable datetime format
 import time  # For implementing rate limit handling and delays
-from typing import List, Dict, Any, Optional  # Type hints for better code documentation
+import re  # For validating subreddit names
+import asyncio  # For running the asyncio scraping backend from sync callers
+import itertools  # For reading posts in cleaning batches
+import json  # For persisting scrape cursors between refreshes
+import os  # For atomically replacing the cursor file and resetting the client after fork
+import random  # For jittering the first run of scheduled jobs
+import tempfile  # For writing the cursor file before swapping it into place
+import threading  # For guarding the cursor store against concurrent updates
+from pathlib import Path  # For cross-platform file paths
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple, Iterable, Iterator, Union, Generator, Callable  # Type hints for better code documentation
 from praw.exceptions import PRAWException, APIException, ClientException  # PRAW-specific exceptions
+from prawcore import Requestor  # PRAW's HTTP transport, extended below for rate limiting
+from prawcore.exceptions import PrawcoreException  # HTTP-level errors raised by PRAW's transport
 
 # Import configuration from config file
 from ..config import (
@@ -36,13 +51,116 @@ from ..config import (
     REDDIT_USER_AGENT,  # User agent string for API requests
     SUBREDDITS,  # List of subreddits to scrape
     REDDIT_RATE_LIMIT,  # Maximum requests per minute to Reddit API
+    REDDIT_RATE_LIMIT_BURST,  # Maximum burst of back-to-back Reddit requests
     MAX_POSTS_PER_SUBREDDIT,  # Maximum number of posts to fetch per subreddit
     REFRESH_INTERVAL_HOURS,  # Refresh interval in hours
+    MIN_REFRESH_INTERVAL_HOURS,  # Shortest adaptive per-subreddit refresh interval
+    REFRESH_TICK_MINUTES,  # How often the scheduler checks which subreddits are due
+    SCHEDULER_LOCK_FILE,  # Lease locks shared by all processes running the scheduler
+    SCHEDULER_LEASE_SECONDS,  # How long a scheduled job's lease lasts without renewal
+    SCHEDULER_JITTER_SECONDS,  # Random delay added to scheduled job starts
+    SCRAPE_CURSOR_FILE,  # File holding the newest seen post per subreddit
+    REDDIT_ASYNC_BACKEND,  # Whether non-streaming scrapes use the asyncio backend
+    PROJECT_CONFIDENCE_CUTOFF,  # Classifier confidence at which a post counts as a project
+    COMMENT_TOP_N,  # Top comments summarized per post
+    COMMENT_REPLACE_MORE_LIMIT,  # "Load more comments" expansions per post
+    COMMENT_DIGEST_MAX_CHARS,  # Maximum length of a comment digest
 )
+from ..utils.helpers import TokenBucketRateLimiter, LeaseLock, create_http_session  # Throttling, job locks, pooled HTTP
+
+# The scheduler, the text cleaning engine, the classifier and the Pinecone client are
+# imported by the functions that use them, so importing this module stays cheap
+if TYPE_CHECKING:
+    from apscheduler.schedulers.background import BackgroundScheduler  # Runs refresh jobs in a background thread
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 
+# Every Reddit request made by this process waits for a token from this limiter,
+# so concurrent scrapes together stay within REDDIT_RATE_LIMIT
+reddit_rate_limiter = TokenBucketRateLimiter(
+    REDDIT_RATE_LIMIT, capacity=REDDIT_RATE_LIMIT_BURST, name='Reddit API'
+)
+
+# Identifiers of the recurring jobs in the scheduler
+REFRESH_JOB_ID = 'reddit_refresh'
+SWEEP_JOB_ID = 'reddit_sweep'
+
+
+class SchedulerError(Exception):
+    """Raised when the refresh job cannot be scheduled."""
+
+
+class ConfigError(Exception):
+    """Raised when the refresh configuration is invalid."""
+
+# Reddit returns at most 100 items per listing page
+LISTING_PAGE_SIZE = 100
+
+# Reddit accepts at most 100 fullnames per /api/info request
+INFO_BATCH_SIZE = 100
+
+# Engagement fields refreshed from Reddit: submission attribute -> stored metadata field
+ENGAGEMENT_FIELDS = {
+    'score': 'score',
+    'num_comments': 'comment_count',
+}
+
+# Subreddit names are 2-21 characters of letters, digits and underscores
+SUBREDDIT_NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_]{1,20}$')
+
+# Keys every raw post must have before it can be processed
+REQUIRED_POST_KEYS = (
+    'id', 'title', 'selftext', 'url', 'author', 'created_utc',
+    'subreddit', 'score', 'num_comments',
+)
+
+# Placeholder text Reddit leaves behind for deleted or removed posts
+DELETED_MARKERS = {'[deleted]', '[removed]'}
+
+# Raw posts cleaned together in one clean_texts() call (about one listing page)
+CLEAN_BATCH_SIZE = 100
+
+
+class RateLimitedRequestor(Requestor):
+    """
+    PRAW requestor that sends every HTTP request through reddit_rate_limiter.
+    
+    PRAW's own rate limiting only sleeps after Reddit reports the quota is low,
+    and only for the client that saw the response. Plugging this requestor into
+    every client makes all of them draw from the same token bucket before each
+    request, and feeds Reddit's X-Ratelimit-* response headers back into it.
+    """
+    
+    def request(self, *args: Any, **kwargs: Any):
+        """Wait for a rate limit token, send the request and record the quota headers."""
+        reddit_rate_limiter.acquire()
+        response = super().request(*args, **kwargs)
+        reddit_rate_limiter.update_from_headers(response.headers)
+        return response
+
+
+def _require_reddit_credentials() -> None:
+    """
+    Check that all Reddit credentials are configured.
+    
+    Raises:
+        ValueError: If required credentials are missing
+    """
+    if not all([REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_USER_AGENT]):
+        missing_creds = []
+        if not REDDIT_CLIENT_ID:
+            missing_creds.append("REDDIT_CLIENT_ID")
+        if not REDDIT_CLIENT_SECRET:
+            missing_creds.append("REDDIT_CLIENT_SECRET")
+        if not REDDIT_USER_AGENT:
+            missing_creds.append("REDDIT_USER_AGENT")
+        
+        error_msg = f"Missing required Reddit credentials: {', '.join(missing_creds)}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+
 def initialize_reddit_client() -> praw.Reddit:
     """
     Initialize and return a PRAW Reddit instance.
@@ -61,25 +179,24 @@ def initialize_reddit_client() -> praw.Reddit:
     """
     try:
         # Validate required credentials
-        if not all([REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_USER_AGENT]):
-            missing_creds = []
-            if not REDDIT_CLIENT_ID:
-                missing_creds.append("REDDIT_CLIENT_ID")
-            if not REDDIT_CLIENT_SECRET:
-                missing_creds.append("REDDIT_CLIENT_SECRET")
-            if not REDDIT_USER_AGENT:
-                missing_creds.append("REDDIT_USER_AGENT")
-            
-            error_msg = f"Missing required Reddit credentials: {', '.join(missing_creds)}"
-            logger.error(error_msg)
-            raise ValueError(error_msg)
+        _require_reddit_credentials()
             
+        # Record or replay Reddit traffic along with the other APIs'. PRAW does its own
+        # retries and backoff, so the session must neither retry nor raise on 429/5xx.
+        from ..utils.http_fixtures import fixtures_enabled
+        requestor_kwargs = (
+            {'session': create_http_session(retries=0, retry_on_status=False)} if fixtures_enabled() else None
+        )
+        
         # Initialize with read-only authentication
         logger.info("Initializing Reddit client with read-only authentication")
         reddit = praw.Reddit(
             client_id=REDDIT_CLIENT_ID,
             client_secret=REDDIT_CLIENT_SECRET,
             user_agent=REDDIT_USER_AGENT,
+            requestor_class=RateLimitedRequestor,  # Route all requests through the shared limiter
+            requestor_kwargs=requestor_kwargs,
+            check_for_updates=False,  # Skip PRAW's PyPI version check on every client creation
         )
         
         # Verify that the connection works
@@ -90,14 +207,226 @@ def initialize_reddit_client() -> praw.Reddit:
         logger.error(f"Failed to initialize Reddit client: {str(e)}")
         raise
 
-# Create a global Reddit instance to be reused
-try:
-    reddit_client = initialize_reddit_client()
-except Exception as e:
-    logger.error(f"Could not initialize Reddit client on module load: {str(e)}")
-    reddit_client = None
+# Background scheduler used by schedule_refresh when none is supplied
+_scheduler: Optional['BackgroundScheduler'] = None
+
+# Shared Reddit client, created on first use by get_reddit_client()
+_reddit_client: Optional[praw.Reddit] = None
+_reddit_client_lock = threading.Lock()
+
+
+def get_reddit_client() -> praw.Reddit:
+    """
+    Return the shared Reddit client, creating it on first use.
+    
+    Importing this module does not touch PRAW or the network; the client is built
+    the first time something actually needs it and then reused by every thread.
+    Concurrent first calls are serialized so only one client is ever created.
+    
+    Returns:
+        praw.Reddit: Authenticated Reddit instance
+    
+    Raises:
+        ValueError: If required credentials are missing
+        PRAWException: If there's an issue with the Reddit API connection
+    """
+    global _reddit_client
+    client = _reddit_client
+    if client is None:
+        with _reddit_client_lock:
+            if _reddit_client is None:
+                _reddit_client = initialize_reddit_client()
+            client = _reddit_client
+    return client
+
+
+def warm_up_reddit_client() -> bool:
+    """
+    Create the shared Reddit client ahead of the first scrape.
+    
+    Call this from a startup or post-fork hook to pay the client setup cost (and
+    surface configuration errors) before the first request instead of during it.
+    
+    Returns:
+        bool: True if the client is ready, False if it could not be created
+    
+    Example:
+        >>> # gunicorn.conf.py
+        >>> def post_fork(server, worker):
+        ...     warm_up_reddit_client()
+    """
+    try:
+        get_reddit_client()
+        return True
+    except Exception as e:
+        logger.error(f"Could not initialize Reddit client: {str(e)}")
+        return False
+
+
+def reset_reddit_client() -> None:
+    """Discard the shared Reddit client so the next call to get_reddit_client() builds a new one."""
+    global _reddit_client
+    with _reddit_client_lock:
+        _reddit_client = None
 
-def scrape_subreddits(subreddits: Optional[List[str]] = None, limit: Optional[int] = None):
+
+def _reset_reddit_client_after_fork() -> None:
+    """Drop the client inherited from the parent, whose HTTP connections must not be shared."""
+    global _reddit_client, _reddit_client_lock
+    # The parent's lock may have been held by another thread at fork time
+    _reddit_client_lock = threading.Lock()
+    _reddit_client = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_reddit_client_after_fork)
+
+class ScrapeCursorStore:
+    """
+    Persisted per-subreddit high-water marks for incremental scraping.
+    
+    For every subreddit the store remembers the newest post that has been fully
+    ingested (its created_utc and fullname). Incremental scrapes stop paging a
+    subreddit as soon as they reach a post at or below its mark, so each refresh
+    only downloads posts that are new since the previous one.
+    
+    Marks observed during a scrape are staged with advance() and only written to
+    disk by commit(). Callers commit after the new posts have been stored, so a
+    refresh that fails halfway fetches the same posts again next time instead of
+    skipping them.
+    
+    Example:
+        >>> store = ScrapeCursorStore()
+        >>> posts = scrape_subreddits(cursor_store=store)
+        >>> store_posts(posts)
+        >>> store.commit()
+    """
+    
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Load the cursor file, starting empty if it does not exist yet.
+        
+        Args:
+            path (Path, optional): Location of the cursor file.
+                If None, uses SCRAPE_CURSOR_FILE from config.py.
+        """
+        self.path = Path(path or SCRAPE_CURSOR_FILE)
+        self._lock = threading.Lock()
+        self._cursors = self._load()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the cursor file, treating a missing or corrupt file as empty."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable scrape cursor file {self.path}: {str(e)}")
+            return {}
+    
+    def get(self, subreddit: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the committed mark for a subreddit.
+        
+        Args:
+            subreddit (str): Subreddit name (case-insensitive)
+        
+        Returns:
+            dict: {'created_utc': float, 'fullname': str}, or None if never scraped
+        """
+        with self._lock:
+            return self._cursors.get(subreddit.lower())
+    
+    def is_seen(self, subreddit: str, created_utc: float, post_id: str) -> bool:
+        """
+        Check whether a post is at or below the committed mark for its subreddit.
+        
+        Args:
+            subreddit (str): Subreddit name (case-insensitive)
+            created_utc (float): Post creation timestamp
+            post_id (str): Post ID without the 't3_' prefix
+        
+        Returns:
+            bool: True if the post was already ingested by an earlier refresh
+        """
+        mark = self.get(subreddit)
+        if mark is None:
+            return False
+        return _post_order_key(created_utc, post_id) <= _post_order_key(
+            mark['created_utc'], mark['fullname']
+        )
+    
+    def advance(self, subreddit: str, created_utc: float, post_id: str) -> None:
+        """
+        Stage a newer mark for a subreddit; it is persisted by commit().
+        
+        Args:
+            subreddit (str): Subreddit name (case-insensitive)
+            created_utc (float): Post creation timestamp
+            post_id (str): Post ID without the 't3_' prefix
+        """
+        key = subreddit.lower()
+        candidate = {'created_utc': created_utc, 'fullname': f"t3_{post_id}"}
+        with self._lock:
+            current = self._pending.get(key) or self._cursors.get(key)
+            if current is None or _post_order_key(created_utc, post_id) > _post_order_key(
+                current['created_utc'], current['fullname']
+            ):
+                self._pending[key] = candidate
+    
+    def commit(self) -> None:
+        """Persist all staged marks, replacing the cursor file atomically."""
+        with self._lock:
+            if not self._pending:
+                return
+            cursors = {**self._cursors, **self._pending}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so a crash never leaves a truncated file
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.cursors-')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(cursors, f, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self._cursors = cursors
+            logger.info(f"Committed scrape cursors for {', '.join(sorted(self._pending))}")
+            self._pending = {}
+    
+    def discard(self) -> None:
+        """Drop all staged marks without persisting them."""
+        with self._lock:
+            self._pending = {}
+
+
+def _post_order_key(created_utc: float, post_id: str) -> Tuple[float, int]:
+    """
+    Build a sort key that orders posts by creation time, then by ID.
+    
+    Reddit IDs are base-36 counters, so they break ties between posts created
+    in the same second.
+    
+    Args:
+        created_utc (float): Post creation timestamp
+        post_id (str): Post ID, with or without the 't3_' prefix
+    
+    Returns:
+        tuple: (created_utc, numeric ID)
+    """
+    if post_id.startswith('t3_'):
+        post_id = post_id[3:]
+    return (float(created_utc), int(post_id, 36))
+
+
+def scrape_subreddits(
+    subreddits: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    stream: bool = False,
+    cursor_store: Optional[ScrapeCursorStore] = None,
+) -> Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
     """
     Scrape posts from multiple subreddits using PRAW.
     
@@ -110,10 +439,18 @@ def scrape_subreddits(subreddits: Optional[List[str]] = None, limit: Optional[in
             Example: ["SideProject", "learnprogramming"]
         limit (int, optional): Maximum number of posts to retrieve from each subreddit.
             If None, uses MAX_POSTS_PER_SUBREDDIT from config.py.
+        stream (bool, optional): If True, return a generator that yields each raw post
+            as soon as its listing page arrives instead of building the full list.
+            Defaults to False.
+        cursor_store (ScrapeCursorStore, optional): If given, scrape incrementally:
+            each subreddit is only paged until a post at or below its stored mark is
+            reached, and only newer posts are returned. The newest returned post per
+            subreddit is staged in the store; call cursor_store.commit() once the
+            posts have been stored.
     
     Returns:
         list: A list of dictionaries, where each dictionary contains the raw post data
-        with the following keys:
+        with the following keys (a generator of the same dictionaries when stream=True):
             - id (str): Unique Reddit post ID
             - title (str): Post title
             - selftext (str): Post content text
@@ -127,6 +464,8 @@ def scrape_subreddits(subreddits: Optional[List[str]] = None, limit: Optional[in
     Example:
         >>> posts = scrape_subreddits()  # Uses default subreddits from config
         >>> posts = scrape_subreddits(["SideProject", "learnprogramming"], limit=50)
+        >>> for post in process_posts(scrape_subreddits(stream=True), stream=True):
+        ...     embed(post)  # Starts on the first page instead of after the last one
     
     Raises:
         praw.exceptions.PRAWException: If there's an issue with the Reddit API connection
@@ -137,11 +476,288 @@ def scrape_subreddits(subreddits: Optional[List[str]] = None, limit: Optional[in
     Note:
         This function respects Reddit's API rate limits. If you request too many posts
         or make too many requests in a short time, it may take longer to complete.
+        
+        All subreddits are fetched through a single combined listing
+        (r/SideProject+learnprogramming+...) that is paginated with `after` cursors,
+        so one page request covers every subreddit at once. Reddit stops paginating
+        a listing after roughly 1000 items; subreddits still short of `limit` at that
+        point are continued on their own listings from the oldest post collected.
+        
+        Arguments are validated when the function is called, even in streaming mode;
+        API errors in streaming mode are raised while iterating.
+        
+        In incremental mode `limit` still caps each subreddit, so if more than `limit`
+        posts arrived since the last refresh the oldest of them are not fetched.
+        
+        When REDDIT_ASYNC_BACKEND is enabled, non-streaming calls are a thin wrapper
+        around reddit_async_service.scrape_subreddits_async and must not be made from
+        inside a running event loop (await the async function directly instead).
+        While HTTP fixtures are recorded or replayed the sync client is always used,
+        since Async PRAW's transport cannot be recorded.
+    """
+    from ..utils.http_fixtures import fixtures_enabled
+    
+    subreddits, limit = _resolve_scrape_args(subreddits, limit)
+    
+    # Non-streaming scrapes can run on the asyncio backend, which fetches the
+    # per-subreddit top-up listings concurrently; the result is the same list
+    if REDDIT_ASYNC_BACKEND and not stream and not fixtures_enabled():
+        from .reddit_async_service import scrape_subreddits_async
+        return asyncio.run(scrape_subreddits_async(subreddits, limit, cursor_store))
+    
+    posts = _iter_subreddit_posts(subreddits, limit, cursor_store)
+    return posts if stream else list(posts)
+
+
+def _resolve_scrape_args(
+    subreddits: Optional[List[str]], limit: Optional[int]
+) -> Tuple[List[str], int]:
+    """
+    Apply config defaults to scrape arguments and validate them.
+    
+    Args:
+        subreddits (list, optional): Subreddit names, or None for SUBREDDITS
+        limit (int, optional): Posts per subreddit, or None for MAX_POSTS_PER_SUBREDDIT
+    
+    Returns:
+        tuple: Validated subreddit names and limit
+    
+    Raises:
+        ValueError: If a subreddit name or the limit is invalid
+    """
+    subreddits = _validate_subreddits(subreddits if subreddits is not None else SUBREDDITS)
+    limit = limit if limit is not None else MAX_POSTS_PER_SUBREDDIT
+    if limit <= 0:
+        raise ValueError(f"limit must be a positive integer, got {limit}")
+    return subreddits, limit
+
+
+class _ListingCollector:
+    """
+    Tracks per-subreddit progress while listing pages are consumed.
+    
+    The collector decides which submissions from a (multi)subreddit listing are
+    kept: at most `limit` per subreddit and, in incremental mode, only those newer
+    than the subreddit's high-water mark. It is shared by the sync scraper and the
+    asyncio scraper in reddit_async_service so both return the same posts.
+    """
+    
+    def __init__(
+        self, subreddits: List[str], limit: int, cursor_store: Optional[ScrapeCursorStore] = None
+    ):
+        self.subreddits = subreddits
+        self.limit = limit
+        self.cursor_store = cursor_store
+        self.counts = {name.lower(): 0 for name in subreddits}
+        self.caught_up = set()  # Subreddits that reached their high-water mark
+        self.oldest: Dict[str, str] = {}  # Fullname of the oldest kept post per subreddit
+        self.pages = 0
+    
+    def accept(self, submission: Any) -> Optional[Dict[str, Any]]:
+        """
+        Decide whether to keep a submission from a listing page.
+        
+        Args:
+            submission (praw.models.Submission): Submission from a listing page
+        
+        Returns:
+            dict: The raw post dictionary if the submission is kept, otherwise None
+        """
+        # Split the combined listing back out by subreddit, keeping at most
+        # `limit` posts from each one
+        key = submission.subreddit.display_name.lower()
+        if key in self.caught_up or self.counts.get(key, self.limit) >= self.limit:
+            return None
+        # Listings are sorted newest first, so everything after the first
+        # already-seen post of a subreddit was ingested by an earlier refresh
+        if self.cursor_store and self.cursor_store.is_seen(key, submission.created_utc, submission.id):
+            self.caught_up.add(key)
+            return None
+        self.counts[key] += 1
+        self.oldest[key] = submission.name
+        if self.cursor_store:
+            self.cursor_store.advance(key, submission.created_utc, submission.id)
+        return _submission_to_dict(submission)
+    
+    def pending(self) -> List[str]:
+        """Return the subreddits that still want posts (neither full nor caught up)."""
+        return [
+            name for name in self.subreddits
+            if name.lower() not in self.caught_up and self.counts[name.lower()] < self.limit
+        ]
+    
+    def is_pending(self, subreddit: str) -> bool:
+        """Return True if `subreddit` still wants posts."""
+        key = subreddit.lower()
+        return key not in self.caught_up and self.counts[key] < self.limit
+    
+    def log_summary(self) -> None:
+        """Log how many posts were kept per subreddit and how many pages it took."""
+        logger.info(
+            f"Scraped {sum(self.counts.values())} posts in {self.pages} listing requests: "
+            + ", ".join(f"r/{name}={self.counts[name.lower()]}" for name in self.subreddits)
+        )
+
+
+def _iter_subreddit_posts(
+    subreddits: List[str], limit: int, cursor_store: Optional[ScrapeCursorStore] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Walk the combined listing for `subreddits` and yield raw posts page by page.
+    
+    Only the current listing page is held in memory, so callers can start working
+    on the first posts while later pages are still being fetched.
+    
+    Args:
+        subreddits (list): Validated subreddit names
+        limit (int): Maximum number of posts to yield per subreddit
+        cursor_store (ScrapeCursorStore, optional): High-water marks for incremental scraping
+    
+    Yields:
+        dict: Raw post data (see scrape_subreddits for the keys)
+    """
+    reddit = get_reddit_client()
+    collector = _ListingCollector(subreddits, limit, cursor_store)
+    
+    # One combined listing returns posts from every subreddit interleaved by recency,
+    # which replaces one listing walk per subreddit with a single paginated walk
+    multireddit = "+".join(subreddits)
+    logger.info(
+        f"Scraping r/{multireddit} (up to {limit} posts per subreddit"
+        + (", new posts only)" if cursor_store else ")")
+    )
+    exhausted = yield from _walk_listing(reddit, multireddit, None, collector)
+    
+    # Reddit stops paginating a listing after ~1000 items, which can leave quiet
+    # subreddits short in the combined listing. Continue those on their own
+    # listings, starting after the oldest post already collected.
+    if exhausted:
+        for name in collector.pending():
+            yield from _walk_listing(reddit, name, collector.oldest.get(name.lower()), collector)
+    
+    collector.log_summary()
+
+
+def _walk_listing(
+    reddit: praw.Reddit, listing_name: str, after: Optional[str], collector: _ListingCollector
+) -> Generator[Dict[str, Any], None, bool]:
+    """
+    Page through one listing, yielding the posts the collector keeps.
+    
+    Args:
+        reddit (praw.Reddit): Reddit client used for the requests
+        listing_name (str): Subreddit name or '+'-joined subreddit names
+        after (str, optional): Fullname to start after, or None for the newest posts
+        collector (_ListingCollector): Shared progress tracker
+    
+    Yields:
+        dict: Raw post data (see scrape_subreddits for the keys)
+    
+    Returns:
+        bool: True if the listing ran out of pages before every subreddit in it was done
+    """
+    names = listing_name.split('+')
+    while True:
+        try:
+            submissions, after = _fetch_listing_page(reddit, listing_name, after)
+        except (PRAWException, PrawcoreException) as e:
+            logger.error(f"Failed to scrape r/{listing_name} after {collector.pages} pages: {str(e)}")
+            raise
+        collector.pages += 1
+        
+        for submission in submissions:
+            post = collector.accept(submission)
+            if post is not None:
+                yield post
+        
+        # Stop once every subreddit is full or caught up, or the listing is exhausted
+        if not any(collector.is_pending(name) for name in names):
+            return False
+        if after is None:
+            return True
+
+
+def _validate_subreddits(subreddits: List[str]) -> List[str]:
+    """
+    Validate subreddit names and remove duplicates while preserving order.
+    
+    Args:
+        subreddits (list): Subreddit names, with or without the 'r/' prefix.
+    
+    Returns:
+        list: Cleaned subreddit names without the 'r/' prefix.
+    
+    Raises:
+        ValueError: If the list is empty or a name is not a valid subreddit name
+    """
+    cleaned = []
+    seen = set()
+    for name in subreddits:
+        if not isinstance(name, str):
+            raise ValueError(f"Invalid subreddit name: {name!r}")
+        name = name.strip()
+        if name.lower().startswith('r/'):
+            name = name[2:]
+        if not SUBREDDIT_NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid subreddit name: {name!r}")
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            cleaned.append(name)
+    
+    if not cleaned:
+        raise ValueError("At least one subreddit is required")
+    return cleaned
+
+
+def _fetch_listing_page(
+    reddit: praw.Reddit, multireddit: str, after: Optional[str]
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of the newest posts from a (multi)subreddit listing.
+    
+    Args:
+        reddit (praw.Reddit): Reddit client used for the request
+        multireddit (str): Subreddit name or '+'-joined subreddit names
+        after (str, optional): Fullname of the last post on the previous page
+    
+    Returns:
+        tuple: The submissions on this page and the `after` cursor for the next
+        page, which is None when the listing is exhausted
+    """
+    params = {"limit": LISTING_PAGE_SIZE, "raw_json": 1}
+    if after:
+        params["after"] = after
+    listing = reddit.get(f"r/{multireddit}/new", params=params)
+    return list(listing), listing.after
+
+
+def _submission_to_dict(submission: Any) -> Dict[str, Any]:
     """
-    pass
+    Convert a PRAW submission into the raw post dictionary returned by scrape_subreddits.
+    
+    Args:
+        submission (praw.models.Submission): Submission from a listing response
+    
+    Returns:
+        dict: Raw post data (see scrape_subreddits for the keys)
+    """
+    return {
+        "id": submission.id,
+        "title": submission.title,
+        "selftext": submission.selftext,
+        "url": f"https://www.reddit.com{submission.permalink}",
+        # Deleted accounts come back as None
+        "author": submission.author.name if submission.author else "[deleted]",
+        "created_utc": submission.created_utc,
+        "subreddit": submission.subreddit.display_name,
+        "score": submission.score,
+        "num_comments": submission.num_comments,
+    }
 
 
-def process_posts(posts):
+def process_posts(
+    posts: Iterable[Dict[str, Any]], stream: bool = False, min_confidence: Optional[float] = None
+) -> Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
     """
     Process and clean the raw Reddit posts data.
     
@@ -153,11 +769,18 @@ def process_posts(posts):
     5. Filters out irrelevant or low-quality posts
     
     Args:
-        posts (list): A list of dictionaries containing raw post data as returned by
-            the scrape_subreddits function.
+        posts (iterable): Dictionaries containing raw post data as returned by
+            the scrape_subreddits function. Any iterable works, including the
+            generator returned by scrape_subreddits(stream=True).
+        stream (bool, optional): If True, return a generator that cleans and yields
+            posts one at a time as they are pulled from `posts`. Defaults to False.
+        min_confidence (float, optional): Drop posts whose project confidence is
+            below this value (e.g., PROJECT_DROP_CONFIDENCE, to keep non-projects
+            away from paid enrichment). Defaults to None, which keeps every post.
     
     Returns:
-        list: A list of processed post dictionaries with the following structure:
+        list: A list of processed post dictionaries (a generator of them when
+        stream=True) with the following structure:
             - id (str): Unique Reddit post ID
             - title (str): Cleaned post title
             - content (str): Cleaned and combined title and selftext
@@ -168,13 +791,16 @@ def process_posts(posts):
             - score (int): Post score/upvotes
             - comment_count (int): Number of comments
             - is_project (bool): Flag indicating if the post appears to be a project
+            - project_confidence (float): Local classifier's confidence (0-1) that
+              the post describes a project; is_project is True at or above
+              PROJECT_CONFIDENCE_CUTOFF
     
     Example:
         >>> raw_posts = scrape_subreddits(["SideProject"], limit=10)
         >>> processed = process_posts(raw_posts)
         >>> processed[0].keys()
         dict_keys(['id', 'title', 'content', 'url', 'author', 'created_at', 'subreddit', 
-                  'score', 'comment_count', 'is_project'])
+                  'score', 'comment_count', 'is_project', 'project_confidence'])
     
     Raises:
         ValueError: If the input posts list is empty or not in the expected format
@@ -183,11 +809,122 @@ def process_posts(posts):
     Note:
         Posts that are [deleted], [removed], or have empty content after cleaning
         will be filtered out from the results.
+        
+        In streaming mode an empty input simply yields nothing, and format errors
+        are raised when the offending post is reached. Text is cleaned in batches
+        of CLEAN_BATCH_SIZE posts, so a stream yields its first processed post
+        once a batch has been read (or the input ends).
+    """
+    if posts is None or isinstance(posts, (str, bytes, dict)):
+        raise ValueError("posts must be an iterable of raw post dictionaries")
+    
+    if stream:
+        return _iter_processed_posts(posts, min_confidence)
+    
+    posts = list(posts)
+    if not posts:
+        raise ValueError("No posts to process")
+    
+    processed = list(_iter_processed_posts(posts, min_confidence))
+    logger.info(f"Processed {len(processed)} of {len(posts)} posts")
+    return processed
+
+
+def _iter_processed_posts(
+    posts: Iterable[Dict[str, Any]], min_confidence: Optional[float] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily clean raw posts, skipping deleted, removed and empty ones.
+    
+    Args:
+        posts (iterable): Raw post dictionaries
+        min_confidence (float, optional): Also skip posts whose project
+            confidence is below this value
+    
+    Yields:
+        dict: Processed post data (see process_posts for the keys)
+    
+    Raises:
+        TypeError: If a post is not a dictionary with the expected keys
+    """
+    from ..utils.text_cleaning import clean_texts
+    
+    for batch in _iter_batches(posts, CLEAN_BATCH_SIZE):
+        kept = []
+        for post in batch:
+            if not isinstance(post, dict):
+                raise TypeError(f"Expected a post dictionary, got {type(post).__name__}")
+            missing = [key for key in REQUIRED_POST_KEYS if key not in post]
+            if missing:
+                raise TypeError(f"Post {post.get('id', '?')} is missing keys: {', '.join(missing)}")
+            
+            # Skip posts whose body was deleted by the author or removed by moderators
+            selftext = (post['selftext'] or '').strip()
+            if selftext in DELETED_MARKERS or (post['title'] or '').strip() in DELETED_MARKERS:
+                continue
+            kept.append((post, selftext))
+        
+        # Titles and bodies of the whole batch are cleaned in one call
+        cleaned = clean_texts([post['title'] for post, _ in kept] + [selftext for _, selftext in kept])
+        for (post, _), title, body in zip(kept, cleaned, cleaned[len(kept):]):
+            processed = _build_processed_post(post, title, body, min_confidence)
+            if processed is not None:
+                yield processed
+
+
+def _build_processed_post(
+    post: Dict[str, Any], title: str, body: str, min_confidence: Optional[float]
+) -> Optional[Dict[str, Any]]:
+    """
+    Assemble the processed form of a raw post from its cleaned title and body.
+    
+    Args:
+        post (dict): Raw post dictionary
+        title (str): Cleaned title
+        body (str): Cleaned selftext
+        min_confidence (float): Minimum project confidence, or None
+    
+    Returns:
+        dict: Processed post data, or None if the post is empty or below `min_confidence`
     """
-    pass
+    from .project_classifier import project_confidence
+    
+    content = f"{title}\n\n{body}" if body else title
+    if not content:
+        return None
+    
+    confidence = project_confidence(title, content)
+    if min_confidence is not None and confidence < min_confidence:
+        return None
+    
+    return {
+        'id': post['id'],
+        'title': title,
+        'content': content,
+        'url': post['url'],
+        'author': post['author'],
+        'created_at': datetime.datetime.fromtimestamp(
+            post['created_utc'], tz=datetime.timezone.utc
+        ).isoformat(),
+        'subreddit': post['subreddit'],
+        'score': post['score'],
+        'comment_count': post['num_comments'],
+        'is_project': confidence >= PROJECT_CONFIDENCE_CUTOFF,
+        'project_confidence': round(confidence, 4),
+    }
+
 
+def _iter_batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most `size` items, reading it lazily."""
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
 
-def schedule_refresh():
+
+def schedule_refresh(scheduler: Optional['BackgroundScheduler'] = None) -> Dict[str, str]:
     """
     Schedule a regular job to refresh the Reddit data.
     
@@ -195,14 +932,33 @@ def schedule_refresh():
     from the configured subreddits and update the database. It ensures that the
     project database stays current with fresh project ideas from Reddit.
     
-    The refresh interval is configured through REFRESH_INTERVAL_HOURS in config.py,
-    which defaults to 48 hours (every other day).
+    Every subreddit is refreshed on its own interval, derived from how fast it
+    gets new posts (see refresh_scheduler): busy subreddits as often as every
+    MIN_REFRESH_INTERVAL_HOURS, quiet ones as rarely as every REFRESH_INTERVAL_HOURS
+    (48 hours by default). The job wakes up every REFRESH_TICK_MINUTES and
+    refreshes the subreddits that are due with one refresh_posts() call, which
+    scrapes incrementally from the persisted scrape cursors, so only posts
+    published since the previous run are fetched and processed.
+    
+    A second job runs sweep_deleted_posts() every REFRESH_INTERVAL_HOURS to drop
+    posts that were deleted or removed after they were stored.
+    
+    Several processes may schedule the same jobs (e.g., multiple Gunicorn workers
+    or replicas). Each run first takes a lease lock in SCHEDULER_LOCK_FILE, so a
+    job runs in only one process at a time; a run that finds the job still going
+    elsewhere (or in an earlier run of its own process) is skipped rather than
+    queued. Job starts are delayed by up to SCHEDULER_JITTER_SECONDS so replicas
+    started together do not all wake up at the same instant.
+    
+    Args:
+        scheduler (BackgroundScheduler, optional): Scheduler to add the job to.
+            If None, a module-level background scheduler is created and started.
     
     Returns:
         dict: Information about the scheduled job, including:
             - job_id (str): Unique identifier for the scheduled job
             - next_run (str): ISO format datetime of when the job will next run
-            - interval (str): Description of the refresh interval
+            - interval (str): Description of the refresh schedule
     
     Example:
         >>> job_info = schedule_refresh()
@@ -220,4 +976,382 @@ def schedule_refresh():
         The actual implementation may use different scheduling mechanisms depending
         on the deployment environment (e.g., cron jobs, Celery tasks, etc.).
     """
-    pass
+    global _scheduler
+    from apscheduler.schedulers.background import BackgroundScheduler
+    
+    if not isinstance(REFRESH_INTERVAL_HOURS, (int, float)) or REFRESH_INTERVAL_HOURS <= 0:
+        raise ConfigError(
+            f"REFRESH_INTERVAL_HOURS must be a positive number, got {REFRESH_INTERVAL_HOURS!r}"
+        )
+    
+    if not 0 < MIN_REFRESH_INTERVAL_HOURS <= REFRESH_INTERVAL_HOURS:
+        raise ConfigError(
+            f"MIN_REFRESH_INTERVAL_HOURS must be between 0 and REFRESH_INTERVAL_HOURS, "
+            f"got {MIN_REFRESH_INTERVAL_HOURS!r}"
+        )
+    
+    try:
+        if scheduler is None:
+            if _scheduler is None:
+                _scheduler = BackgroundScheduler(timezone=datetime.timezone.utc)
+            scheduler = _scheduler
+        
+        now = datetime.datetime.now(datetime.timezone.utc)
+        
+        # Check right away (after the start jitter), then every REFRESH_TICK_MINUTES.
+        # A run that is still going when the next one is due is not started twice,
+        # and missed runs (e.g., while the process was suspended) collapse into one.
+        job = scheduler.add_job(
+            _run_exclusive,
+            args=(REFRESH_JOB_ID, _refresh_due_subreddits),
+            trigger='interval',
+            minutes=REFRESH_TICK_MINUTES,
+            jitter=SCHEDULER_JITTER_SECONDS,
+            id=REFRESH_JOB_ID,
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            next_run_time=now + _start_jitter(),
+        )
+        # Sweep deleted posts on the same cadence, offset by half an interval so the
+        # sweep and the refresh don't compete for the Reddit rate limit
+        scheduler.add_job(
+            _run_exclusive,
+            args=(SWEEP_JOB_ID, sweep_deleted_posts),
+            trigger='interval',
+            hours=REFRESH_INTERVAL_HOURS,
+            jitter=SCHEDULER_JITTER_SECONDS,
+            id=SWEEP_JOB_ID,
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            next_run_time=now + datetime.timedelta(hours=REFRESH_INTERVAL_HOURS / 2) + _start_jitter(),
+        )
+        if not scheduler.running:
+            scheduler.start()
+    except Exception as e:
+        logger.error(f"Failed to schedule Reddit refresh: {str(e)}")
+        raise SchedulerError(f"Failed to schedule Reddit refresh: {str(e)}") from e
+    
+    interval = (
+        f"per subreddit, every {MIN_REFRESH_INTERVAL_HOURS} to {REFRESH_INTERVAL_HOURS} hours "
+        f"depending on posting rate (checked every {REFRESH_TICK_MINUTES} minutes)"
+    )
+    logger.info(f"Scheduled Reddit refresh {interval}")
+    return {
+        'job_id': job.id,
+        'next_run': job.next_run_time.isoformat(),
+        'interval': interval,
+    }
+
+
+def _run_exclusive(lock_name: str, job: Callable[[], Any]) -> Optional[Any]:
+    """
+    Run a scheduled job unless another process is already running it.
+    
+    Args:
+        lock_name (str): Name of the lease lock guarding the job
+        job (callable): The job to run
+    
+    Returns:
+        The job's result, or None if the run was skipped
+    """
+    lock = LeaseLock(lock_name, SCHEDULER_LOCK_FILE, ttl=SCHEDULER_LEASE_SECONDS)
+    with lock.hold() as acquired:
+        if not acquired:
+            logger.info(f"Skipping {lock_name}: still running in {lock.holder() or 'another process'}")
+            return None
+        return job()
+
+
+def _start_jitter() -> datetime.timedelta:
+    """Return a random delay for a job's first run, up to SCHEDULER_JITTER_SECONDS."""
+    return datetime.timedelta(seconds=random.uniform(0, SCHEDULER_JITTER_SECONDS))
+
+
+def _refresh_due_subreddits() -> Dict[str, Any]:
+    """Scheduler job: refresh the subreddits whose adaptive interval has elapsed."""
+    # Imported here because refresh_scheduler itself imports this module
+    from .refresh_scheduler import refresh_due_subreddits
+    return refresh_due_subreddits()
+
+
+def refresh_posts(
+    subreddits: Optional[List[str]] = None,
+    cursor_store: Optional[ScrapeCursorStore] = None,
+) -> Dict[str, Any]:
+    """
+    Run one incremental refresh: fetch new posts, enrich, embed and store them.
+    
+    Posts are scraped against the persisted scrape cursors, so only submissions
+    newer than the previous refresh are downloaded. Scraping, processing,
+    de-duplication, metadata extraction, embedding and upserting run concurrently
+    as a pipeline with bounded queues between the stages (see refresh_pipeline).
+    The cursors are committed only after every stage has finished, and each
+    post's progress is kept in the job journal, so the run after a failed one
+    resumes the unfinished posts instead of paying for their API calls again.
+    
+    Args:
+        subreddits (list, optional): Subreddits to refresh.
+            If None, uses the SUBREDDITS list from config.py.
+        cursor_store (ScrapeCursorStore, optional): Cursor store to scrape against.
+            If None, the store at SCRAPE_CURSOR_FILE is used.
+    
+    Returns:
+        dict: Summary of the run, including:
+            - scraped (int): Number of new raw posts fetched
+            - resumed (int): Number of unfinished posts picked up from earlier runs
+            - processed (int): Number of distinct posts that survived processing
+            - stored (int): Number of vectors upserted
+            - stages (dict): Per-stage item counts and busy time
+            - subreddit_activity (dict): New posts per subreddit, used for
+              adaptive scheduling
+            - finished_at (str): ISO format datetime when the refresh finished
+    
+    Example:
+        >>> summary = refresh_posts()
+        >>> print(f"{summary['stored']} new posts stored")
+    """
+    # Imported here because the pipeline itself imports this module
+    from .refresh_pipeline import run_refresh_pipeline
+    
+    summary = run_refresh_pipeline(subreddits, cursor_store=cursor_store)
+    logger.info(
+        f"Refresh finished: {summary['scraped']} new posts scraped, "
+        f"{summary['processed']} processed, {summary['stored']} stored"
+    )
+    return summary
+
+
+def fetch_comment_digests(post_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    Fetch a digest of the top comments of each post.
+    
+    Top comments often contain the real problem statement or a feature wish-list,
+    which makes them worth embedding and showing to the plan generator alongside
+    the post. Posts are fetched concurrently on the asyncio backend (see
+    reddit_async_service.fetch_comment_digests_async), at most 1 +
+    COMMENT_REPLACE_MORE_LIMIT requests per post, under the shared rate limiter.
+    All calls share one long-lived event loop and Async PRAW client (see
+    reddit_async_service.CommentDigestFetcher), so consecutive batches reuse
+    one OAuth token instead of requesting a new one each.
+    
+    Args:
+        post_ids (iterable): Post IDs (without 't3_')
+    
+    Returns:
+        dict: Post ID to digest ('' if the post has no usable comments, None if
+        its comments could not be fetched)
+    
+    Example:
+        >>> digests = fetch_comment_digests(post['id'] for post in processed_posts)
+    
+    Note:
+        Blocks until the batch is done; from async code, await
+        fetch_comment_digests_async instead.
+        
+        While HTTP fixtures are recorded or replayed, posts are fetched one at a
+        time with the sync client, since Async PRAW's transport cannot be recorded.
+    """
+    from ..utils.http_fixtures import fixtures_enabled
+    
+    if fixtures_enabled():
+        return {post_id: _fetch_comment_digest(post_id) for post_id in post_ids}
+    
+    from .reddit_async_service import get_comment_digest_fetcher
+    return get_comment_digest_fetcher().fetch(list(post_ids))
+
+
+def _fetch_comment_digest(post_id: str) -> Optional[str]:
+    """
+    Fetch one post's top comments with the sync client and build its digest.
+    
+    Returns:
+        str: Digest ('' if there are no usable comments), or None if the fetch failed
+    """
+    # Imported here because reddit_async_service itself imports this module
+    from .reddit_async_service import build_comment_digest
+    try:
+        submission = get_reddit_client().submission(id=post_id)
+        # Sort and limit must be set before the comments are fetched
+        submission.comment_sort = 'top'
+        submission.comment_limit = COMMENT_TOP_N
+        submission.comments.replace_more(limit=COMMENT_REPLACE_MORE_LIMIT)
+        comments = list(submission.comments)
+    except (PRAWException, PrawcoreException) as e:
+        logger.warning(f"Failed to fetch comments for post {post_id}: {str(e)}")
+        return None
+    return build_comment_digest(comments, COMMENT_TOP_N, COMMENT_DIGEST_MAX_CHARS)
+
+
+def refresh_engagement(post_ids: Iterable[str]) -> Dict[str, int]:
+    """
+    Refresh the score and comment count of stored posts from Reddit.
+    
+    Engagement numbers go stale between scrapes. Instead of re-scraping listings,
+    this looks the stored posts up directly by fullname, 100 per /api/info request,
+    and writes back only the engagement fields that actually changed, so refreshing
+    10,000 posts costs about 100 Reddit requests.
+    
+    Posts that absorbed near-duplicates (see dedup_service) store the summed
+    engagement of their group, so their collapsed duplicate_ids are looked up too
+    and the sums are recomputed.
+    
+    Args:
+        post_ids (iterable): IDs of posts stored in the vector index (without 't3_')
+    
+    Returns:
+        dict: Counts for the run:
+            - checked (int): Posts looked up on Reddit
+            - updated (int): Posts whose stored metadata was changed
+            - missing (int): Posts Reddit no longer returns
+    
+    Example:
+        >>> stats = refresh_engagement(["1abcde", "1abcdf"])
+        >>> print(f"Updated {stats['updated']} of {stats['checked']} posts")
+    
+    Raises:
+        praw.exceptions.PRAWException: If there's an issue with the Reddit API
+        PineconeError: If reading or updating the index fails
+    """
+    from .pinecone_service import fetch_metadata, update_metadata
+    
+    stats = {'checked': 0, 'updated': 0, 'missing': 0}
+    
+    for batch, submissions in _iter_info_batches(post_ids):
+        stats['checked'] += len(batch)
+        stats['missing'] += len(batch) - len(submissions)
+        stored = fetch_metadata(batch)
+        duplicates = {}
+        for _, found in _iter_info_batches(
+            duplicate_id for metadata in stored.values() for duplicate_id in metadata.get('duplicate_ids', [])
+        ):
+            duplicates.update(found)
+        
+        for post_id, submission in submissions.items():
+            metadata = stored.get(post_id)
+            if metadata is None:
+                continue
+            # Duplicates Reddit no longer returns stop contributing to the sums
+            group = [submission] + [
+                duplicates[duplicate_id] for duplicate_id in metadata.get('duplicate_ids', [])
+                if duplicate_id in duplicates
+            ]
+            changes = {}
+            for attribute, field in ENGAGEMENT_FIELDS.items():
+                value = sum(getattr(member, attribute) for member in group)
+                if metadata.get(field) != value:
+                    changes[field] = value
+            if changes:
+                update_metadata(post_id, changes)
+                stats['updated'] += 1
+    
+    logger.info(
+        f"Engagement refresh: {stats['updated']} of {stats['checked']} posts changed, "
+        f"{stats['missing']} no longer on Reddit"
+    )
+    return stats
+
+
+def sweep_deleted_posts(post_ids: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Remove posts from the vector index that were deleted or removed on Reddit.
+    
+    process_posts drops [deleted] and [removed] posts at ingest time, but posts that
+    disappear later would otherwise stay in the index and keep being recommended.
+    The sweeper looks stored posts up 100 fullnames per /api/info request and
+    deletes the dead ones from the index in bulk.
+    
+    A post counts as dead only on explicit evidence: its title or body was
+    replaced by [deleted]/[removed], or Reddit reports it as removed. Posts that
+    /api/info does not return at all are counted as missing but kept, since a
+    subreddit going private, quarantined or banned (or a short response) hides
+    live posts too; deleting a canonical post would also discard the
+    duplicate_ids it absorbed.
+    
+    Args:
+        post_ids (iterable, optional): IDs of posts to check (without 't3_').
+            If None, every post stored in the index is checked.
+    
+    Returns:
+        dict: Counts for the run:
+            - checked (int): Posts looked up on Reddit
+            - deleted (int): Posts removed from the index
+            - missing (int): Posts Reddit did not return, which were kept
+    
+    Example:
+        >>> stats = sweep_deleted_posts()
+        >>> print(f"Removed {stats['deleted']} dead posts")
+    
+    Raises:
+        praw.exceptions.PRAWException: If there's an issue with the Reddit API
+        PineconeError: If listing or deleting vectors fails
+    """
+    from .pinecone_service import delete_embeddings, list_post_ids
+    
+    if post_ids is None:
+        post_ids = list_post_ids()
+    
+    checked = 0
+    missing = 0
+    dead = []
+    for batch, submissions in _iter_info_batches(post_ids):
+        checked += len(batch)
+        missing += len(batch) - len(submissions)
+        dead.extend(
+            post_id for post_id, submission in submissions.items() if _is_deleted_submission(submission)
+        )
+    
+    delete_embeddings(dead)
+    logger.info(
+        f"Deleted-post sweep: removed {len(dead)} of {checked} stored posts, "
+        f"kept {missing} that Reddit did not return"
+    )
+    return {'checked': checked, 'deleted': len(dead), 'missing': missing}
+
+
+def _is_deleted_submission(submission: Any) -> bool:
+    """
+    Check whether a submission was deleted by its author or removed by moderators.
+    
+    Args:
+        submission (praw.models.Submission): Submission returned by /api/info
+    
+    Returns:
+        bool: True if the post should no longer be recommended
+    """
+    if (submission.selftext or '').strip() in DELETED_MARKERS:
+        return True
+    if (submission.title or '').strip() in DELETED_MARKERS:
+        return True
+    # Read from the fetched data directly; unknown attributes would trigger a lazy refetch
+    return vars(submission).get('removed_by_category') is not None
+
+
+def _iter_info_batches(post_ids: Iterable[str]) -> Iterator[Tuple[List[str], Dict[str, Any]]]:
+    """
+    Look posts up on Reddit by fullname, INFO_BATCH_SIZE IDs per request.
+    
+    Args:
+        post_ids (iterable): Post IDs, with or without the 't3_' prefix
+    
+    Yields:
+        tuple: The batch of post IDs (without prefix) and a mapping of post ID to
+        submission for the posts Reddit returned
+    """
+    reddit = get_reddit_client()
+    ids = list(dict.fromkeys(
+        post_id[3:] if post_id.startswith('t3_') else post_id for post_id in post_ids
+    ))
+    
+    for start in range(0, len(ids), INFO_BATCH_SIZE):
+        batch = ids[start:start + INFO_BATCH_SIZE]
+        try:
+            submissions = {
+                submission.id: submission
+                for submission in reddit.info(fullnames=[f"t3_{post_id}" for post_id in batch])
+            }
+        except (PRAWException, PrawcoreException) as e:
+            logger.error(f"Failed to look up {len(batch)} posts on Reddit: {str(e)}")
+            raise
+        yield batch, submissions
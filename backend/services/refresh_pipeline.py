@@ -0,0 +1,647 @@
+"""
+Refresh Pipeline for Vibe Coding Project Finder
+
+This module runs a data refresh as a pipeline instead of stage by stage. Scraping,
+cleaning, de-duplication, metadata extraction, embedding and upserting all run at the
+same time in worker threads, connected by bounded queues:
+
+    scrape -> process -> deduplicate -> [comments] -> enrich -> embed -> upsert
+
+While the scraper waits on Reddit for the next listing page, earlier posts are already
+being labelled by OpenAI, embedded and stored, so the refresh takes about as long as its
+slowest stage rather than the sum of all stages. Because the queues are bounded, a slow
+stage makes the stages before it wait (backpressure) instead of letting work pile up in
+memory.
+
+Each post's progress is recorded in the job journal (see job_journal), so a refresh that
+fails halfway is resumed by the next one instead of paying for every API call again.
+
+Usage:
+    from services.refresh_pipeline import run_refresh_pipeline
+
+    # One incremental refresh of all configured subreddits
+    summary = run_refresh_pipeline()
+
+    # Re-index everything in the raw post archive, e.g. after changing the embedding model
+    summary = replay_archive()
+
+    # Or build a custom pipeline
+    pipeline = Pipeline()
+    pipeline.add_stage('double', lambda batch: [x * 2 for x in batch], workers=4, batch_size=10)
+    pipeline.run(range(100))
+"""
+
+import argparse  # For the archive replay command line
+import datetime  # For timestamping refresh summaries
+import json  # For printing replay summaries
+import logging  # For logging pipeline progress and failures
+import queue  # For the bounded queues between stages
+import threading  # For stage worker threads
+import time  # For measuring how long each stage is busy
+from typing import List, Dict, Any, Optional, Iterable, Callable  # Type hints for better code documentation
+
+# Import configuration from config file
+from ..config import (
+    PIPELINE_QUEUE_SIZE,  # Items buffered between two stages
+    PIPELINE_BATCH_LINGER_SECONDS,  # How long a stage waits to fill a batch
+    PIPELINE_ENRICH_WORKERS,  # Concurrent OpenAI metadata requests
+    PIPELINE_EMBED_WORKERS,  # Concurrent embedding requests
+    PIPELINE_UPSERT_WORKERS,  # Concurrent Pinecone upserts
+    OPENAI_METADATA_BATCH_SIZE,  # Posts per metadata request
+    EMBEDDING_BATCH_SIZE,  # Texts per embedding request
+    PROJECT_DROP_CONFIDENCE,  # Posts below this project confidence are dropped
+    COMMENT_ENRICHMENT_ENABLED,  # Whether posts get a digest of their top comments
+)
+from .dedup_service import NearDuplicateIndex, SignatureStore, collapse_near_duplicates  # Cross-post detection
+from .embedding_service import batch_process_embeddings  # Post embeddings
+from .job_journal import JobJournal, stage_reached  # Per-post progress for resuming failed runs
+from .openai_service import extract_metadata  # Project metadata
+from .post_archive import PostArchive  # Raw posts for offline re-indexing
+from .pinecone_service import store_embeddings, UPSERT_BATCH_SIZE  # Vector storage
+from .reddit_service import (  # Reddit ingestion
+    ScrapeCursorStore,
+    scrape_subreddits,
+    process_posts,
+    fetch_comment_digests,
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Posts handed to the processing and de-duplication stages at a time
+PROCESS_BATCH_SIZE = 100
+
+# New raw posts looked up in the journal, journaled and archived at a time
+# (about one listing page)
+SCRAPE_BATCH_SIZE = 100
+
+# Posts whose comments are fetched together (concurrently) by the comments stage
+COMMENT_BATCH_SIZE = 25
+
+# Seconds between checks for an aborted pipeline while blocked on a queue
+_POLL_SECONDS = 0.1
+
+# Marks the end of a stage's input
+_END = object()
+
+
+class PipelineAborted(Exception):
+    """Raised inside workers when another stage has failed."""
+
+
+class _Stage:
+    """A named step of a pipeline with its own worker threads and input queue."""
+
+    def __init__(self, name: str, func: Callable[[List[Any]], Iterable[Any]], workers: int, batch_size: int):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.batch_size = batch_size
+        self.input: Optional[queue.Queue] = None
+        self.items_in = 0
+        self.items_out = 0
+        self.busy_seconds = 0.0
+        self.finished_workers = 0
+        self.lock = threading.Lock()
+
+
+class Pipeline:
+    """
+    Runs a series of batch-processing stages concurrently with bounded queues.
+
+    Every stage is a function that takes a list of items and returns the items to
+    pass on (it may drop, transform or expand them). Each stage gets `workers`
+    threads; a worker takes up to `batch_size` items from its input queue (waiting
+    up to PIPELINE_BATCH_LINGER_SECONDS for a batch to fill) and puts the results
+    on the next stage's queue. Queues hold at most `queue_size` items, so a slow
+    stage blocks the stages feeding it.
+
+    If any stage raises, the whole pipeline stops and run() re-raises the error.
+
+    Example:
+        >>> pipeline = Pipeline()
+        >>> pipeline.add_stage('square', lambda batch: [x * x for x in batch], workers=2)
+        >>> pipeline.run(range(10))['stages']['square']['out']
+        10
+    """
+
+    def __init__(self, queue_size: int = PIPELINE_QUEUE_SIZE, linger: float = PIPELINE_BATCH_LINGER_SECONDS):
+        """
+        Args:
+            queue_size (int, optional): Maximum items buffered in front of each stage.
+                Defaults to PIPELINE_QUEUE_SIZE.
+            linger (float, optional): Seconds a worker waits for a batch to fill.
+                Defaults to PIPELINE_BATCH_LINGER_SECONDS.
+        """
+        self.queue_size = queue_size
+        self.linger = linger
+        self._stages: List[_Stage] = []
+        self._abort = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._error_lock = threading.Lock()
+
+    def add_stage(
+        self,
+        name: str,
+        func: Callable[[List[Any]], Iterable[Any]],
+        workers: int = 1,
+        batch_size: int = 1,
+    ) -> 'Pipeline':
+        """
+        Append a stage to the pipeline.
+
+        Args:
+            name (str): Stage name used in logs and statistics
+            func (callable): Takes a list of items and returns the items to pass on
+            workers (int, optional): Number of threads running this stage. Defaults to 1.
+            batch_size (int, optional): Maximum items per call of `func`. Defaults to 1.
+
+        Returns:
+            Pipeline: self, so calls can be chained
+        """
+        if workers < 1 or batch_size < 1:
+            raise ValueError(f"Stage {name} needs at least one worker and a positive batch size")
+        self._stages.append(_Stage(name, func, workers, batch_size))
+        return self
+
+    def run(self, source: Iterable[Any]) -> Dict[str, Any]:
+        """
+        Feed `source` through all stages and wait until everything is processed.
+
+        The source is consumed in the calling thread, so a generator that makes
+        network requests (like scrape_subreddits(stream=True)) runs concurrently
+        with the stages.
+
+        Args:
+            source (iterable): Items for the first stage
+
+        Returns:
+            dict: Run statistics:
+                - source (int): Items read from the source
+                - seconds (float): Wall-clock duration
+                - stages (dict): Per stage 'in', 'out' and 'busy_seconds'
+
+        Raises:
+            Exception: The first error raised by the source or any stage
+        """
+        if not self._stages:
+            raise ValueError("Pipeline has no stages")
+
+        started = time.monotonic()
+        for stage in self._stages:
+            stage.input = queue.Queue(maxsize=self.queue_size)
+
+        threads = []
+        for position, stage in enumerate(self._stages):
+            next_stage = self._stages[position + 1] if position + 1 < len(self._stages) else None
+            for worker in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(stage, next_stage),
+                    name=f"pipeline-{stage.name}-{worker}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        first = self._stages[0]
+        produced = 0
+        try:
+            for item in source:
+                self._put(first.input, item)
+                produced += 1
+        except PipelineAborted:
+            pass
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            for _ in range(first.workers):
+                self._put_end(first.input)
+
+        for thread in threads:
+            thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+        stats = {
+            'source': produced,
+            'seconds': round(time.monotonic() - started, 3),
+            'stages': {
+                stage.name: {
+                    'in': stage.items_in,
+                    'out': stage.items_out,
+                    'busy_seconds': round(stage.busy_seconds, 3),
+                }
+                for stage in self._stages
+            },
+        }
+        logger.info(
+            f"Pipeline finished in {stats['seconds']}s: "
+            + ", ".join(f"{name} {s['in']}->{s['out']}" for name, s in stats['stages'].items())
+        )
+        return stats
+
+    def _worker(self, stage: _Stage, next_stage: Optional[_Stage]) -> None:
+        """Process batches for one stage until its input ends or the pipeline aborts."""
+        try:
+            while True:
+                batch, ended = self._take_batch(stage)
+                if batch:
+                    started = time.monotonic()
+                    results = list(stage.func(batch))
+                    with stage.lock:
+                        stage.busy_seconds += time.monotonic() - started
+                        stage.items_in += len(batch)
+                        stage.items_out += len(results)
+                    if next_stage is not None:
+                        for item in results:
+                            self._put(next_stage.input, item)
+                if ended:
+                    break
+        except PipelineAborted:
+            pass
+        except BaseException as e:
+            logger.error(f"Pipeline stage {stage.name} failed: {str(e)}")
+            self._fail(e)
+        finally:
+            # The last worker of a stage to finish ends the next stage's input
+            with stage.lock:
+                stage.finished_workers += 1
+                last = stage.finished_workers == stage.workers
+            if last and next_stage is not None:
+                for _ in range(next_stage.workers):
+                    self._put_end(next_stage.input)
+
+    def _take_batch(self, stage: _Stage):
+        """
+        Take up to stage.batch_size items from the stage's input.
+
+        Returns:
+            tuple: The batch and whether the input has ended
+        """
+        batch = []
+        # Block for the first item, then linger briefly for the batch to fill
+        item = self._get(stage.input, None)
+        if item is _END:
+            return batch, True
+        batch.append(item)
+        deadline = time.monotonic() + self.linger
+        while len(batch) < stage.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._get(stage.input, remaining)
+            except queue.Empty:
+                break
+            if item is _END:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _get(self, source: queue.Queue, timeout: Optional[float]) -> Any:
+        """Get from a queue, waking up regularly to check for an abort."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._abort.is_set():
+                raise PipelineAborted()
+            wait = _POLL_SECONDS if deadline is None else min(_POLL_SECONDS, deadline - time.monotonic())
+            if wait <= 0:
+                raise queue.Empty()
+            try:
+                return source.get(timeout=wait)
+            except queue.Empty:
+                continue
+
+    def _put(self, target: queue.Queue, item: Any) -> None:
+        """Put on a queue, blocking while it is full but giving up if the pipeline aborts."""
+        while True:
+            if self._abort.is_set():
+                raise PipelineAborted()
+            try:
+                target.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def _put_end(self, target: queue.Queue) -> None:
+        """Signal the end of input, unless the pipeline is shutting down after an error."""
+        try:
+            self._put(target, _END)
+        except PipelineAborted:
+            pass
+
+    def _fail(self, error: BaseException) -> None:
+        """Record the first error and tell every worker to stop."""
+        with self._error_lock:
+            if self._error is None:
+                self._error = error
+        self._abort.set()
+
+
+def run_refresh_pipeline(
+    subreddits: Optional[List[str]] = None,
+    cursor_store: Optional[ScrapeCursorStore] = None,
+    journal: Optional[JobJournal] = None,
+    archive: Optional[PostArchive] = None,
+    signatures: Optional[SignatureStore] = None,
+) -> Dict[str, Any]:
+    """
+    Run one incremental refresh through the full ingestion pipeline.
+
+    New posts are scraped against the persisted scrape cursors, cleaned,
+    de-duplicated, labelled with OpenAI metadata, embedded and upserted into
+    Pinecone, with all stages running concurrently. The scrape cursors are only
+    committed after every stage has drained successfully. Every new raw post is
+    also appended to the post archive, so the index can later be rebuilt with
+    replay_archive() without scraping again.
+
+    Every post's progress is recorded in the job journal. Posts an earlier run
+    left unfinished are fed back in first and continue after the last stage they
+    completed; re-scraped posts that are already in the journal are ignored. A
+    failed run therefore only repeats its in-flight batches.
+
+    De-duplication within a processing batch merges the engagement of the
+    duplicates into the canonical post; a repeat of a post from an earlier batch
+    of the same run, or of a post indexed by an earlier run within
+    DEDUP_SIGNATURE_RETENTION_DAYS, is dropped.
+
+    Args:
+        subreddits (list, optional): Subreddits to refresh.
+            If None, uses the SUBREDDITS list from config.py.
+        cursor_store (ScrapeCursorStore, optional): Cursor store to scrape against.
+            If None, the store at SCRAPE_CURSOR_FILE is used.
+        journal (JobJournal, optional): Journal to record progress in.
+            If None, the journal at JOB_JOURNAL_FILE is used.
+        archive (PostArchive, optional): Archive for the raw posts.
+            If None, the archive in POST_ARCHIVE_DIR is used.
+        signatures (SignatureStore, optional): Near-duplicate signatures of earlier runs.
+            If None, the store at DEDUP_SIGNATURE_FILE is used.
+
+    Returns:
+        dict: Summary of the run, including:
+            - scraped (int): Number of new raw posts fetched
+            - resumed (int): Number of unfinished posts picked up from earlier runs
+            - processed (int): Number of distinct posts that survived processing
+            - stored (int): Number of vectors upserted
+            - stages (dict): Per-stage statistics (see Pipeline.run)
+            - subreddit_activity (dict): Per lowercase subreddit name, the number of
+              new posts ('new') and the creation timestamps of the oldest and newest
+              of them ('oldest', 'newest'); subreddits without new posts are absent
+            - finished_at (str): ISO format datetime when the refresh finished
+
+    Example:
+        >>> summary = run_refresh_pipeline()
+        >>> print(f"Stored {summary['stored']} new projects")
+    """
+    cursor_store = cursor_store or ScrapeCursorStore()
+    archive = archive or PostArchive()
+    owns_journal = journal is None
+    journal = journal or JobJournal()
+    owns_signatures = signatures is None
+    signatures = signatures or SignatureStore()
+    duplicates = NearDuplicateIndex()
+    counts = {'scraped': 0, 'resumed': 0}
+    activity: Dict[str, Dict[str, Any]] = {}
+
+    def source():
+        for stage, post in journal.unfinished():
+            # Later repeats of an already de-duplicated post are still dropped
+            if stage_reached(stage, 'processed'):
+                duplicates.add(post['id'], post['content'])
+            counts['resumed'] += 1
+            yield post
+        batch = []
+        for post in scrape_subreddits(subreddits, stream=True, cursor_store=cursor_store):
+            _track_activity(activity, post)
+            batch.append(post)
+            if len(batch) >= SCRAPE_BATCH_SIZE:
+                yield from admit(batch)
+                batch = []
+        yield from admit(batch)
+
+    def admit(batch):
+        # One journal lookup per batch; posts already in the journal are ignored
+        known = journal.stages(post['id'] for post in batch)
+        new = []
+        for post in batch:
+            if post['id'] not in known:
+                known[post['id']] = 'scraped'
+                new.append(post)
+        if not new:
+            return
+        archive.append(new)
+        journal.record('scraped', new)
+        counts['scraped'] += len(new)
+        yield from new
+
+    try:
+        journal.prune()
+        signatures.prune()
+        signatures.seed(duplicates)
+        stats = _build_pipeline(duplicates, journal, signatures).run(source())
+    except Exception:
+        cursor_store.discard()
+        raise
+    finally:
+        if owns_journal:
+            journal.close()
+        if owns_signatures:
+            signatures.close()
+    cursor_store.commit()
+
+    return {
+        'scraped': counts['scraped'],
+        'resumed': counts['resumed'],
+        'processed': stats['stages']['deduplicate']['out'],
+        'stored': stats['stages']['upsert']['out'],
+        'stages': stats['stages'],
+        'subreddit_activity': activity,
+        'finished_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+
+
+def _track_activity(activity: Dict[str, Dict[str, Any]], post: Dict[str, Any]) -> None:
+    """Count a newly scraped post towards its subreddit's posting activity."""
+    entry = activity.setdefault(post['subreddit'].lower(), {'new': 0, 'oldest': None, 'newest': None})
+    entry['new'] += 1
+    created = post['created_utc']
+    entry['oldest'] = created if entry['oldest'] is None else min(entry['oldest'], created)
+    entry['newest'] = created if entry['newest'] is None else max(entry['newest'], created)
+
+
+def replay_archive(
+    since: Optional[datetime.date] = None,
+    until: Optional[datetime.date] = None,
+    subreddits: Optional[List[str]] = None,
+    archive: Optional[PostArchive] = None,
+) -> Dict[str, Any]:
+    """
+    Re-index archived raw posts without contacting Reddit.
+
+    Streams the post archive through processing, de-duplication, metadata
+    extraction, embedding and upsert, overwriting the stored vectors of posts
+    that are already indexed. Use it after changing the cleaning rules, the
+    embedding model or the metadata prompt. Neither the scrape cursors, the
+    job journal nor the near-duplicate signatures are touched.
+
+    Args:
+        since (date, optional): Only posts created on or after this UTC date
+        until (date, optional): Only posts created on or before this UTC date
+        subreddits (list, optional): Only posts from these subreddits
+        archive (PostArchive, optional): Archive to read. If None, the archive in
+            POST_ARCHIVE_DIR is used.
+
+    Returns:
+        dict: Summary of the replay, including:
+            - replayed (int): Number of archived raw posts read
+            - processed (int): Number of distinct posts that survived processing
+            - stored (int): Number of vectors upserted
+            - stages (dict): Per-stage statistics (see Pipeline.run)
+            - finished_at (str): ISO format datetime when the replay finished
+
+    Example:
+        >>> summary = replay_archive(since=datetime.date(2025, 4, 1))
+        >>> print(f"Re-indexed {summary['stored']} projects")
+    """
+    archive = archive or PostArchive()
+    posts = archive.iter_posts(since=since, until=until, subreddits=subreddits)
+    stats = _build_pipeline(NearDuplicateIndex()).run(posts)
+    return {
+        'replayed': stats['source'],
+        'processed': stats['stages']['deduplicate']['out'],
+        'stored': stats['stages']['upsert']['out'],
+        'stages': stats['stages'],
+        'finished_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+
+
+def _build_pipeline(
+    duplicates: NearDuplicateIndex,
+    journal: Optional[JobJournal] = None,
+    signatures: Optional[SignatureStore] = None,
+) -> Pipeline:
+    """
+    Build the process -> deduplicate -> [comments] -> enrich -> embed -> upsert pipeline.
+
+    The comments stage is only added when COMMENT_ENRICHMENT_ENABLED is set.
+
+    Args:
+        duplicates (NearDuplicateIndex): Index of posts already kept in this run;
+            later near-duplicates of them are dropped
+        journal (JobJournal, optional): When given, posts that already completed
+            a stage skip it and every stage's results are recorded
+        signatures (SignatureStore, optional): When given, the signatures of the
+            posts kept by de-duplication are saved for later runs
+
+    Returns:
+        Pipeline: Pipeline that takes raw posts
+    """
+
+    def journaled(target, func, record=True):
+        if journal is None:
+            return func
+
+        # Pass posts that already completed `target` straight through, run the
+        # stage for the rest and record what it produced and what it dropped
+        def run(batch):
+            known = journal.stages(post['id'] for post in batch)
+            done = [post for post in batch if stage_reached(known.get(post['id']), target)]
+            todo = [post for post in batch if not stage_reached(known.get(post['id']), target)]
+            results = list(func(todo)) if todo else []
+            if record:
+                journal.record(target, results)
+            kept = {post['id'] for post in results}
+            journal.skip(post['id'] for post in todo if post['id'] not in kept)
+            return done + results
+        return run
+
+    def process(batch):
+        # Posts the local classifier confidently rejects never reach the paid stages
+        return list(process_posts(batch, stream=True, min_confidence=PROJECT_DROP_CONFIDENCE))
+
+    def deduplicate(batch):
+        unique = []
+        for post in collapse_near_duplicates(batch):
+            if duplicates.add(post['id'], post['content']) is None:
+                unique.append(post)
+        if signatures is not None:
+            signatures.save(duplicates, (post['id'] for post in unique))
+        return unique
+
+    def add_comments(batch):
+        digests = fetch_comment_digests(post['id'] for post in batch)
+        for post in batch:
+            digest = digests.get(post['id'])
+            if digest:
+                post['comment_digest'] = digest
+        return batch
+
+    def enrich(batch):
+        for post, metadata in zip(batch, extract_metadata(batch)):
+            post.update(metadata)
+        return batch
+
+    def embed(batch):
+        for post, embedding in zip(batch, batch_process_embeddings(batch)):
+            post['embedding'] = embedding
+        return batch
+
+    def upsert(batch):
+        store_embeddings([post['embedding'] for post in batch], batch)
+        return batch
+
+    pipeline = (
+        Pipeline()
+        .add_stage('process', journaled('processed', process, record=False), batch_size=PROCESS_BATCH_SIZE)
+        .add_stage('deduplicate', journaled('processed', deduplicate), batch_size=PROCESS_BATCH_SIZE)
+    )
+    if COMMENT_ENRICHMENT_ENABLED:
+        # Comment digests are part of enrichment, so they are not fetched again for enriched posts
+        pipeline.add_stage('comments', journaled('enriched', add_comments, record=False), batch_size=COMMENT_BATCH_SIZE)
+    return (
+        pipeline
+        .add_stage(
+            'enrich',
+            journaled('enriched', enrich),
+            workers=PIPELINE_ENRICH_WORKERS,
+            batch_size=OPENAI_METADATA_BATCH_SIZE,
+        )
+        .add_stage(
+            'embed',
+            journaled('embedded', embed),
+            workers=PIPELINE_EMBED_WORKERS,
+            batch_size=EMBEDDING_BATCH_SIZE,
+        )
+        .add_stage(
+            'upsert',
+            journaled('upserted', upsert),
+            workers=PIPELINE_UPSERT_WORKERS,
+            batch_size=UPSERT_BATCH_SIZE,
+        )
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Command-line entry point for replaying the post archive.
+
+    Example:
+        python -m backend.services.refresh_pipeline replay --since 2025-04-01
+    """
+    parser = argparse.ArgumentParser(description="Vibe Coding Project Finder ingestion pipeline")
+    commands = parser.add_subparsers(dest='command', required=True)
+    replay = commands.add_parser('replay', help="Re-index archived raw posts without scraping Reddit")
+    replay.add_argument('--since', type=datetime.date.fromisoformat, help="First creation date (YYYY-MM-DD)")
+    replay.add_argument('--until', type=datetime.date.fromisoformat, help="Last creation date (YYYY-MM-DD)")
+    replay.add_argument('--subreddit', action='append', dest='subreddits', help="Limit to a subreddit (repeatable)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    summary = replay_archive(since=args.since, until=args.until, subreddits=args.subreddits)
+    print(json.dumps({key: value for key, value in summary.items() if key != 'stages'}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
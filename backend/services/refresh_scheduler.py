@@ -0,0 +1,254 @@
+"""
+Adaptive Refresh Scheduling for Vibe Coding Project Finder
+
+The scraped subreddits post at very different rates: r/webdev gets many times more new
+posts per day than r/vibecoding. Refreshing all of them every REFRESH_INTERVAL_HOURS
+means busy subreddits overflow their per-refresh limit (losing posts) while quiet ones
+are re-checked for nothing. This module tracks each subreddit's posting rate and
+refreshes every subreddit on its own interval instead:
+
+    interval = ADAPTIVE_REFRESH_TARGET_POSTS / posts_per_hour
+
+clamped to [MIN_REFRESH_INTERVAL_HOURS, REFRESH_INTERVAL_HOURS]. Busy subreddits are
+refreshed often with small delta fetches, quiet ones rarely, so the Reddit budget goes
+where new content actually appears. The posting rate is an exponentially weighted
+moving average of the rate observed on each refresh.
+
+A scheduler job calls refresh_due_subreddits() every REFRESH_TICK_MINUTES; subreddits
+that are due at the same time are refreshed together in one combined listing.
+
+Usage:
+    from services.refresh_scheduler import refresh_due_subreddits
+
+    summary = refresh_due_subreddits()
+    print(summary['refreshed'], summary['next_due'])
+"""
+
+import datetime  # For due times
+import json  # For persisting the schedule
+import logging  # For logging scheduling decisions
+import os  # For atomically replacing the schedule file
+import tempfile  # For writing the schedule file before swapping it into place
+import threading  # For guarding the store against concurrent updates
+import time  # For the current timestamp
+from pathlib import Path  # For cross-platform file paths
+from typing import List, Dict, Any, Optional  # Type hints for better code documentation
+
+# Import configuration from config file
+from ..config import (
+    SUBREDDITS,  # List of subreddits to refresh
+    REFRESH_INTERVAL_HOURS,  # Longest per-subreddit refresh interval
+    MIN_REFRESH_INTERVAL_HOURS,  # Shortest per-subreddit refresh interval
+    ADAPTIVE_REFRESH_TARGET_POSTS,  # New posts expected per refresh
+    VELOCITY_SMOOTHING,  # Weight of the latest observed posting rate
+    REFRESH_SCHEDULE_FILE,  # Posting rate and next refresh per subreddit
+)
+from .reddit_service import refresh_posts  # One incremental refresh
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+
+class RefreshScheduleStore:
+    """
+    Persisted posting rate and refresh times per subreddit.
+
+    For every subreddit the store keeps:
+        - posts_per_hour (float): Smoothed posting rate
+        - last_refreshed (float): Timestamp of the last successful refresh
+        - next_due (float): Timestamp at which the subreddit should be refreshed next
+
+    Subreddits that were never refreshed are due immediately.
+
+    Example:
+        >>> store = RefreshScheduleStore()
+        >>> store.due(["SideProject", "webdev"])
+        ['webdev']
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Load the schedule file, starting empty if it does not exist yet.
+
+        Args:
+            path (Path, optional): Location of the schedule file.
+                If None, uses REFRESH_SCHEDULE_FILE from config.py.
+        """
+        self.path = Path(path or REFRESH_SCHEDULE_FILE)
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        """Read the schedule file, treating a missing or corrupt file as empty."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable refresh schedule file {self.path}: {str(e)}")
+            return {}
+
+    def get(self, subreddit: str) -> Optional[Dict[str, float]]:
+        """
+        Return the schedule entry of a subreddit.
+
+        Args:
+            subreddit (str): Subreddit name (case-insensitive)
+
+        Returns:
+            dict: The entry (see class docstring), or None if never refreshed
+        """
+        with self._lock:
+            entry = self._entries.get(subreddit.lower())
+            return dict(entry) if entry else None
+
+    def due(self, subreddits: List[str], now: Optional[float] = None) -> List[str]:
+        """
+        Select the subreddits whose next refresh is due.
+
+        Args:
+            subreddits (list): Candidate subreddit names
+            now (float, optional): Current timestamp. Defaults to time.time().
+
+        Returns:
+            list: The due subreddits, in the given order
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            return [
+                name for name in subreddits
+                if self._entries.get(name.lower(), {}).get('next_due', 0) <= now
+            ]
+
+    def record(self, subreddit: str, activity: Optional[Dict[str, Any]], refreshed_at: float) -> Dict[str, float]:
+        """
+        Update a subreddit's posting rate after a successful refresh and schedule the next one.
+
+        The observed rate is the number of new posts divided by the time since the
+        previous refresh. On the first refresh there is no previous one, so the
+        rate is estimated from the spread of the new posts' creation times instead.
+
+        Args:
+            subreddit (str): Subreddit name (case-insensitive)
+            activity (dict): The subreddit's entry of refresh_posts()'s
+                'subreddit_activity' ('new', 'oldest', 'newest'), or None if the
+                refresh found no new posts
+            refreshed_at (float): Timestamp of the refresh
+
+        Returns:
+            dict: The updated entry
+        """
+        key = subreddit.lower()
+        new_posts = activity['new'] if activity else 0
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous and previous.get('last_refreshed'):
+                hours = max((refreshed_at - previous['last_refreshed']) / 3600, 1 / 60)
+                observed = new_posts / hours
+            elif new_posts >= 2:
+                hours = max((activity['newest'] - activity['oldest']) / 3600, 1 / 60)
+                observed = (new_posts - 1) / hours
+            else:
+                observed = 0.0
+
+            if previous and 'posts_per_hour' in previous:
+                rate = VELOCITY_SMOOTHING * observed + (1 - VELOCITY_SMOOTHING) * previous['posts_per_hour']
+            else:
+                rate = observed
+
+            interval = refresh_interval_hours(rate)
+            entry = {
+                'posts_per_hour': round(rate, 4),
+                'last_refreshed': refreshed_at,
+                'next_due': refreshed_at + interval * 3600,
+            }
+            self._entries[key] = entry
+        return dict(entry)
+
+    def save(self) -> None:
+        """Persist the schedule, replacing the file atomically."""
+        with self._lock:
+            entries = dict(self._entries)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a truncated file
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.schedule-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def refresh_interval_hours(posts_per_hour: float) -> float:
+    """
+    Compute how long to wait before refreshing a subreddit again.
+
+    Args:
+        posts_per_hour (float): Smoothed posting rate of the subreddit
+
+    Returns:
+        float: Hours until about ADAPTIVE_REFRESH_TARGET_POSTS new posts are
+        expected, clamped to [MIN_REFRESH_INTERVAL_HOURS, REFRESH_INTERVAL_HOURS]
+
+    Example:
+        >>> refresh_interval_hours(12.5)  # 25 posts expected after 2 hours
+        2.0
+    """
+    if posts_per_hour <= 0:
+        return float(REFRESH_INTERVAL_HOURS)
+    return min(max(ADAPTIVE_REFRESH_TARGET_POSTS / posts_per_hour, MIN_REFRESH_INTERVAL_HOURS), REFRESH_INTERVAL_HOURS)
+
+
+def refresh_due_subreddits(
+    subreddits: Optional[List[str]] = None,
+    store: Optional[RefreshScheduleStore] = None,
+) -> Dict[str, Any]:
+    """
+    Refresh the subreddits that are due and reschedule them from their posting rate.
+
+    This is the job schedule_refresh() runs every REFRESH_TICK_MINUTES. All due
+    subreddits are refreshed together with one refresh_posts() call; subreddits
+    that are not due cost nothing.
+
+    Args:
+        subreddits (list, optional): Subreddits to consider.
+            If None, uses the SUBREDDITS list from config.py.
+        store (RefreshScheduleStore, optional): Schedule to use.
+            If None, the schedule at REFRESH_SCHEDULE_FILE is used.
+
+    Returns:
+        dict: Summary of the tick, including:
+            - refreshed (list): Subreddits that were refreshed (empty if none were due)
+            - refresh (dict): refresh_posts() summary, or None if nothing was due
+            - next_due (dict): ISO datetime of each refreshed subreddit's next refresh
+
+    Example:
+        >>> summary = refresh_due_subreddits()
+        >>> summary['refreshed']
+        ['webdev', 'SideProject']
+    """
+    subreddits = subreddits or SUBREDDITS
+    store = store or RefreshScheduleStore()
+
+    due = store.due(subreddits)
+    if not due:
+        logger.debug("No subreddits due for a refresh")
+        return {'refreshed': [], 'refresh': None, 'next_due': {}}
+
+    summary = refresh_posts(due)
+    refreshed_at = time.time()
+    activity = summary.get('subreddit_activity', {})
+
+    next_due = {}
+    for name in due:
+        entry = store.record(name, activity.get(name.lower()), refreshed_at)
+        next_due[name] = datetime.datetime.fromtimestamp(entry['next_due'], tz=datetime.timezone.utc).isoformat()
+        logger.info(
+            f"r/{name}: {entry['posts_per_hour']:.2f} posts/hour, next refresh at {next_due[name]}"
+        )
+    store.save()
+
+    return {'refreshed': due, 'refresh': summary, 'next_due': next_due}
@@ -0,0 +1,123 @@
+"""
+Tests for near-duplicate detection and collapsing.
+
+Usage:
+    python -m pytest backend/tests/test_dedup_service.py
+"""
+
+from types import SimpleNamespace
+
+from backend.services import dedup_service
+from backend.services.dedup_service import MinHasher, NearDuplicateIndex, SignatureStore, collapse_near_duplicates
+
+HABIT_TRACKER = (
+    "I built a habit tracker with Next.js and Supabase. It syncs streaks across devices "
+    "and sends a reminder when you are about to break one."
+)
+
+
+def _post(post_id, content, score=1, created_at='2025-05-01T00:00:00+00:00', subreddit='SideProject'):
+    return {
+        'id': post_id,
+        'content': content,
+        'score': score,
+        'comment_count': 0,
+        'is_project': True,
+        'project_confidence': 0.9,
+        'created_at': created_at,
+        'subreddit': subreddit,
+    }
+
+
+def test_cross_posts_are_collapsed_and_engagement_summed():
+    posts = [
+        _post('a', HABIT_TRACKER, score=10, created_at='2025-05-01T00:00:00+00:00'),
+        _post('b', HABIT_TRACKER + '!', score=5, created_at='2025-05-01T02:00:00+00:00', subreddit='webdev'),
+    ]
+    [merged] = collapse_near_duplicates(posts)
+    assert merged['id'] == 'a'
+    assert merged['score'] == 15
+    assert merged['duplicate_ids'] == ['b']
+    assert merged['subreddits'] == ['SideProject', 'webdev']
+
+
+def test_short_titles_are_never_merged():
+    posts = [
+        _post('a', "Roast my portfolio", score=10),
+        _post('b', "Roast my portfolio", score=200),
+        _post('c', "Built this", score=3),
+        _post('d', "built this!", score=4),
+    ]
+    collapsed = collapse_near_duplicates(posts)
+    assert [post['id'] for post in collapsed] == ['a', 'b', 'c', 'd']
+    assert [post['score'] for post in collapsed] == [10, 200, 3, 4]
+
+
+def test_texts_without_enough_shingles_have_no_signature():
+    hasher = MinHasher()
+    assert hasher.signature("") is None
+    assert hasher.signature("🔥🔥🔥") is None
+    assert hasher.signature("日本語のアプリを作りました") is None
+    assert hasher.signature("Roast my portfolio") is None
+    assert hasher.signature(HABIT_TRACKER) is not None
+
+
+def test_index_never_matches_short_texts():
+    index = NearDuplicateIndex()
+    assert index.add('a', "Roast my portfolio") is None
+    assert index.add('b', "Roast my portfolio") is None
+    assert index.add('c', HABIT_TRACKER) is None
+    assert index.add('d', HABIT_TRACKER.upper()) == 'c'
+
+
+def test_different_projects_are_kept_apart():
+    other = (
+        "We made a Discord bot that plans D&D sessions. It finds a date that works for "
+        "everyone and posts a reminder the day before."
+    )
+    collapsed = collapse_near_duplicates([_post('a', HABIT_TRACKER), _post('b', other)])
+    assert [post['id'] for post in collapsed] == ['a', 'b']
+
+
+def test_index_never_reports_a_key_as_its_own_duplicate():
+    index = NearDuplicateIndex()
+    assert index.add('a', HABIT_TRACKER) is None
+    assert index.add('a', HABIT_TRACKER) is None
+    assert index.add('b', HABIT_TRACKER) == 'a'
+
+
+def test_signature_store_seeds_later_indexes(tmp_path):
+    store = SignatureStore(tmp_path / 'signatures.db')
+    first_run = NearDuplicateIndex()
+    first_run.add('a', HABIT_TRACKER)
+    store.save(first_run, ['a', 'unknown'])
+
+    next_run = NearDuplicateIndex()
+    assert store.seed(next_run) == 1
+    assert next_run.add('b', HABIT_TRACKER + '!') == 'a'
+    store.close()
+
+
+def test_signature_store_forgets_old_signatures(tmp_path, monkeypatch):
+    clock = SimpleNamespace(now=1746100800.0)
+    monkeypatch.setattr(dedup_service, 'time', SimpleNamespace(time=lambda: clock.now))
+    store = SignatureStore(tmp_path / 'signatures.db', retention_days=30)
+    index = NearDuplicateIndex()
+    index.add('a', HABIT_TRACKER)
+    store.save(index, ['a'])
+
+    clock.now += 31 * 86400
+
+    assert store.seed(NearDuplicateIndex()) == 0
+    assert store.prune() == 1
+    store.close()
+
+
+def test_signature_store_skips_signatures_of_another_length(tmp_path):
+    store = SignatureStore(tmp_path / 'signatures.db')
+    index = NearDuplicateIndex(num_perm=32, bands=8)
+    index.add('a', HABIT_TRACKER)
+    store.save(index, ['a'])
+
+    assert store.seed(NearDuplicateIndex()) == 0
+    store.close()
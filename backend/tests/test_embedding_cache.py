@@ -0,0 +1,109 @@
+"""
+Tests for the persistent embedding cache.
+
+Usage:
+    python -m pytest backend/tests/test_embedding_cache.py
+"""
+
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services import embedding_cache
+from backend.services.embedding_cache import EmbeddingCache
+
+MODEL = 'llama-text-embed-v2'
+VECTOR = [0.5, -0.25, 1.0, 0.1]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1746100800.0)
+    monkeypatch.setattr(embedding_cache, 'time', SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache, 'PINECONE_DIMENSION', len(VECTOR))
+    cache = EmbeddingCache(tmp_path / 'cache.sqlite3', max_entries=3)
+    yield cache
+    cache.close()
+
+
+def test_float16_round_trip_and_normalized_text(cache):
+    cache.put_many(MODEL, 'passage', ["Habit  tracker\n"], [VECTOR])
+
+    found = cache.get_many(MODEL, 'passage', ["missing", "Habit tracker"])
+
+    assert list(found) == [1]
+    assert found[1][:3] == [0.5, -0.25, 1.0]
+    assert found[1][3] == pytest.approx(0.1, abs=1e-3)
+
+
+def test_keys_are_scoped_to_backend_dimension_model_and_input_type(cache, monkeypatch):
+    cache.put_many(MODEL, 'passage', ["text"], [VECTOR])
+
+    assert cache.get_many(MODEL, 'query', ["text"]) == {}
+    assert cache.get_many('other-model', 'passage', ["text"]) == {}
+    backend = embedding_cache.EMBEDDING_BACKEND
+    monkeypatch.setattr(embedding_cache, 'EMBEDDING_BACKEND', 'some-other-backend')
+    assert cache.get_many(MODEL, 'passage', ["text"]) == {}
+    monkeypatch.setattr(embedding_cache, 'EMBEDDING_BACKEND', backend)
+    assert cache.get_many(MODEL, 'passage', ["text"]) != {}
+    monkeypatch.setattr(embedding_cache, 'PINECONE_DIMENSION', 8)
+    assert cache.get_many(MODEL, 'passage', ["text"]) == {}
+
+
+def test_vectors_of_the_wrong_length_are_misses(cache, monkeypatch):
+    cache.put_many(MODEL, 'passage', ["short"], [VECTOR[:2]])
+
+    assert cache.get_many(MODEL, 'passage', ["short"]) == {}
+    assert cache.stats()['misses'] == 1
+
+
+def test_least_recently_used_entries_are_evicted(cache, clock, monkeypatch):
+    monkeypatch.setattr(embedding_cache, 'EVICTION_CHECK_INTERVAL', 1)
+    for text in ("a", "b", "c"):
+        clock.now += 1
+        cache.put_many(MODEL, 'passage', [text], [VECTOR])
+    clock.now += 1
+    cache.get_many(MODEL, 'passage', ["a"])
+
+    clock.now += 1
+    cache.put_many(MODEL, 'passage', ["d"], [VECTOR])
+
+    assert sorted(cache.get_many(MODEL, 'passage', ["a", "b", "c", "d"])) == [0, 2, 3]
+    assert cache.stats()['entries'] == 3
+
+
+def test_size_is_only_checked_every_interval(cache, monkeypatch):
+    monkeypatch.setattr(embedding_cache, 'EVICTION_CHECK_INTERVAL', 3)
+    cache.max_entries = 1
+
+    cache.put_many(MODEL, 'passage', ["a", "b"], [VECTOR, VECTOR])
+    assert cache.stats()['entries'] == 2
+
+    cache.put_many(MODEL, 'passage', ["c"], [VECTOR])
+    assert cache.stats()['entries'] == 1
+
+
+def test_last_used_times_are_written_back_in_batches(cache, clock, tmp_path):
+    cache.put_many(MODEL, 'passage', ["a"], [VECTOR])
+    stored = clock.now
+    clock.now += 10
+
+    cache.get_many(MODEL, 'passage', ["a"])
+    reader = sqlite3.connect(str(tmp_path / 'cache.sqlite3'))
+    assert reader.execute("SELECT last_used FROM embeddings").fetchone()[0] == stored
+
+    clock.now += embedding_cache.TOUCH_FLUSH_SECONDS
+    cache.get_many(MODEL, 'passage', ["a"])
+    assert reader.execute("SELECT last_used FROM embeddings").fetchone()[0] == clock.now
+    reader.close()
+
+
+def test_put_many_rejects_mismatched_lists(cache):
+    with pytest.raises(ValueError):
+        cache.put_many(MODEL, 'passage', ["a", "b"], [VECTOR])
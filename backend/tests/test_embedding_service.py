@@ -0,0 +1,131 @@
+"""
+Tests for the embedding service.
+
+Usage:
+    python -m pytest backend/tests/test_embedding_service.py
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.services import embedding_service
+from backend.utils.helpers import SingleFlight, TTLCache
+from backend.services.embedding_service import (
+    CHARS_PER_TOKEN,
+    estimate_tokens,
+    token_batches,
+    truncate_for_embedding,
+)
+
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    """Embed texts as [len(text)] and record every request; no disk cache."""
+    requests = []
+
+    def embed_batch(texts, input_type):
+        requests.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    monkeypatch.setattr(embedding_service, '_embed_batch', embed_batch)
+    monkeypatch.setattr(embedding_service, 'get_embedding_cache', lambda: None)
+    return requests
+
+
+def test_batches_are_closed_at_the_input_limit():
+    texts = [f"text {n}" for n in range(10)]
+
+    batches = list(token_batches(texts, max_inputs=4, max_tokens=10_000))
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert [text for batch in batches for text in batch] == texts
+
+
+def test_batches_are_closed_at_the_token_limit():
+    text = "x" * (10 * CHARS_PER_TOKEN)  # 11 estimated tokens
+    assert estimate_tokens(text) == 11
+
+    batches = list(token_batches([text] * 5, max_inputs=100, max_tokens=25))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_oversized_text_gets_a_batch_of_its_own():
+    huge = "y" * 1000
+
+    batches = list(token_batches(["a", huge, "b"], max_inputs=100, max_tokens=50))
+
+    assert batches == [["a"], [huge], ["b"]]
+
+
+def test_no_texts_make_no_batches():
+    assert list(token_batches([])) == []
+
+
+def test_truncation_keeps_short_texts_and_cuts_at_a_word_boundary():
+    assert truncate_for_embedding("short text", max_tokens=10) == "short text"
+
+    cut = truncate_for_embedding("alpha beta gamma delta", max_tokens=4)
+
+    assert cut == "alpha beta"
+    assert len(cut) <= 4 * CHARS_PER_TOKEN
+
+
+def test_embeddings_come_back_in_input_order(fake_backend):
+    texts = [f"{'w' * n} words" for n in range(1, 8)]
+
+    vectors = embedding_service._embed_cached(texts, 'passage', batch_size=3)
+
+    assert vectors == [[float(len(text))] for text in texts]
+    assert [len(batch) for batch in fake_backend] == [3, 3, 1]
+
+
+def test_repeated_texts_are_embedded_once(fake_backend):
+    vectors = embedding_service._embed_cached(["same", "other", "same"], 'passage')
+
+    assert fake_backend == [["same", "other"]]
+    assert vectors == [[4.0], [5.0], [4.0]]
+
+
+def test_long_texts_are_truncated_before_embedding(fake_backend):
+    text = "word " * (embedding_service.EMBEDDING_MAX_INPUT_TOKENS * CHARS_PER_TOKEN)
+
+    embedding_service._embed_cached([text], 'passage')
+
+    [[sent]] = fake_backend
+    assert text.startswith(sent)
+    assert len(sent) <= embedding_service.EMBEDDING_MAX_INPUT_TOKENS * CHARS_PER_TOKEN
+
+
+def test_concurrent_identical_queries_make_one_backend_call(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def embed_batch(texts, input_type):
+        with lock:
+            calls.append(list(texts))
+        time.sleep(0.2)
+        return [[float(len(text))] for text in texts]
+
+    monkeypatch.setattr(embedding_service, '_embed_batch', embed_batch)
+    monkeypatch.setattr(embedding_service, '_query_cache', TTLCache(16, ttl_seconds=60))
+    monkeypatch.setattr(embedding_service, '_query_flights', SingleFlight())
+    queries = ["weekend project ideas", "Weekend  project ideas", " WEEKEND project ideas "] * 3
+
+    with ThreadPoolExecutor(len(queries)) as pool:
+        vectors = list(pool.map(embedding_service.create_embedding, queries))
+
+    assert len(calls) == 1
+    assert len({tuple(vector) for vector in vectors}) == 1
+    # Later callers are served from the query cache
+    embedding_service.create_embedding("weekend project ideas")
+    assert len(calls) == 1
+    assert embedding_service.query_cache_stats()['hits'] >= 1
+
+
+def test_empty_queries_are_rejected():
+    with pytest.raises(ValueError):
+        embedding_service.create_embedding("   ")
@@ -0,0 +1,316 @@
+"""
+Tests for the shared helpers.
+
+Usage:
+    python -m pytest backend/tests/test_helpers.py
+"""
+
+import http.server
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from backend.utils import helpers
+from backend.utils.helpers import (
+    LeaseLock,
+    MicroBatcher,
+    SingleFlight,
+    TokenBucketRateLimiter,
+    TTLCache,
+    create_http_session,
+)
+
+
+class FakeClock:
+    """Stands in for the time module; sleep() only advances the clock if asked to."""
+
+    def __init__(self, advance_on_sleep=True):
+        self.now = 1000.0
+        self.advance_on_sleep = advance_on_sleep
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        if self.advance_on_sleep:
+            self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(helpers, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def rate_limited_url():
+    """URL of a local server answering every request with HTTP 429."""
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(429)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_session_without_status_retries_returns_429(rate_limited_url):
+    session = create_http_session(retries=0, retry_on_status=False)
+    assert session.get(rate_limited_url).status_code == 429
+
+
+def test_session_with_status_retries_raises_after_retrying(rate_limited_url):
+    session = create_http_session(retries=1, backoff_factor=0)
+    with pytest.raises(requests.exceptions.RetryError):
+        session.get(rate_limited_url)
+
+
+def test_limiter_reserves_tokens_on_credit(clock):
+    limiter = TokenBucketRateLimiter(60, capacity=2)
+    # Callers arriving together while nobody has slept yet are queued one second apart
+    clock.advance_on_sleep = False
+
+    waits = [limiter.acquire() for _ in range(5)]
+
+    assert waits == [0.0, 0.0, 1.0, 2.0, 3.0]
+
+
+def test_limiter_refills_at_configured_rate(clock):
+    limiter = TokenBucketRateLimiter(60, capacity=2)
+    limiter.acquire()
+    limiter.acquire()
+
+    clock.now += 1.5
+
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == pytest.approx(0.5)
+
+
+def test_limiter_follows_server_headers(clock):
+    limiter = TokenBucketRateLimiter(60, capacity=1)
+    # 10 requests left for the next 100 seconds: one every 10 seconds
+    limiter.update_from_headers({'X-Ratelimit-Remaining': '10', 'X-Ratelimit-Reset': '100'})
+    limiter.acquire()
+
+    assert limiter.acquire() == pytest.approx(10.0)
+
+    # Once the server window has reset the configured rate applies again
+    clock.now += 200
+    limiter.acquire()
+    assert limiter.acquire() == pytest.approx(1.0)
+
+
+def test_limiter_never_speeds_up_beyond_configured_rate(clock):
+    limiter = TokenBucketRateLimiter(60, capacity=1)
+    limiter.update_from_headers({'x-ratelimit-remaining': '600', 'x-ratelimit-reset': '60'})
+    limiter.acquire()
+
+    assert limiter.acquire() == pytest.approx(1.0)
+
+
+def test_limiter_pauses_until_reset_when_quota_exhausted(clock):
+    limiter = TokenBucketRateLimiter(60, capacity=5)
+    limiter.update_from_headers({'X-Ratelimit-Remaining': '0', 'X-Ratelimit-Reset': '30'})
+
+    # Nothing is earned inside the exhausted window, then one token at the configured rate
+    assert limiter.acquire() == pytest.approx(31.0)
+
+
+def test_limiter_ignores_responses_without_quota_headers(clock):
+    limiter = TokenBucketRateLimiter(60, capacity=1)
+    limiter.update_from_headers({'X-Ratelimit-Remaining': 'soon'})
+    limiter.update_from_headers({})
+    limiter.acquire()
+
+    assert limiter.acquire() == pytest.approx(1.0)
+
+
+def test_lease_lock_excludes_other_holders(tmp_path):
+    path = tmp_path / 'locks.sqlite3'
+    first = LeaseLock('refresh', path)
+    second = LeaseLock('refresh', path)
+
+    assert first.acquire()
+    assert first.acquire()  # Re-acquiring our own lease just extends it
+    assert not second.acquire()
+    assert second.holder() == first.owner
+    assert LeaseLock('other', path).acquire()
+
+    first.release()
+    assert second.holder() is None
+    assert second.acquire()
+
+
+def test_lease_expires_after_ttl(tmp_path, clock):
+    path = tmp_path / 'locks.sqlite3'
+    crashed = LeaseLock('refresh', path, ttl=60)
+    other = LeaseLock('refresh', path, ttl=60)
+    crashed.acquire()
+
+    clock.now += 59
+    assert not other.acquire()
+    clock.now += 2
+    assert other.acquire()
+    # The old holder learns it lost the lease and cannot take it back
+    assert not crashed.renew()
+    assert not crashed.acquire()
+
+
+def test_renew_extends_the_lease(tmp_path, clock):
+    path = tmp_path / 'locks.sqlite3'
+    holder = LeaseLock('refresh', path, ttl=60)
+    other = LeaseLock('refresh', path, ttl=60)
+    holder.acquire()
+
+    clock.now += 50
+    assert holder.renew()
+    clock.now += 50
+    assert not other.acquire()
+
+
+def test_hold_renews_in_the_background(tmp_path):
+    path = tmp_path / 'locks.sqlite3'
+    holder = LeaseLock('refresh', path, ttl=0.3)
+    other = LeaseLock('refresh', path, ttl=0.3)
+
+    with holder.hold() as acquired:
+        assert acquired
+        # Well past the TTL, but the heartbeat keeps the lease alive
+        time.sleep(0.8)
+        with other.hold() as other_acquired:
+            assert not other_acquired
+    assert other.holder() is None
+
+
+def _submit_concurrently(batcher, items):
+    """Submit every item from its own thread; return each result or raised exception."""
+    def call(item):
+        try:
+            return batcher.submit(item, timeout=5)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(len(items)) as pool:
+        return list(pool.map(call, items))
+
+
+def test_micro_batcher_coalesces_concurrent_calls():
+    calls = []
+
+    def double(items):
+        calls.append(len(items))
+        return [item * 2 for item in items]
+
+    # A long window, so batches are closed by max_batch_size rather than by time
+    batcher = MicroBatcher(double, max_batch_size=4, max_wait_ms=2000)
+
+    results = _submit_concurrently(batcher, list(range(8)))
+
+    assert results == [item * 2 for item in range(8)]
+    assert calls == [4, 4]
+
+
+def test_micro_batcher_single_call_waits_only_the_window():
+    batcher = MicroBatcher(lambda items: [item.upper() for item in items], max_wait_ms=50)
+
+    started = time.monotonic()
+    assert batcher.submit("hello", timeout=5) == "HELLO"
+    assert time.monotonic() - started < 1
+
+
+def test_micro_batcher_raises_batch_errors_in_every_caller():
+    def fail(items):
+        raise RuntimeError(f"backend down for {len(items)}")
+
+    batcher = MicroBatcher(fail, max_batch_size=3, max_wait_ms=2000)
+
+    results = _submit_concurrently(batcher, ["a", "b", "c"])
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert {str(result) for result in results} == {"backend down for 3"}
+
+
+def test_micro_batcher_rejects_wrong_number_of_results():
+    batcher = MicroBatcher(lambda items: items[:-1], max_batch_size=2, max_wait_ms=2000)
+
+    results = _submit_concurrently(batcher, ["a", "b"])
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert "returned 1 results for 2 items" in str(results[0])
+
+
+def test_ttl_cache_expires_values(clock):
+    cache = TTLCache(10, ttl_seconds=60)
+    cache.set('query', [0.1])
+
+    clock.now += 59
+    assert cache.get('query') == [0.1]
+    clock.now += 2
+    assert cache.get('query') is None
+    assert cache.stats() == {'entries': 0, 'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+
+    cache.set('c', 3)
+
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
+
+
+def test_single_flight_shares_one_computation():
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return 'vector'
+
+    flights = SingleFlight()
+    with ThreadPoolExecutor(6) as pool:
+        futures = [pool.submit(flights.do, 'query', compute) for _ in range(6)]
+        time.sleep(0.2)
+        release.set()
+        results = [future.result(5) for future in futures]
+
+    assert results == ['vector'] * 6
+    assert len(calls) == 1
+    # Nothing is remembered once the flight has landed
+    assert flights.do('query', lambda: 'again') == 'again'
+
+
+def test_single_flight_shares_the_exception():
+    release = threading.Event()
+
+    def compute():
+        release.wait(5)
+        raise RuntimeError("embedding failed")
+
+    flights = SingleFlight()
+    with ThreadPoolExecutor(3) as pool:
+        futures = [pool.submit(flights.do, 'query', compute) for _ in range(3)]
+        time.sleep(0.2)
+        release.set()
+        errors = [future.exception(5) for future in futures]
+
+    assert all(isinstance(error, RuntimeError) for error in errors)
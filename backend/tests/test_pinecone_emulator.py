@@ -0,0 +1,93 @@
+"""
+Tests for the local Pinecone emulator, driven through the real index client.
+
+Usage:
+    python -m pytest backend/tests/test_pinecone_emulator.py
+"""
+
+import pytest
+
+from backend.services.pinecone_emulator import EmulatedIndex, EmulatorError, matches_filter, start_emulator
+from backend.services.pinecone_service import PineconeError, PineconeIndex
+
+
+@pytest.fixture
+def index():
+    """PineconeIndex client talking to an emulator with a 3-dimensional cosine index."""
+    server = start_emulator(port=0, index=EmulatedIndex(dimension=3))
+    yield PineconeIndex(f"http://127.0.0.1:{server.server_address[1]}", api_key=None)
+    server.shutdown()
+    server.server_close()
+
+
+def _vector(vector_id, values, **metadata):
+    return {'id': vector_id, 'values': values, 'metadata': metadata}
+
+
+def test_round_trip_through_the_index_client(index):
+    assert index.upsert([
+        _vector('habits', [1, 0, 0], skill_level='beginner', score=12),
+        _vector('compiler', [0, 1, 0], skill_level='advanced', score=80),
+        _vector('todo', [0.9, 0.1, 0], skill_level='beginner', score=3),
+    ]) == {'upsertedCount': 3}
+
+    matches = index.query([1, 0, 0], top_k=2)['matches']
+    assert [match['id'] for match in matches] == ['habits', 'todo']
+    assert matches[0]['score'] == pytest.approx(1.0)
+    assert matches[0]['metadata'] == {'skill_level': 'beginner', 'score': 12}
+
+    filtered = index.query([1, 0, 0], top_k=3, metadata_filter={'score': {'$gte': 10}})['matches']
+    assert [match['id'] for match in filtered] == ['habits', 'compiler']
+
+    fetched = index.fetch(['compiler', 'missing'])['vectors']
+    assert list(fetched) == ['compiler']
+    assert fetched['compiler']['values'] == [0, 1, 0]
+
+    index.update('compiler', {'score': 95})
+    assert index.fetch(['compiler'])['vectors']['compiler']['metadata']['score'] == 95
+
+    index.delete(['habits'])
+    assert [match['id'] for match in index.query([1, 0, 0], top_k=3)['matches']] == ['todo', 'compiler']
+    assert [vector['id'] for vector in index.list_ids()['vectors']] == ['compiler', 'todo']
+
+
+def test_namespaces_are_separate(index):
+    index.upsert([_vector('a', [1, 0, 0])], namespace='archive')
+
+    assert index.query([1, 0, 0], top_k=5)['matches'] == []
+    assert [match['id'] for match in index.query([1, 0, 0], top_k=5, namespace='archive')['matches']] == ['a']
+
+
+def test_errors_surface_as_pinecone_errors(index):
+    with pytest.raises(PineconeError):
+        index.upsert([_vector('short', [1, 0])])
+    with pytest.raises(PineconeError):
+        index.update('missing', {'score': 1})
+
+
+@pytest.mark.parametrize('metadata_filter, expected', [
+    ({'skill_level': 'beginner'}, True),
+    ({'skill_level': {'$ne': 'beginner'}}, False),
+    ({'tech_stack': 'react'}, True),
+    ({'tech_stack': {'$in': ['vue', 'python']}}, True),
+    ({'tech_stack': {'$nin': ['python']}}, False),
+    ({'score': {'$gt': 12}}, False),
+    ({'score': {'$gte': 12, '$lt': 13}}, True),
+    ({'score': {'$lte': 11}}, False),
+    ({'skill_level': {'$gt': 1}}, False),
+    ({'license': {'$exists': False}}, True),
+    ({'license': {'$ne': 'MIT'}}, True),
+    ({'license': {'$eq': 'MIT'}}, False),
+    ({'$and': [{'score': {'$gte': 10}}, {'tech_stack': 'python'}]}, True),
+    ({'$or': [{'score': {'$gte': 50}}, {'subreddit': 'webdev'}]}, False),
+])
+def test_filter_operators(metadata_filter, expected):
+    metadata = {'skill_level': 'beginner', 'tech_stack': ['python', 'react'], 'score': 12}
+    assert matches_filter(metadata, metadata_filter) is expected
+
+
+def test_unknown_filter_operators_are_rejected():
+    with pytest.raises(EmulatorError):
+        matches_filter({'score': 1}, {'score': {'$regex': '1'}})
+    with pytest.raises(EmulatorError):
+        matches_filter({'score': 1}, {'$not': {'score': 1}})
@@ -0,0 +1,55 @@
+"""
+Tests for the raw post archive.
+
+Usage:
+    python -m pytest backend/tests/test_post_archive.py
+"""
+
+import datetime
+
+from backend.services.post_archive import PostArchive
+
+# 2025-05-01T12:00:00Z
+NOON = 1746100800.0
+
+
+def _raw_post(post_id, created_utc=NOON, score=1, num_comments=0, subreddit='SideProject'):
+    return {
+        'id': post_id,
+        'title': f"Post {post_id}",
+        'selftext': '',
+        'url': f"https://www.reddit.com/r/{subreddit}/comments/{post_id}/",
+        'author': 'someone',
+        'created_utc': created_utc,
+        'subreddit': subreddit,
+        'score': score,
+        'num_comments': num_comments,
+    }
+
+
+def test_replay_sees_the_most_recent_copy(tmp_path):
+    archive = PostArchive(tmp_path)
+    archive.append([_raw_post('a', score=1, num_comments=0), _raw_post('b')])
+    archive.append([_raw_post('a', score=250, num_comments=40)])
+
+    posts = list(archive.iter_posts())
+    assert [post['id'] for post in posts] == ['a', 'b']
+    assert (posts[0]['score'], posts[0]['num_comments']) == (250, 40)
+
+
+def test_posts_are_partitioned_by_creation_date(tmp_path):
+    archive = PostArchive(tmp_path)
+    day = 24 * 3600
+    archive.append([_raw_post('late', NOON + day), _raw_post('early', NOON)])
+
+    assert [path.parts[-4:-1] for path in archive.partitions()] == [('2025', '05', '01'), ('2025', '05', '02')]
+    assert [post['id'] for post in archive.iter_posts()] == ['early', 'late']
+    only_first = archive.iter_posts(until=datetime.date(2025, 5, 1))
+    assert [post['id'] for post in only_first] == ['early']
+
+
+def test_subreddit_filter_is_case_insensitive(tmp_path):
+    archive = PostArchive(tmp_path)
+    archive.append([_raw_post('a', subreddit='webdev'), _raw_post('b', subreddit='SideProject')])
+
+    assert [post['id'] for post in archive.iter_posts(subreddits=['WebDev'])] == ['a']
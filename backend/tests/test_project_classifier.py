@@ -0,0 +1,80 @@
+"""
+Labeled posts backing the project classifier's hand-picked weights.
+
+Each case is a post from the scraped subreddits (lightly shortened) with its label.
+Projects must never be dropped by the refresh pipeline, and should be flagged as
+projects unless nothing in them says so; questions, help requests and career posts
+must score below the project cutoff, and the clearest of them are dropped.
+
+Usage:
+    python -m pytest backend/tests
+"""
+
+import pytest  # Test runner
+
+from backend.config import PROJECT_CONFIDENCE_CUTOFF, PROJECT_DROP_CONFIDENCE
+from backend.services.project_classifier import explain, project_confidence
+
+# (title, body) of posts presenting a project
+PROJECTS = [
+    ("I built a habit tracker", "I built a habit tracker with Next.js. Feedback welcome!"),
+    ("I made a tool to help job seekers track applications",
+     "Paste a job posting and it keeps track of where you applied and when to follow up."),
+    ("Made a Chrome extension that blocks distracting sites",
+     "It only lets you open Reddit after you finish your to-do list."),
+    ("Habit tracker for teachers",
+     "Teachers set weekly goals for their class and students check them off."),
+    ("We just launched our open-source markdown editor",
+     "Here is the GitHub repo, would love some feedback."),
+    ("My weekend project: a Discord bot that plans D&D sessions",
+     "Built it with Python and SQLite, it finds a date that works for everyone."),
+    ("Roast my SaaS landing page", "Just shipped the MVP of my invoicing app for freelancers."),
+    ("Interview prep flashcards I made while job hunting",
+     "I made a spaced-repetition deck app for algorithm questions. Source on GitHub."),
+]
+
+# (title, body) of posts that are not projects
+NON_PROJECTS = [
+    ("How do I center a div?", "I've tried flexbox and it's not working. Please help"),
+    ("Getting an error with useEffect", "Can someone help? The effect runs twice and I'm stuck on it."),
+    ("Is a CS degree worth it?", "Job hunting for 6 months with no offers. Should I do a bootcamp instead?"),
+    ("Should I learn Python or JavaScript first?", "Complete beginner, where do I start?"),
+    ("Resume review please", "Applying for my first internship, any help is appreciated."),
+    ("Why does my React app re-render so often?", "Is it possible to stop it? Any help welcome."),
+]
+
+# (title, body) of posts no feature says anything about
+NEUTRAL = [
+    ("Habit tracker for teachers", "Teachers set weekly goals for their class and students check them off."),
+    ("Pixel art weather widget", "Shows the forecast as a tiny animated landscape."),
+]
+
+
+def _confidence(title, body):
+    return project_confidence(title, f"{title} {body}")
+
+
+@pytest.mark.parametrize('title, body', PROJECTS)
+def test_projects_are_kept(title, body):
+    assert _confidence(title, body) >= PROJECT_CONFIDENCE_CUTOFF, explain(title, f"{title} {body}")
+
+
+@pytest.mark.parametrize('title, body', NON_PROJECTS)
+def test_non_projects_score_below_cutoff(title, body):
+    assert _confidence(title, body) < PROJECT_CONFIDENCE_CUTOFF, explain(title, f"{title} {body}")
+
+
+@pytest.mark.parametrize('title, body', NON_PROJECTS[:3])
+def test_clear_help_requests_are_dropped(title, body):
+    assert _confidence(title, body) < PROJECT_DROP_CONFIDENCE, explain(title, f"{title} {body}")
+
+
+@pytest.mark.parametrize('title, body', NEUTRAL)
+def test_posts_without_evidence_are_kept(title, body):
+    assert explain(title, f"{title} {body}") == {}
+    assert _confidence(title, body) > PROJECT_DROP_CONFIDENCE
+
+
+def test_helping_job_seekers_is_not_a_help_request():
+    matched = explain("A tool to help job seekers", "A tool to help job seekers track applications")
+    assert 'help' not in matched and 'career' not in matched
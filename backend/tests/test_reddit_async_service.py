@@ -0,0 +1,51 @@
+"""
+Tests for the asyncio Reddit scraping backend.
+
+Usage:
+    python -m pytest backend/tests/test_reddit_async_service.py
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import aiohttp
+
+from backend.services import reddit_async_service
+
+
+class _Comments(list):
+    async def replace_more(self, limit):
+        return []
+
+
+class _FakeReddit:
+    """Client whose submissions fail to load with a configured error."""
+
+    def __init__(self, comments, errors):
+        self.comments = comments
+        self.errors = errors
+
+    async def submission(self, post_id, fetch=True):
+        async def load():
+            if post_id in self.errors:
+                raise self.errors[post_id]
+
+        return SimpleNamespace(load=load, comments=_Comments(self.comments.get(post_id, [])))
+
+
+def _comment(body, score):
+    return SimpleNamespace(body=body, score=score, stickied=False, author=SimpleNamespace(name='someone'))
+
+
+def test_transport_errors_fail_only_their_own_post():
+    reddit = _FakeReddit(
+        comments={'ok': [_comment("Love the offline mode", 5)]},
+        errors={'reset': aiohttp.ClientConnectionError("reset"), 'slow': asyncio.TimeoutError()},
+    )
+
+    digests = asyncio.run(reddit_async_service._gather_comment_digests(
+        reddit, ['ok', 'reset', 'slow'], top_n=3, replace_more_limit=0, max_chars=500,
+        semaphore=asyncio.Semaphore(2),
+    ))
+
+    assert digests == {'ok': "Love the offline mode", 'reset': None, 'slow': None}
@@ -0,0 +1,168 @@
+"""
+Tests for backfilling from Reddit submission dumps, using generated .zst dumps.
+
+Usage:
+    python -m pytest backend/tests/test_reddit_backfill.py
+"""
+
+import datetime
+import json
+
+import pytest
+import zstandard
+
+from backend.services.reddit_backfill import _dump_to_dict, _to_int, iter_dump_posts
+
+DAY = 86400
+JAN_10 = 1704844800.0  # 2024-01-10T00:00:00Z
+
+
+def _submission(number, subreddit='SideProject', day=0, **fields):
+    submission = {
+        'id': f"s{number}",
+        'subreddit': subreddit,
+        'created_utc': JAN_10 + day * DAY + number,
+        'title': f"Project {number}",
+        'selftext': f"I built thing {number}",
+        'author': f"maker{number}",
+        'permalink': f"/r/{subreddit}/comments/s{number}/project_{number}/",
+        'score': number,
+        'num_comments': 1,
+    }
+    submission.update(fields)
+    return submission
+
+
+def _write_dump(path, submissions, extra_lines=()):
+    lines = [json.dumps(submission).encode('utf-8') for submission in submissions]
+    lines.extend(extra_lines)
+    path.write_bytes(zstandard.ZstdCompressor().compress(b'\n'.join(lines) + b'\n'))
+    return path
+
+
+@pytest.fixture
+def dumps(tmp_path):
+    """Two monthly dumps mixing wanted subreddits, other subreddits, dates and junk lines."""
+    first = _write_dump(tmp_path / 'RS_2024-01a.zst', [
+        _submission(1, day=0),
+        _submission(2, subreddit='pics', day=0),
+        _submission(3, subreddit='webdev', day=1),
+        _submission(4, day=3),
+        _submission(5, subreddit='sideproject', day=5),
+    ], extra_lines=[b'{"subreddit": "SideProject", "truncated', b''])
+    second = _write_dump(tmp_path / 'RS_2024-01b.zst', [
+        _submission(6, day=2),
+        _submission(7, subreddit='funny', day=2),
+        _submission(8, subreddit='WebDev', day=4),
+    ])
+    return [first, second]
+
+
+def _ids(posts):
+    return [post['id'] for post in posts]
+
+
+def test_single_dump_is_parsed_in_chunks_and_filtered_by_subreddit(dumps):
+    posts = list(iter_dump_posts([dumps[0]], subreddits=['sideproject', 'WEBDEV'], workers=2, chunk_lines=2))
+
+    assert _ids(posts) == ['s1', 's3', 's4', 's5']
+    assert posts[0] == {
+        'id': 's1',
+        'title': "Project 1",
+        'selftext': "I built thing 1",
+        'url': "https://www.reddit.com/r/SideProject/comments/s1/project_1/",
+        'author': "maker1",
+        'created_utc': JAN_10 + 1,
+        'subreddit': 'SideProject',
+        'score': 1,
+        'num_comments': 1,
+    }
+
+
+def test_single_dump_is_filtered_by_date(dumps):
+    posts = iter_dump_posts(
+        [dumps[0]], subreddits=['SideProject', 'webdev'], workers=2, chunk_lines=2,
+        since=datetime.date(2024, 1, 11), until=datetime.date(2024, 1, 13),
+    )
+
+    # until is inclusive: posts from any time on Jan 13 are kept
+    assert _ids(posts) == ['s3', 's4']
+
+
+def test_several_dumps_are_filtered_per_file_and_kept_in_order(dumps):
+    posts = list(iter_dump_posts(dumps, subreddits=['SideProject', 'webdev'], workers=2, chunk_lines=2))
+
+    assert _ids(posts) == ['s1', 's3', 's4', 's5', 's6', 's8']
+    # Posts spilled by the workers come back unchanged
+    assert posts[4] == _dump_to_dict(_submission(6, day=2))
+
+
+def test_several_dumps_are_filtered_by_date(dumps):
+    posts = iter_dump_posts(
+        dumps, subreddits=['SideProject', 'webdev'], workers=2,
+        since=datetime.date(2024, 1, 12), until=datetime.date(2024, 1, 14),
+    )
+
+    assert _ids(posts) == ['s4', 's6', 's8']
+
+
+def test_single_and_multi_file_paths_agree(dumps, tmp_path):
+    combined = _write_dump(tmp_path / 'RS_2024-01.zst', [
+        json.loads(line) for path in dumps
+        for line in zstandard.ZstdDecompressor().decompress(path.read_bytes()).splitlines()
+        if line.startswith(b'{"id"')
+    ])
+
+    single = list(iter_dump_posts([combined], subreddits=['SideProject'], workers=3, chunk_lines=1))
+    multi = list(iter_dump_posts(dumps, subreddits=['SideProject'], workers=3, chunk_lines=1))
+
+    assert single == multi
+    assert _ids(single) == ['s1', 's4', 's5', 's6']
+
+
+def test_old_dump_fields_are_coerced_and_defaulted():
+    post = _dump_to_dict({
+        'id': 12345,
+        'subreddit': 'SideProject',
+        'created_utc': "1704844800",
+        'title': None,
+        'author': None,
+        'score': "12.0",
+        'num_comments': "null",
+    })
+
+    assert post == {
+        'id': '12345',
+        'title': "",
+        'selftext': "",
+        'url': "https://www.reddit.com/r/SideProject/comments/12345/",
+        'author': "[deleted]",
+        'created_utc': 1704844800.0,
+        'subreddit': 'SideProject',
+        'score': 12,
+        'num_comments': 0,
+    }
+
+
+@pytest.mark.parametrize('submission', [
+    {'subreddit': 'SideProject', 'created_utc': 1704844800},
+    {'id': 'abc', 'subreddit': 'SideProject'},
+    {'id': 'abc', 'subreddit': 'SideProject', 'created_utc': "yesterday"},
+    {'id': 'abc', 'subreddit': 'SideProject', 'created_utc': None},
+])
+def test_unusable_submissions_are_skipped(submission):
+    assert _dump_to_dict(submission) is None
+
+
+@pytest.mark.parametrize('value, expected', [
+    (7, 7),
+    ("7", 7),
+    ("7.9", 7),
+    (3.5, 3),
+    (None, 0),
+    ("null", 0),
+    ("inf", 0),
+    ({}, 0),
+])
+def test_dump_numbers_are_coerced_to_int(value, expected):
+    assert _to_int(value) == expected
@@ -0,0 +1,376 @@
+"""
+Tests for the Reddit scraping service.
+
+Usage:
+    python -m pytest backend/tests/test_reddit_service.py
+"""
+
+import json
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.services import pinecone_service, reddit_service
+from backend.utils import helpers, http_fixtures
+from backend.utils.helpers import TokenBucketRateLimiter
+
+# Posts per listing page in the fixture tests, so a few dozen posts span several pages
+PAGE_SIZE = 10
+
+
+def _submission(post_id, title="A project", selftext="Details", removed_by_category=None):
+    return SimpleNamespace(id=post_id, title=title, selftext=selftext, removed_by_category=removed_by_category)
+
+
+def test_sweep_deletes_only_on_explicit_evidence(monkeypatch):
+    found = {
+        'live': _submission('live'),
+        'deleted': _submission('deleted', selftext='[deleted]'),
+        'removed': _submission('removed', removed_by_category='moderator'),
+    }
+    monkeypatch.setattr(reddit_service, '_iter_info_batches', lambda ids: iter([(list(ids), found)]))
+    deleted = []
+    monkeypatch.setattr(pinecone_service, 'delete_embeddings', deleted.extend)
+
+    stats = reddit_service.sweep_deleted_posts(['live', 'deleted', 'removed', 'private'])
+
+    assert sorted(deleted) == ['deleted', 'removed']
+    assert stats == {'checked': 4, 'deleted': 2, 'missing': 1}
+
+
+def test_sweep_keeps_posts_of_an_unreachable_subreddit(monkeypatch):
+    monkeypatch.setattr(reddit_service, '_iter_info_batches', lambda ids: iter([(list(ids), {})]))
+    deleted = []
+    monkeypatch.setattr(pinecone_service, 'delete_embeddings', deleted.extend)
+
+    stats = reddit_service.sweep_deleted_posts(['a', 'b'])
+
+    assert deleted == []
+    assert stats['missing'] == 2
+
+
+
+class FakeReddit:
+    """
+    Answers Reddit's OAuth and /r/<names>/new listing endpoints from in-memory posts.
+
+    Combined (multireddit) listings stop after `multireddit_depth` posts, like
+    Reddit's ~1000 item cap.
+    """
+
+    def __init__(self):
+        self.posts = []
+        self.multireddit_depth = None
+        self.online = True
+        self._next_id = 1000
+
+    def add(self, subreddit, count):
+        """Add `count` posts to a subreddit, each newer than every earlier post."""
+        for _ in range(count):
+            self._next_id += 1
+            post_id = _base36(self._next_id)
+            self.posts.append({
+                'id': post_id,
+                'name': f"t3_{post_id}",
+                'title': f"Project {post_id}",
+                'selftext': "I built a thing",
+                'permalink': f"/r/{subreddit}/comments/{post_id}/project/",
+                'author': 'maker',
+                'created_utc': 1746100800.0 + self._next_id * 60,
+                'subreddit': subreddit,
+                'score': 1,
+                'num_comments': 0,
+            })
+
+    def respond(self, request):
+        assert self.online, f"Replay went to the network: {request.method} {request.url}"
+        url = urlsplit(request.url)
+        if url.path.endswith('/api/v1/access_token'):
+            return _json_response(request, {
+                'access_token': 'token', 'token_type': 'bearer', 'expires_in': 86400, 'scope': '*',
+            })
+
+        names = {name.lower() for name in url.path.split('/')[2].split('+')}
+        params = parse_qs(url.query)
+        limit = int(params['limit'][0])
+        listing = sorted(
+            (post for post in self.posts if post['subreddit'].lower() in names),
+            key=lambda post: post['created_utc'], reverse=True,
+        )
+        if len(names) > 1 and self.multireddit_depth is not None:
+            listing = listing[:self.multireddit_depth]
+        start = 0
+        if 'after' in params:
+            start = next(i for i, post in enumerate(listing) if post['name'] == params['after'][0]) + 1
+        page = listing[start:start + limit]
+        after = page[-1]['name'] if page and start + limit < len(listing) else None
+        return _json_response(request, {'kind': 'Listing', 'data': {
+            'after': after, 'before': None, 'dist': len(page),
+            'children': [{'kind': 't3', 'data': post} for post in page],
+        }})
+
+
+def _base36(number):
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    text = ''
+    while number:
+        number, digit = divmod(number, 36)
+        text = digits[digit] + text
+    return text
+
+
+def _json_response(request, body):
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = 'OK'
+    response.headers['Content-Type'] = 'application/json'
+    response._content = json.dumps(body).encode('utf-8')
+    response.url = request.url
+    response.request = request
+    return response
+
+
+@pytest.fixture
+def reddit_fixtures(tmp_path, monkeypatch):
+    """
+    Run a scrape scenario against recorded HTTP fixtures.
+
+    run(scenario) records the scenario against a FakeReddit, then replays it from
+    the recorded fixtures with the network switched off, checks that both runs
+    returned the same and returns the replayed result with the Reddit URLs requested.
+    Each run gets its own empty state directory, and `sent` lists the URLs
+    requested so far in the current run.
+    """
+    fake = FakeReddit()
+    sent = []
+    record_send = http_fixtures.FixtureAdapter.send
+
+    def counting_send(self, request, **kwargs):
+        sent.append(request.url)
+        return record_send(self, request, **kwargs)
+
+    monkeypatch.setattr(http_fixtures.FixtureAdapter, 'send', counting_send)
+    monkeypatch.setattr(HTTPAdapter, 'send', lambda self, request, **kwargs: fake.respond(request))
+    monkeypatch.setattr(http_fixtures, 'HTTP_FIXTURE_DIR', tmp_path / 'fixtures')
+    monkeypatch.setattr(http_fixtures, 'HTTP_FIXTURE_LATENCY_SCALE', 0)
+    monkeypatch.setattr(reddit_service, 'REDDIT_CLIENT_ID', 'client-id')
+    monkeypatch.setattr(reddit_service, 'REDDIT_CLIENT_SECRET', 'client-secret')
+    monkeypatch.setattr(reddit_service, 'REDDIT_USER_AGENT', 'fixture-tests')
+    monkeypatch.setattr(reddit_service, 'REDDIT_ASYNC_BACKEND', False)
+    monkeypatch.setattr(reddit_service, 'LISTING_PAGE_SIZE', PAGE_SIZE)
+    monkeypatch.setattr(reddit_service, 'reddit_rate_limiter', TokenBucketRateLimiter(1e9, capacity=1e9))
+
+    def run(scenario):
+        results = []
+        posts, next_id = list(fake.posts), fake._next_id
+        for mode in ('record', 'replay'):
+            monkeypatch.setattr(helpers, 'HTTP_FIXTURE_MODE', mode)
+            monkeypatch.setattr(http_fixtures, 'HTTP_FIXTURE_MODE', mode)
+            monkeypatch.setattr(http_fixtures, '_stores', {})
+            reddit_service.reset_reddit_client()
+            # Posts the scenario adds get the same IDs in both runs
+            fake.posts, fake._next_id = list(posts), next_id
+            fake.online = mode == 'record'
+            sent.clear()
+            state_dir = tmp_path / mode
+            state_dir.mkdir()
+            result = scenario(state_dir)
+            results.append((result, [url for url in sent if 'access_token' not in url]))
+        assert any((tmp_path / 'fixtures').glob('oauth.reddit.com/*.json'))
+        assert results[0] == results[1]
+        return results[1]
+
+    yield SimpleNamespace(reddit=fake, run=run, sent=sent)
+    reddit_service.reset_reddit_client()
+
+
+def _listing(url):
+    """Return the listing name and `after` cursor of a listing request URL."""
+    parts = urlsplit(url)
+    return parts.path.split('/')[2], parse_qs(parts.query).get('after', [None])[0]
+
+
+def test_one_combined_listing_is_paginated_and_split_by_subreddit(reddit_fixtures):
+    reddit_fixtures.reddit.add('SideProject', 8)
+    reddit_fixtures.reddit.add('webdev', 12)
+    reddit_fixtures.reddit.add('SideProject', 7)
+
+    posts, urls = reddit_fixtures.run(
+        lambda state: reddit_service.scrape_subreddits(['SideProject', 'webdev'], limit=12)
+    )
+
+    listings = [_listing(url) for url in urls]
+    assert [name for name, _ in listings] == ['SideProject+webdev'] * 3
+    assert listings[0][1] is None
+    # Each page continues after the last post of the previous one
+    assert listings[1][1] == f"t3_{posts[9]['id']}"
+    assert len(posts) == 24
+    assert sum(post['subreddit'] == 'webdev' for post in posts) == 12
+    assert [post['created_utc'] for post in posts] == sorted((post['created_utc'] for post in posts), reverse=True)
+    assert posts[0]['url'] == f"https://www.reddit.com/r/SideProject/comments/{posts[0]['id']}/project/"
+
+
+def test_paging_stops_once_every_subreddit_is_full(reddit_fixtures):
+    reddit_fixtures.reddit.add('SideProject', 30)
+    reddit_fixtures.reddit.add('webdev', 30)
+
+    posts, urls = reddit_fixtures.run(
+        lambda state: reddit_service.scrape_subreddits(['SideProject', 'webdev'], limit=5)
+    )
+
+    # The newest page holds ten webdev posts; SideProject needs a second page
+    assert len(urls) == 4
+    assert sum(post['subreddit'] == 'SideProject' for post in posts) == 5
+    assert sum(post['subreddit'] == 'webdev' for post in posts) == 5
+
+
+def test_subreddits_left_short_by_the_listing_cap_are_topped_up(reddit_fixtures):
+    reddit_fixtures.reddit.add('webdev', 8)
+    reddit_fixtures.reddit.add('SideProject', 30)
+    reddit_fixtures.reddit.multireddit_depth = 10
+
+    posts, urls = reddit_fixtures.run(
+        lambda state: reddit_service.scrape_subreddits(['SideProject', 'webdev'], limit=12)
+    )
+
+    listings = [_listing(url) for url in urls]
+    assert listings[0] == ('SideProject+webdev', None)
+    # SideProject continues after the oldest post the combined listing returned
+    oldest_side_project = [post for post in posts if post['subreddit'] == 'SideProject'][9]
+    assert ('SideProject', f"t3_{oldest_side_project['id']}") in listings
+    assert ('webdev', None) in listings
+    assert sum(post['subreddit'] == 'SideProject' for post in posts) == 12
+    assert sum(post['subreddit'] == 'webdev' for post in posts) == 8
+
+
+def test_streaming_scrape_yields_each_page_as_it_arrives(reddit_fixtures):
+    reddit_fixtures.reddit.add('SideProject', 25)
+
+    def scenario(state):
+        posts = reddit_service.scrape_subreddits(['SideProject'], limit=25, stream=True)
+        first = next(posts)
+        listing_requests = sum('access_token' not in url for url in reddit_fixtures.sent)
+        return first, listing_requests, [first] + list(posts)
+
+    (first, listing_requests, streamed), urls = reddit_fixtures.run(scenario)
+
+    assert listing_requests == 1
+    assert len(urls) == 3
+    assert first == streamed[0]
+    assert [post['id'] for post in streamed] == [post['id'] for post in reversed(reddit_fixtures.reddit.posts)]
+
+
+def test_streaming_scrape_feeds_process_posts_lazily(reddit_fixtures, monkeypatch):
+    monkeypatch.setattr(reddit_service, 'CLEAN_BATCH_SIZE', 5)
+    reddit_fixtures.reddit.add('SideProject', 25)
+
+    def scenario(state):
+        raw = reddit_service.scrape_subreddits(['SideProject'], limit=25, stream=True)
+        processed = reddit_service.process_posts(raw, stream=True)
+        first = next(processed)
+        listing_requests = sum('access_token' not in url for url in reddit_fixtures.sent)
+        return first['id'], listing_requests, 1 + sum(1 for _ in processed)
+
+    (first_id, listing_requests, total), urls = reddit_fixtures.run(scenario)
+
+    assert listing_requests == 1
+    assert total == 25
+
+
+def test_streaming_scrape_validates_arguments_immediately():
+    with pytest.raises(ValueError):
+        reddit_service.scrape_subreddits(['not a subreddit!'], stream=True)
+    with pytest.raises(ValueError):
+        reddit_service.scrape_subreddits(['SideProject'], limit=0, stream=True)
+
+
+def test_incremental_scrape_stops_at_the_high_water_marks(reddit_fixtures):
+    reddit_fixtures.reddit.add('webdev', 5)
+    reddit_fixtures.reddit.add('SideProject', 10)
+
+    def scenario(state):
+        path = state / 'cursors.json'
+        store = reddit_service.ScrapeCursorStore(path)
+        first = reddit_service.scrape_subreddits(['SideProject', 'webdev'], limit=50, cursor_store=store)
+        store.commit()
+
+        reddit_fixtures.reddit.add('SideProject', 3)
+        before = len(reddit_fixtures.sent)
+        store = reddit_service.ScrapeCursorStore(path)
+        second = reddit_service.scrape_subreddits(['SideProject', 'webdev'], limit=50, cursor_store=store)
+        second_urls = reddit_fixtures.sent[before:]
+        # A refresh that fails after scraping discards its marks and gets the same posts again
+        store.discard()
+        third = reddit_service.scrape_subreddits(
+            ['SideProject', 'webdev'], limit=50, cursor_store=reddit_service.ScrapeCursorStore(path)
+        )
+        return len(first), [post['id'] for post in second], second_urls, [post['id'] for post in third]
+
+    (first_count, second_ids, second_urls, third_ids), _ = reddit_fixtures.run(scenario)
+
+    new_ids = [post['id'] for post in reversed(reddit_fixtures.reddit.posts[-3:])]
+    assert first_count == 15
+    assert second_ids == new_ids
+    assert third_ids == new_ids
+    # Both subreddits reach their marks within the combined listing, so nothing is topped up
+    assert [_listing(url)[0] for url in second_urls] == ['SideProject+webdev'] * 2
+
+
+def test_cursor_store_persists_only_on_commit(tmp_path):
+    path = tmp_path / 'cursors.json'
+    store = reddit_service.ScrapeCursorStore(path)
+    store.advance('SideProject', 100.0, 'abc')
+
+    assert not path.exists()
+    assert not store.is_seen('SideProject', 100.0, 'abc')
+
+    store.commit()
+    reloaded = reddit_service.ScrapeCursorStore(path)
+    assert reloaded.get('sideproject') == {'created_utc': 100.0, 'fullname': 't3_abc'}
+    assert reloaded.is_seen('SideProject', 100.0, 'abc')
+    assert reloaded.is_seen('SideProject', 99.0, 'zzz')
+    assert not reloaded.is_seen('SideProject', 100.0, 'abd')
+
+
+def test_cursor_store_discard_and_forward_only_marks(tmp_path):
+    path = tmp_path / 'cursors.json'
+    store = reddit_service.ScrapeCursorStore(path)
+    store.advance('webdev', 200.0, 'b')
+    store.commit()
+
+    store.advance('webdev', 300.0, 'c')
+    store.discard()
+    store.advance('webdev', 150.0, 'a')  # Older than the committed mark
+    store.commit()
+
+    assert reddit_service.ScrapeCursorStore(path).get('webdev')['fullname'] == 't3_b'
+
+
+def test_cursor_store_commit_is_atomic(tmp_path, monkeypatch):
+    path = tmp_path / 'cursors.json'
+    store = reddit_service.ScrapeCursorStore(path)
+    store.advance('webdev', 200.0, 'b')
+    store.commit()
+    committed = path.read_text()
+
+    def failing_dump(data, f, **kwargs):
+        f.write('{"webdev": ')
+        raise OSError("disk full")
+
+    store.advance('webdev', 300.0, 'c')
+    monkeypatch.setattr(reddit_service.json, 'dump', failing_dump)
+    with pytest.raises(OSError):
+        store.commit()
+
+    assert path.read_text() == committed
+    assert [p.name for p in tmp_path.iterdir()] == ['cursors.json']
+
+
+def test_unreadable_cursor_file_starts_empty(tmp_path):
+    path = tmp_path / 'cursors.json'
+    path.write_text('{"webdev": ')
+
+    assert reddit_service.ScrapeCursorStore(path).get('webdev') is None
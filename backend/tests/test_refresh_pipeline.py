@@ -0,0 +1,253 @@
+"""
+Tests for the concurrent refresh pipeline.
+
+Usage:
+    python -m pytest backend/tests/test_refresh_pipeline.py
+"""
+
+import threading
+import time
+
+import pytest
+
+from backend.services import refresh_pipeline
+from backend.services.dedup_service import SignatureStore
+from backend.services.job_journal import JobJournal
+from backend.services.refresh_pipeline import Pipeline
+
+
+def test_single_worker_stages_keep_source_order():
+    pipeline = (
+        Pipeline(queue_size=4, linger=0.01)
+        .add_stage('double', lambda batch: [x * 2 for x in batch], batch_size=3)
+        .add_stage('collect', lambda batch: batch, batch_size=5)
+    )
+    seen = []
+    pipeline.add_stage('sink', lambda batch: seen.extend(batch) or batch)
+
+    stats = pipeline.run(range(20))
+
+    assert seen == [x * 2 for x in range(20)]
+    assert stats['source'] == 20
+    assert (stats['stages']['double']['in'], stats['stages']['double']['out']) == (20, 20)
+
+
+def test_stages_may_drop_and_expand_items():
+    pipeline = (
+        Pipeline(linger=0.01)
+        .add_stage('evens', lambda batch: [x for x in batch if x % 2 == 0], batch_size=4)
+        .add_stage('pairs', lambda batch: [y for x in batch for y in (x, x)], workers=3)
+    )
+
+    stats = pipeline.run(range(10))
+
+    assert stats['stages']['evens']['out'] == 5
+    assert stats['stages']['pairs']['out'] == 10
+
+
+def test_failing_stage_aborts_the_run():
+    consumed = []
+
+    def source():
+        for item in range(10_000):
+            consumed.append(item)
+            yield item
+
+    def explode(batch):
+        if 3 in batch:
+            raise RuntimeError("stage failed")
+        return batch
+
+    pipeline = Pipeline(queue_size=2, linger=0.01).add_stage('explode', explode).add_stage('sink', lambda b: b)
+
+    with pytest.raises(RuntimeError, match="stage failed"):
+        pipeline.run(source())
+    # The source stops being read soon after the failure
+    assert len(consumed) < 100
+
+
+def test_failing_source_aborts_the_run():
+    def source():
+        yield 1
+        raise ValueError("scrape failed")
+
+    pipeline = Pipeline(linger=0.01).add_stage('sink', lambda batch: batch)
+
+    with pytest.raises(ValueError, match="scrape failed"):
+        pipeline.run(source())
+
+
+def test_bounded_queues_hold_back_the_source():
+    release = threading.Event()
+    produced = []
+
+    def source():
+        for item in range(100):
+            produced.append(item)
+            yield item
+
+    def blocked(batch):
+        release.wait(5)
+        return batch
+
+    pipeline = Pipeline(queue_size=2, linger=0).add_stage('blocked', blocked)
+    runner = threading.Thread(target=pipeline.run, args=(source(),))
+    runner.start()
+    time.sleep(0.3)
+
+    # One batch in the worker, two items queued and one waiting to be put
+    assert len(produced) <= 4
+    release.set()
+    runner.join(5)
+    assert len(produced) == 100
+
+
+def test_pipeline_without_stages_is_rejected():
+    with pytest.raises(ValueError):
+        Pipeline().run([1])
+
+
+class _FakeCursorStore:
+    def __init__(self):
+        self.committed = False
+        self.discarded = False
+
+    def commit(self):
+        self.committed = True
+
+    def discard(self):
+        self.discarded = True
+
+
+class _FakeArchive:
+    def __init__(self):
+        self.posts = []
+
+    def append(self, posts):
+        self.posts.extend(posts)
+
+
+def _raw_post(number):
+    return {
+        'id': f"p{number}",
+        'subreddit': 'SideProject',
+        'created_utc': 1746100800.0 + number,
+        'content': f"Post {number}: I built a tool that tracks habit streaks number {number} "
+                   f"with reminders, charts, exports and sharing for friends {number}",
+    }
+
+
+@pytest.fixture
+def fake_services(monkeypatch):
+    """Replace every external call of the refresh pipeline with an in-memory fake."""
+    services = {'scraped': [], 'enriched': [], 'embed_attempts': [], 'upserted': [], 'fail_embed': None}
+
+    monkeypatch.setattr(
+        refresh_pipeline, 'scrape_subreddits', lambda subreddits, stream, cursor_store: iter(services['scraped'])
+    )
+    monkeypatch.setattr(refresh_pipeline, 'process_posts', lambda posts, **kwargs: [dict(p) for p in posts])
+
+    def enrich(posts):
+        services['enriched'].extend(p['id'] for p in posts)
+        return [{'enriched': True} for _ in posts]
+
+    def embed(posts):
+        services['embed_attempts'].append([p['id'] for p in posts])
+        if services['fail_embed'] and services['fail_embed'](posts):
+            raise RuntimeError("embedding backend down")
+        return [[0.0] for _ in posts]
+
+    monkeypatch.setattr(refresh_pipeline, 'extract_metadata', enrich)
+    monkeypatch.setattr(refresh_pipeline, 'batch_process_embeddings', embed)
+    monkeypatch.setattr(
+        refresh_pipeline, 'store_embeddings', lambda embeddings, posts: services['upserted'].extend(p['id'] for p in posts)
+    )
+    return services
+
+
+def test_new_posts_are_looked_up_in_the_journal_in_batches(fake_services, tmp_path, monkeypatch):
+    fake_services['scraped'] = [_raw_post(n) for n in range(250)]
+    journal = JobJournal(tmp_path / 'journal.db')
+    journal.record('upserted', [_raw_post(0)])
+    lookups = []
+    original = journal.stages
+
+    def stages(post_ids):
+        post_ids = list(post_ids)
+        lookups.append((threading.current_thread().name, post_ids))
+        return original(post_ids)
+
+    monkeypatch.setattr(journal, 'stages', stages)
+    archive = _FakeArchive()
+
+    summary = refresh_pipeline.run_refresh_pipeline(
+        cursor_store=_FakeCursorStore(), journal=journal, archive=archive,
+        signatures=SignatureStore(tmp_path / 'signatures.db'),
+    )
+
+    # The source runs in the calling thread, the stages in pipeline worker threads
+    source_lookups = [ids for thread, ids in lookups if not thread.startswith('pipeline-')]
+    assert [len(ids) for ids in source_lookups] == [100, 100, 50]
+    assert summary['scraped'] == 249
+    assert len(archive.posts) == 249
+    assert sorted(fake_services['upserted']) == sorted(f"p{n}" for n in range(1, 250))
+
+
+def test_failed_run_is_resumed_without_repeating_finished_work(fake_services, tmp_path, monkeypatch):
+    # Small batches on one worker, so the run fails after several embedding batches succeeded
+    monkeypatch.setattr(refresh_pipeline, 'EMBEDDING_BATCH_SIZE', 5)
+    monkeypatch.setattr(refresh_pipeline, 'PIPELINE_EMBED_WORKERS', 1)
+    posts = [_raw_post(n) for n in range(30)]
+    fake_services['scraped'] = posts
+    fake_services['fail_embed'] = lambda batch: any(p['id'] == 'p20' for p in batch)
+    journal = JobJournal(tmp_path / 'journal.db')
+    signatures = SignatureStore(tmp_path / 'signatures.db')
+    cursors = _FakeCursorStore()
+
+    with pytest.raises(RuntimeError, match="embedding backend down"):
+        refresh_pipeline.run_refresh_pipeline(
+            cursor_store=cursors, journal=journal, archive=_FakeArchive(), signatures=signatures
+        )
+    assert cursors.discarded and not cursors.committed
+    failed_batch = set(next(batch for batch in fake_services['embed_attempts'] if 'p20' in batch))
+    stored_first = len(fake_services['upserted'])
+    assert len(fake_services['embed_attempts']) > 1
+
+    # The scrape cursors were discarded, so the next run scrapes the same posts again
+    fake_services['fail_embed'] = None
+    cursors = _FakeCursorStore()
+    summary = refresh_pipeline.run_refresh_pipeline(
+        cursor_store=cursors, journal=journal, archive=_FakeArchive(), signatures=signatures
+    )
+
+    assert cursors.committed
+    assert summary['scraped'] == 0
+    assert summary['resumed'] == 30 - stored_first
+    # Every post is labelled and stored exactly once over both runs
+    assert sorted(fake_services['enriched']) == sorted(p['id'] for p in posts)
+    assert sorted(fake_services['upserted']) == sorted(p['id'] for p in posts)
+    # Only the batch that was in flight when the run failed is embedded again
+    attempts = [post_id for batch in fake_services['embed_attempts'] for post_id in batch]
+    repeated = {post_id for post_id in attempts if attempts.count(post_id) > 1}
+    assert repeated <= failed_batch
+    assert 'p20' in repeated
+
+
+def test_reposts_of_earlier_runs_are_dropped(fake_services, tmp_path):
+    journal = JobJournal(tmp_path / 'journal.db')
+    signatures = SignatureStore(tmp_path / 'signatures.db')
+    original = _raw_post(1)
+    fake_services['scraped'] = [original]
+    refresh_pipeline.run_refresh_pipeline(
+        cursor_store=_FakeCursorStore(), journal=journal, archive=_FakeArchive(), signatures=signatures
+    )
+
+    repost = dict(original, id='repost', subreddit='webdev', content=original['content'] + "!")
+    fake_services['scraped'] = [repost, _raw_post(2)]
+    summary = refresh_pipeline.run_refresh_pipeline(
+        cursor_store=_FakeCursorStore(), journal=journal, archive=_FakeArchive(), signatures=signatures
+    )
+
+    assert summary['scraped'] == 2
+    assert fake_services['upserted'] == ['p1', 'p2']
+    assert journal.stages(['repost']) == {'repost': 'skipped'}
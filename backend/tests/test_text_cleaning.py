@@ -0,0 +1,49 @@
+"""
+Tests for the text cleaning engine.
+
+Usage:
+    python -m pytest backend/tests/test_text_cleaning.py
+"""
+
+import pytest
+
+from backend.utils import text_cleaning
+from backend.utils.text_cleaning import clean_text, clean_texts
+
+
+@pytest.mark.parametrize('raw, cleaned', [
+    ("Plain prose stays as it is.", "Plain prose stays as it is."),
+    ("Before\n```python\nprint('hi')\n```\nafter", "Before after"),
+    ("Made with [Next.js](https://nextjs.org) and ![logo](https://i.redd.it/x.png)", "Made with Next.js and logo"),
+    ("Demo at https://example.com/demo?x=1 or www.example.com today", "Demo at or today"),
+    ("Run `npm start` first", "Run npm start first"),
+    ("## My project\n> quoted\n- one\n* two\n+ three\n1. four", "My project quoted one two three four"),
+    ("# Title only", "Title only"),
+    ("**bold**, *italic*, ***both*** and ~~gone~~", "bold, italic, both and gone"),
+    ("Price is 2 * 3 * 4 dollars", "Price is 2 * 3 * 4 dollars"),
+    ("#hashtag and 2024 was great", "#hashtag and 2024 was great"),
+    ("  lots \t of\n\n  space  ", "lots of space"),
+    ("", ""),
+])
+def test_cleaning_rules(raw, cleaned):
+    assert clean_text(raw) == cleaned
+
+
+def test_clean_texts_keeps_order_and_cleans_repeats_once(monkeypatch):
+    calls = []
+
+    def spy(text):
+        calls.append(text)
+        return text.upper()
+
+    monkeypatch.setattr(text_cleaning, 'clean_text', spy)
+
+    results = clean_texts(["b", "a", None, "b", "", "a"])
+
+    assert results == ["B", "A", "", "B", "", "A"]
+    assert calls == ["b", "a", ""]
+
+
+def test_clean_texts_matches_clean_text():
+    texts = ["# Hello *world*", "See https://example.com `now`", "# Hello *world*"]
+    assert clean_texts(texts) == [clean_text(text) for text in texts]
@@ -0,0 +1,678 @@
+"""
+Helper Utilities for Vibe Coding Project Finder
+
+This module contains small, service-independent building blocks that are shared by
+the services package.
+
+Usage:
+    from utils.helpers import TokenBucketRateLimiter, create_http_session
+
+    # Allow 60 requests per minute with bursts of up to 5 requests
+    limiter = TokenBucketRateLimiter(60, capacity=5)
+    limiter.acquire()  # Blocks until a request may be sent
+
+    # HTTP session with connection pooling and retries for transient errors
+    session = create_http_session()
+
+    # Run a job in at most one process at a time
+    with LeaseLock('reddit_refresh', 'locks.sqlite3').hold() as acquired:
+        if acquired:
+            ...
+
+    # Coalesce concurrent single-item calls into batched calls
+    batcher = MicroBatcher(embed_texts, max_batch_size=32, max_wait_ms=5)
+    vector = batcher.submit("weekend project ideas")  # From many threads at once
+
+    # Remember recent results, computing each missing one only once at a time
+    cache, flights = TTLCache(1024, ttl_seconds=3600), SingleFlight()
+    vector = cache.get(key)
+    if vector is None:
+        vector = flights.do(key, lambda: compute(key))
+        cache.set(key, vector)
+"""
+
+import asyncio  # For non-blocking waits in async callers
+import contextlib  # For the lease lock context manager
+import queue  # For handing items to the micro-batching workers
+import logging  # For logging rate limit adjustments
+import os  # For identifying lease owners
+import socket  # For identifying lease owners across hosts
+import sqlite3  # For lease rows shared between processes
+import threading  # For guarding shared state across threads
+import time  # For the monotonic clock and blocking waits
+import uuid  # For unique lease owner IDs
+import weakref  # For tracking the objects to reset in forked children
+from collections import OrderedDict  # For least-recently-used ordering
+from pathlib import Path  # For cross-platform file paths
+from concurrent.futures import Future  # For handing batched results back to callers
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Mapping, Optional, Tuple, Union  # Type hints for better code documentation
+
+import requests  # HTTP client used by the API services
+from requests.adapters import HTTPAdapter  # Connection pooling per host
+from urllib3.util.retry import Retry  # Retry policy for transient HTTP errors
+
+from ..config import HTTP_FIXTURE_MODE  # Whether HTTP traffic is recorded or replayed
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# HTTP statuses create_http_session retries: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread- and asyncio-safe token bucket rate limiter.
+
+    The bucket refills at `rate_per_minute` tokens per minute and holds at most
+    `capacity` tokens, so callers sharing one limiter never exceed the configured
+    rate by more than `capacity` requests, no matter how many threads or coroutines
+    send requests concurrently.
+
+    Tokens are reserved up front: a caller that finds the bucket empty takes its
+    token on credit and is told how long to wait for it. Waiting therefore happens
+    outside the lock, in a blocking sleep for acquire() or an asyncio sleep for
+    acquire_async(), and callers are served in the order they arrived.
+
+    The limiter can also follow the server's own view of the quota. After
+    update_from_headers() sees X-Ratelimit-Remaining / X-Ratelimit-Reset headers,
+    the refill rate is lowered to spread the remaining requests evenly over the
+    rest of the server's window (never raised above the configured rate).
+
+    Example:
+        >>> limiter = TokenBucketRateLimiter(60, capacity=5)
+        >>> limiter.acquire()
+        >>> response = session.get(url)
+        >>> limiter.update_from_headers(response.headers)
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None, name: str = 'rate limiter'):
+        """
+        Create a full token bucket.
+
+        Args:
+            rate_per_minute (float): Sustained number of requests allowed per minute
+            capacity (float, optional): Maximum burst size. Defaults to 1, which
+                spaces requests evenly.
+            name (str, optional): Name used in log messages
+
+        Raises:
+            ValueError: If the rate or capacity is not positive
+        """
+        if rate_per_minute <= 0:
+            raise ValueError(f"rate_per_minute must be positive, got {rate_per_minute}")
+        capacity = 1 if capacity is None else capacity
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+
+        self.name = name
+        self.rate = rate_per_minute / 60.0  # Tokens per second
+        self.capacity = float(capacity)
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        # Server-imposed rate, valid until the server's window resets
+        self._server_rate: Optional[float] = None
+        self._server_reset_at: Optional[float] = None
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens from the bucket, blocking the current thread until they are available.
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: Number of seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """
+        Take tokens from the bucket, yielding to the event loop until they are available.
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: Number of seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Adjust the limiter to the quota reported by the server.
+
+        Understands the X-Ratelimit-Remaining (requests left in the current window)
+        and X-Ratelimit-Reset (seconds until the window resets) headers sent by
+        Reddit. Responses without them are ignored.
+
+        Args:
+            headers (Mapping): Response headers; names are matched case-insensitively
+        """
+        lowered = {key.lower(): value for key, value in headers.items()}
+        try:
+            remaining = float(lowered['x-ratelimit-remaining'])
+            reset = float(lowered['x-ratelimit-reset'])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            remaining = max(remaining, 0.0)
+            reset = max(reset, 0.001)
+            self._server_rate = remaining / reset
+            self._server_reset_at = now + reset
+            # Never hold more tokens than the server says are left in this window
+            self._tokens = min(self._tokens, remaining)
+
+        if remaining == 0:
+            logger.warning(f"{self.name}: server quota exhausted, pausing for {reset:.1f}s")
+
+    def _reserve(self, tokens: float) -> float:
+        """
+        Take tokens, going into debt if necessary.
+
+        Args:
+            tokens (float): Number of tokens to take
+
+        Returns:
+            float: Seconds the caller must wait before its tokens are paid for
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return self._seconds_until_refilled(-self._tokens, now)
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last update; must be called with the lock held."""
+        start = self._updated
+        if self._server_reset_at is not None:
+            # Time inside the server's window refills at the (possibly lower) server rate
+            window_end = min(now, self._server_reset_at)
+            if window_end > start:
+                self._tokens += (window_end - start) * min(self.rate, self._server_rate)
+                start = window_end
+            if now >= self._server_reset_at:
+                self._server_rate = None
+                self._server_reset_at = None
+        if now > start:
+            self._tokens += (now - start) * self.rate
+        self._tokens = min(self._tokens, self.capacity)
+        self._updated = now
+
+    def _seconds_until_refilled(self, deficit: float, now: float) -> float:
+        """Return how long the bucket takes to earn `deficit` tokens; lock must be held."""
+        wait = 0.0
+        if self._server_reset_at is not None:
+            window_rate = min(self.rate, self._server_rate)
+            window_left = self._server_reset_at - now
+            if window_rate * window_left >= deficit:
+                return deficit / window_rate
+            deficit -= window_rate * window_left
+            wait = window_left
+        return wait + deficit / self.rate
+
+
+def create_http_session(
+    retries: int = 3, backoff_factor: float = 0.5, pool_maxsize: int = 10, retry_on_status: bool = True
+) -> requests.Session:
+    """
+    Create a requests session with connection pooling and retries.
+
+    Requests that fail with a connection error, HTTP 429 or a 5xx status are retried
+    with exponential backoff (honoring Retry-After), so services can share one
+    session per API without writing their own retry loops.
+
+    When HTTP_FIXTURE_MODE is set, the session records its responses to, or
+    replays them from, HTTP_FIXTURE_DIR (see utils.http_fixtures).
+
+    Args:
+        retries (int, optional): Maximum retries per request. Defaults to 3.
+        backoff_factor (float, optional): Base delay in seconds for exponential backoff.
+            Defaults to 0.5.
+        pool_maxsize (int, optional): Connections kept open per host. Defaults to 10.
+        retry_on_status (bool, optional): Retry 429 and 5xx responses. Set to False for
+            clients that back off on these statuses themselves (e.g., PRAW): the
+            response is then returned to them as is, never raised as a RetryError.
+            Defaults to True.
+
+    Returns:
+        requests.Session: Configured session
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES if retry_on_status else (),
+        raise_on_status=retry_on_status,
+        allowed_methods=None,  # API calls here are idempotent upserts/queries, so retry POST too
+        respect_retry_after_header=True,
+    )
+    # Imported here so modules that only need the other helpers do not load it
+    from .http_fixtures import FixtureAdapter, fixtures_enabled
+    
+    if fixtures_enabled():
+        adapter = FixtureAdapter(HTTP_FIXTURE_MODE, max_retries=retry, pool_maxsize=pool_maxsize)
+    else:
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=pool_maxsize)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class LeaseLock:
+    """
+    Named lock shared by all processes that use the same SQLite file.
+
+    The holder owns a row with an expiry time. Other processes cannot acquire
+    the lock until the holder releases it or the lease expires, so a crashed
+    holder blocks others for at most `ttl` seconds. Long-running holders keep
+    their lease alive with renew(), or use hold(), which renews in a background
+    thread.
+
+    All processes must see the same file, so replicas on different hosts need
+    the lock file on a shared volume (with working file locking; SQLite is
+    unreliable on network file systems).
+
+    Example:
+        >>> lock = LeaseLock('reddit_refresh', '/var/lib/app/locks.sqlite3', ttl=600)
+        >>> with lock.hold() as acquired:
+        ...     if acquired:
+        ...         refresh_posts()
+    """
+
+    def __init__(self, name: str, path: Union[str, Path], ttl: float = 600):
+        """
+        Args:
+            name (str): Lock name; processes using the same name exclude each other
+            path (str or Path): SQLite file holding the leases
+            ttl (float, optional): Seconds a lease lasts without renewal. Defaults to 600.
+        """
+        self.name = name
+        self.path = Path(path)
+        self.ttl = ttl
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def acquire(self) -> bool:
+        """
+        Take the lock if it is free, expired or already ours.
+
+        Returns:
+            bool: True if this instance now holds the lease
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (self.name,)).fetchone()
+            if row is not None and row[0] != self.owner and row[1] > now:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                (self.name, self.owner, now + self.ttl),
+            )
+        return True
+
+    def renew(self) -> bool:
+        """
+        Extend our lease by `ttl` seconds from now.
+
+        Returns:
+            bool: False if the lease was lost (it expired and another process took it)
+        """
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE leases SET expires_at = ? WHERE name = ? AND owner = ?",
+                (time.time() + self.ttl, self.name, self.owner),
+            ).rowcount
+        return updated == 1
+
+    def release(self) -> None:
+        """Give the lock up if we hold it."""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (self.name, self.owner))
+
+    def holder(self) -> Optional[str]:
+        """
+        Return the owner of the current, unexpired lease.
+
+        Returns:
+            str: Owner ID ('host:pid:random'), or None if the lock is free
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (self.name,)).fetchone()
+        return row[0] if row is not None and row[1] > time.time() else None
+
+    @contextlib.contextmanager
+    def hold(self) -> Iterator[bool]:
+        """
+        Try to take the lock for the duration of a `with` block.
+
+        Does not wait: if another process holds the lock, the block runs with
+        False. While the block runs, the lease is renewed every ttl / 3 seconds.
+
+        Yields:
+            bool: Whether the lock was acquired
+        """
+        if not self.acquire():
+            yield False
+            return
+
+        stop = threading.Event()
+
+        def heartbeat():
+            while not stop.wait(self.ttl / 3):
+                try:
+                    if not self.renew():
+                        logger.warning(f"Lost lease {self.name}; another process may now run concurrently")
+                        return
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to renew lease {self.name}: {str(e)}")
+
+        thread = threading.Thread(target=heartbeat, name=f"lease-{self.name}", daemon=True)
+        thread.start()
+        try:
+            yield True
+        finally:
+            stop.set()
+            thread.join()
+            self.release()
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Open the lease database in an immediate (write-locked) transaction."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-item calls into batched calls.
+
+    Many threads calling submit() at nearly the same time (e.g., concurrent search
+    requests each embedding one query) are served by a single call of the batch
+    function instead of one call each. A worker thread takes the first waiting
+    item, keeps collecting until `max_batch_size` items are waiting or
+    `max_wait_ms` has passed since that first item, runs the batch, and hands each
+    caller its own result. A caller therefore waits at most `max_wait_ms` longer
+    than the batch call itself takes.
+
+    If the batch function raises, every caller in that batch gets the exception.
+
+    A process forked from one that used the batcher gets a fresh queue and starts
+    its own workers on first use; the parent's threads do not exist in the child.
+
+    Example:
+        >>> batcher = MicroBatcher(lambda texts: [len(text) for text in texts], max_wait_ms=5)
+        >>> batcher.submit("hello")  # Batched with other threads' concurrent calls
+        5
+    """
+
+    def __init__(
+        self,
+        func: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5,
+        workers: int = 1,
+        name: str = 'micro-batcher',
+    ):
+        """
+        Args:
+            func (callable): Batch function; takes a list of items and returns one
+                result per item, in the same order
+            max_batch_size (int, optional): Most items per batch call. Defaults to 32.
+            max_wait_ms (float, optional): Longest time the first item of a batch waits
+                for more items. Defaults to 5.
+            workers (int, optional): Batch calls that may run at the same time. Defaults to 1.
+            name (str, optional): Name used for the worker threads and in logs
+        """
+        self.func = func
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.workers = max(1, workers)
+        self.name = name
+        self._queue: 'queue.Queue[Tuple[Any, Future]]' = queue.Queue()
+        self._started = False
+        self._start_lock = threading.Lock()
+        _fork_sensitive.add(self)
+
+    def submit(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Process one item as part of the next batch and return its result.
+
+        Args:
+            item: Item to process
+            timeout (float, optional): Seconds to wait for the result. Defaults to no limit.
+
+        Returns:
+            The batch function's result for this item
+
+        Raises:
+            concurrent.futures.TimeoutError: If the result is not ready in time
+            Exception: Whatever the batch function raised for this item's batch
+        """
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future.result(timeout)
+
+    def _ensure_started(self) -> None:
+        """Start the worker threads on first use."""
+        if self._started:
+            return
+        with self._start_lock:
+            if not self._started:
+                for number in range(self.workers):
+                    threading.Thread(target=self._work, name=f"{self.name}-{number}", daemon=True).start()
+                self._started = True
+
+    def _work(self) -> None:
+        """Worker loop: collect a batch, run it, deliver the results."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._run(batch)
+
+    def _run(self, batch: List[Tuple[Any, Future]]) -> None:
+        """Call the batch function and resolve the callers' futures."""
+        try:
+            results = self.func([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"{self.name}: batch function returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _reset_after_fork(self) -> None:
+        """Forget the parent's workers and queued items; the child starts its own."""
+        self._queue = queue.Queue()
+        self._started = False
+        self._start_lock = threading.Lock()
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory cache with least-recently-used eviction and expiry.
+
+    Holds at most `max_entries` values; adding one more evicts the least recently
+    used. Values older than `ttl_seconds` are treated as missing.
+
+    Example:
+        >>> cache = TTLCache(1024, ttl_seconds=3600)
+        >>> cache.set('weekend project', [0.1, 0.2])
+        >>> cache.get('weekend project')
+        [0.1, 0.2]
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            max_entries (int): Maximum number of cached values
+            ttl_seconds (float, optional): Lifetime of a value. Defaults to no expiry.
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        _fork_sensitive.add(self)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return a cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The value, or None if it is missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used one if the cache is full.
+
+        Args:
+            key: Cache key
+            value: Value to cache (None cannot be told apart from a miss)
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report the cache's size and hit rate.
+
+        Returns:
+            dict: 'entries', 'hits', 'misses' and 'hit_rate'
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    def _reset_after_fork(self) -> None:
+        """Replace the lock, which another parent thread may have held at fork time."""
+        self._lock = threading.Lock()
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent computations of the same key.
+
+    The first caller for a key runs the computation; callers that ask for the
+    same key while it is still running wait for and share its result (or its
+    exception) instead of starting their own. Nothing is remembered afterwards,
+    so pair it with a cache.
+
+    Example:
+        >>> flights = SingleFlight()
+        >>> flights.do('weekend project', lambda: embed_query('weekend project'))
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        _fork_sensitive.add(self)
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Run `func` for a key, or join the run already in progress.
+
+        Args:
+            key: Identifies the computation
+            func (callable): Computes the result; called at most once per flight
+
+        Returns:
+            The result of the (shared) computation
+
+        Raises:
+            Exception: Whatever the shared computation raised
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(func())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+    def _reset_after_fork(self) -> None:
+        """Forget flights led by parent threads, which never finish in the child."""
+        self._calls = {}
+        self._lock = threading.Lock()
+
+
+# Objects holding threads, locks or in-flight work that a forked child must not inherit
+_fork_sensitive: 'weakref.WeakSet[Any]' = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    """Reset every fork-sensitive object in a freshly forked child."""
+    for instance in list(_fork_sensitive):
+        instance._reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,361 @@
+"""
+HTTP Record/Replay Fixtures for Vibe Coding Project Finder
+
+Benchmarking or load-testing the refresh and search paths against the real Reddit,
+OpenAI and Pinecone APIs costs money, is rate-limited and is never repeatable. This
+module provides a transport adapter for requests that every service's HTTP session can
+be switched into:
+
+- record: requests go to the network as usual and every response is saved to
+  HTTP_FIXTURE_DIR
+- replay: requests are answered from the saved responses without touching the network,
+  optionally after waiting the recorded latency (scaled by HTTP_FIXTURE_LATENCY_SCALE)
+
+The mode is chosen with the HTTP_FIXTURE_MODE environment variable. create_http_session
+mounts the adapter automatically, which covers openai_service and pinecone_service, and
+reddit_service hands PRAW such a session. Async PRAW does not use requests, so the
+asyncio Reddit backend is bypassed while fixtures are active.
+
+A request is identified by its method, URL and body (headers, including credentials,
+are ignored). The same request recorded several times is replayed in the recorded
+order, the last response repeating. Fixtures are stored as one JSON file per request:
+
+    HTTP_FIXTURE_DIR/
+        oauth.reddit.com/3f1c9a0b2d4e6f78.json
+        api.openai.com/9a8b7c6d5e4f3a2b.json
+
+Credentials are kept out of fixtures: request headers are not stored, and in JSON
+response bodies the values of credential keys (access_token, refresh_token, ...) are
+replaced with REDACTED_VALUE before writing, e.g. in Reddit's OAuth token response.
+Replay does not need them, since requests are matched without their headers. All other
+response content is stored unredacted, so review fixtures before sharing them.
+
+Replies depend on local state too (scrape cursors, the job journal), so every replay
+must start from the DATA_DIR the recording started from, e.g. a copy taken beforehand.
+
+Usage:
+    # Record one real refresh, then replay it offline as often as needed
+    export HTTP_FIXTURE_DIR=/tmp/fixtures
+    cp -r backend/data /tmp/bench-data
+    HTTP_FIXTURE_MODE=record python -c "from backend.services.reddit_service import refresh_posts; refresh_posts()"
+    DATA_DIR=/tmp/bench-data HTTP_FIXTURE_MODE=replay HTTP_FIXTURE_LATENCY_SCALE=0 \\
+        python -c "from backend.services.reddit_service import refresh_posts; print(refresh_posts())"
+
+    # Or mount the adapter on a session yourself
+    from utils.http_fixtures import FixtureAdapter
+
+    session.mount('https://', FixtureAdapter('replay'))
+"""
+
+import base64  # For storing binary response bodies
+import datetime  # For the replayed responses' elapsed time
+import hashlib  # For naming fixtures after their request
+import json  # For the fixture files
+import logging  # For logging loaded fixtures
+import os  # For atomically replacing fixture files
+import tempfile  # For writing fixture files before swapping them into place
+import threading  # For guarding the shared store across threads
+import time  # For measuring and simulating latency
+from pathlib import Path  # For cross-platform file paths
+from typing import Any, Dict, Optional, Union  # Type hints for better code documentation
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit  # For normalizing request URLs
+
+import requests  # HTTP client used by the API services
+from requests.adapters import HTTPAdapter  # Base transport adapter
+from requests.structures import CaseInsensitiveDict  # Header container of replayed responses
+from requests.utils import get_encoding_from_headers  # Text encoding of replayed responses
+
+# Import configuration from config file
+from ..config import (
+    HTTP_FIXTURE_MODE,  # '', 'record' or 'replay'
+    HTTP_FIXTURE_DIR,  # Directory holding recorded responses
+    HTTP_FIXTURE_LATENCY_SCALE,  # Multiple of the recorded latency waited on replay
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Supported values of HTTP_FIXTURE_MODE
+FIXTURE_MODES = ('record', 'replay')
+
+# Response headers that describe the original transfer rather than the body we store
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie'}
+
+# JSON keys whose values are credentials, at any depth of a response body
+_REDACTED_KEYS = {'access_token', 'refresh_token', 'id_token', 'client_secret', 'api_key', 'password'}
+
+# Stand-in stored for redacted values
+REDACTED_VALUE = 'REDACTED'
+
+
+class FixtureNotFoundError(requests.exceptions.ConnectionError):
+    """Raised in replay mode for a request that was never recorded."""
+
+
+def fixtures_enabled() -> bool:
+    """
+    Check whether HTTP traffic is being recorded or replayed.
+
+    Any non-empty HTTP_FIXTURE_MODE counts, so a misspelled mode fails loudly
+    when the first session is created instead of silently going to the network.
+
+    Returns:
+        bool: True if HTTP_FIXTURE_MODE is set
+    """
+    return bool(HTTP_FIXTURE_MODE)
+
+
+class FixtureStore:
+    """
+    Recorded responses on disk, keyed by request.
+
+    In replay mode all fixtures under the root are loaded up front. In record
+    mode the store starts empty, so a request recorded again replaces its old
+    fixture file instead of growing it across runs.
+    """
+
+    def __init__(self, root: Optional[Path] = None, load: bool = False):
+        """
+        Args:
+            root (Path, optional): Fixture directory. If None, uses HTTP_FIXTURE_DIR
+                from config.py.
+            load (bool, optional): Read the existing fixtures. Defaults to False.
+        """
+        self.root = Path(root or HTTP_FIXTURE_DIR)
+        self._lock = threading.Lock()
+        self._fixtures: Dict[str, Dict[str, Any]] = {}
+        self._served: Dict[str, int] = {}
+        if load:
+            for path in self.root.glob('*/*.json'):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._fixtures[path.stem] = json.load(f)
+            logger.info(f"Loaded {len(self._fixtures)} HTTP fixtures from {self.root}")
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response, elapsed: float) -> None:
+        """
+        Save a response received for a request.
+
+        Args:
+            request (PreparedRequest): The request that was sent
+            response (Response): The response; its body is read if it was streamed
+            elapsed (float): Seconds the request took
+        """
+        key = request_key(request)
+        content = _redact_body(response.content)
+        try:
+            body, encoding = content.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(content).decode('ascii'), 'base64'
+        recorded = {
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in _DROPPED_HEADERS
+            },
+            'body': body,
+            'body_encoding': encoding,
+            'elapsed': round(elapsed, 4),
+        }
+        with self._lock:
+            fixture = self._fixtures.setdefault(key, {
+                'method': request.method,
+                'url': _normalized_url(request.url),
+                'responses': [],
+            })
+            fixture['responses'].append(recorded)
+            self._write(key, fixture)
+
+    def replay(self, request: requests.PreparedRequest) -> Dict[str, Any]:
+        """
+        Return the next recorded response for a request.
+
+        Args:
+            request (PreparedRequest): The request being sent
+
+        Returns:
+            dict: Recorded response ('status', 'reason', 'headers', 'body',
+            'body_encoding' and 'elapsed')
+
+        Raises:
+            FixtureNotFoundError: If the request was never recorded
+        """
+        key = request_key(request)
+        with self._lock:
+            fixture = self._fixtures.get(key)
+            if fixture is None:
+                raise FixtureNotFoundError(
+                    f"No recorded response for {request.method} {request.url} (fixture {key})",
+                    request=request,
+                )
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            responses = fixture['responses']
+            return responses[min(served, len(responses) - 1)]
+
+    def _write(self, key: str, fixture: Dict[str, Any]) -> None:
+        """Persist one fixture, replacing its file atomically; the lock must be held."""
+        path = self.root / _host_dir(fixture['url']) / f"{key}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.fixture-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(fixture, f, indent=2)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+# Stores shared by all adapters of this process, one per fixture directory
+_stores: Dict[Path, FixtureStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_fixture_store(mode: str, root: Optional[Path] = None) -> FixtureStore:
+    """
+    Return the process-wide fixture store of a directory, creating it on first use.
+
+    Args:
+        mode (str): 'record' or 'replay'
+        root (Path, optional): Fixture directory. Defaults to HTTP_FIXTURE_DIR.
+
+    Returns:
+        FixtureStore: Store shared by every adapter using the directory
+    """
+    root = Path(root or HTTP_FIXTURE_DIR)
+    with _stores_lock:
+        store = _stores.get(root)
+        if store is None:
+            store = _stores[root] = FixtureStore(root, load=(mode == 'replay'))
+        return store
+
+
+class FixtureAdapter(HTTPAdapter):
+    """
+    Transport adapter that records responses to, or replays them from, a FixtureStore.
+
+    In record mode it behaves exactly like HTTPAdapter (including pooling and
+    retries) and saves every response it returns. In replay mode it never opens
+    a connection.
+
+    Example:
+        >>> session = requests.Session()
+        >>> session.mount('https://', FixtureAdapter('replay', latency_scale=0))
+        >>> session.get('https://api.pinecone.io/indexes/projects').status_code
+        200
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        root: Optional[Path] = None,
+        latency_scale: Optional[float] = None,
+        **kwargs: Any,
+    ):
+        """
+        Args:
+            mode (str): 'record' or 'replay'
+            root (Path, optional): Fixture directory. Defaults to HTTP_FIXTURE_DIR.
+            latency_scale (float, optional): Replayed responses wait this multiple of
+                their recorded latency (0 for none). Defaults to HTTP_FIXTURE_LATENCY_SCALE.
+            **kwargs: Passed on to HTTPAdapter (e.g., max_retries, pool_maxsize)
+
+        Raises:
+            ValueError: If the mode is not supported
+        """
+        if mode not in FIXTURE_MODES:
+            raise ValueError(f"HTTP fixture mode must be one of {FIXTURE_MODES}, got {mode!r}")
+        super().__init__(**kwargs)
+        self.mode = mode
+        self.store = get_fixture_store(mode, root)
+        self.latency_scale = HTTP_FIXTURE_LATENCY_SCALE if latency_scale is None else latency_scale
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        """Send (and record) the request, or answer it from the recorded fixtures."""
+        if self.mode == 'record':
+            started = time.perf_counter()
+            response = super().send(request, **kwargs)
+            self.store.record(request, response, time.perf_counter() - started)
+            return response
+
+        recorded = self.store.replay(request)
+        if self.latency_scale > 0:
+            time.sleep(recorded['elapsed'] * self.latency_scale)
+        return self._build_replayed_response(request, recorded)
+
+    def _build_replayed_response(
+        self, request: requests.PreparedRequest, recorded: Dict[str, Any]
+    ) -> requests.Response:
+        """Turn a recorded response into a requests Response for `request`."""
+        if recorded['body_encoding'] == 'base64':
+            content = base64.b64decode(recorded['body'])
+        else:
+            content = recorded['body'].encode('utf-8')
+
+        response = requests.Response()
+        response.status_code = recorded['status']
+        response.reason = recorded['reason']
+        response.headers = CaseInsensitiveDict(recorded['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = content
+        response.url = request.url
+        response.request = request
+        response.elapsed = datetime.timedelta(seconds=recorded['elapsed'])
+        response.connection = self
+        return response
+
+
+def request_key(request: requests.PreparedRequest) -> str:
+    """
+    Identify a request by its method, normalized URL and body.
+
+    Args:
+        request (PreparedRequest): Request to identify
+
+    Returns:
+        str: 16 hex characters
+    """
+    body: Union[str, bytes, None] = request.body
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    digest = hashlib.sha256()
+    digest.update(f"{request.method} {_normalized_url(request.url)}\n".encode('utf-8'))
+    digest.update(body or b'')
+    return digest.hexdigest()[:16]
+
+
+def _redact_body(content: bytes) -> bytes:
+    """Return a JSON body with its credential values replaced; other bodies are returned as is."""
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return content
+    redacted = _redact(data)
+    if redacted == data:
+        return content
+    return json.dumps(redacted).encode('utf-8')
+
+
+def _redact(value: Any) -> Any:
+    """Replace the values of credential keys in decoded JSON, recursively."""
+    if isinstance(value, dict):
+        return {
+            name: REDACTED_VALUE if name.lower() in _REDACTED_KEYS else _redact(item)
+            for name, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+def _normalized_url(url: str) -> str:
+    """Return the URL with its query parameters sorted."""
+    parts = urlsplit(url)
+    query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+
+def _host_dir(url: str) -> str:
+    """Return the fixture subdirectory of a URL (its host name)."""
+    return urlsplit(url).hostname or 'unknown'
@@ -0,0 +1,146 @@
+"""
+Text Cleaning Engine for Vibe Coding Project Finder
+
+This module turns raw Reddit markdown into the plain text that is classified, embedded
+and stored. It strips fenced code blocks, bare URLs, list/quote/header markers and
+emphasis, keeps the text of links and inline code, and collapses whitespace.
+
+Cleaning runs on every post of every refresh, replay and backfill, so it is built to
+never be the bottleneck:
+
+- Every rule is a precompiled pattern that starts with a literal, so the regex engine
+  can skip ahead to candidate positions instead of trying the rule at every character.
+- Each rule has trigger substrings (e.g. '](' for links). A rule only runs when its
+  trigger occurs in the text, which is a fast substring check; most posts are plain
+  prose and skip nearly every rule.
+- Whitespace is collapsed with str.split() rather than a regex.
+- clean_texts() cleans a whole batch and cleans repeated texts (cross-posted titles
+  and bodies) only once.
+
+Usage:
+    from utils.text_cleaning import clean_text, clean_texts
+
+    clean_text("**I built** [a tool](https://example.com)")  # 'I built a tool'
+    titles = clean_texts([post['title'] for post in raw_posts])
+
+    # Micro-benchmark
+    python -m backend.utils.text_cleaning
+"""
+
+import re  # For the cleaning patterns
+import time  # For the micro-benchmark
+from typing import Dict, List, Optional  # Type hints for better code documentation
+
+# Cleaning rules in the order they are applied: (pattern, replacement, triggers).
+# A rule is skipped when none of its trigger substrings occur in the text.
+CLEANING_RULES = (
+    (re.compile(r'```.*?```', re.DOTALL), ' ', ('```',)),  # Fenced code blocks
+    (re.compile(r'!?\[([^\]]*)\]\([^)]*\)'), r'\1', ('](',)),  # [text](url) and images
+    (re.compile(r'https?://\S+|www\.\S+'), ' ', ('http', 'www.')),  # Bare URLs
+    (re.compile(r'`([^`]*)`'), r'\1', ('`',)),  # Inline code spans (text is kept)
+)
+
+# Headers, quotes and list markers at the start of a line
+MARKDOWN_PREFIX_PATTERN = re.compile(r'^\s*(?:#{1,6}|>|[-*+]|\d+\.)\s+', re.MULTILINE)
+
+# Characters a text without newlines must start with for MARKDOWN_PREFIX_PATTERN to match
+_PREFIX_START_CHARS = frozenset('#>-*+0123456789 \t\r\f\v')
+
+# **bold**, *italic*, ~~strike~~
+EMPHASIS_PATTERN = re.compile(r'(\*{1,3}|~~)(\S(?:.*?\S)?)\1')
+
+
+def clean_text(text: str) -> str:
+    """
+    Strip markdown formatting, code blocks and URLs from text and normalize whitespace.
+
+    Args:
+        text (str): Raw title or selftext
+
+    Returns:
+        str: Cleaned single-line text
+
+    Example:
+        >>> clean_text("## Hello *world*\\n- see https://example.com")
+        'Hello world see'
+    """
+    for pattern, replacement, triggers in CLEANING_RULES:
+        if any(trigger in text for trigger in triggers):
+            text = pattern.sub(replacement, text)
+    if '\n' in text or text[:1] in _PREFIX_START_CHARS:
+        text = MARKDOWN_PREFIX_PATTERN.sub('', text)
+    if '*' in text or '~~' in text:
+        text = EMPHASIS_PATTERN.sub(r'\2', text)
+    return ' '.join(text.split())
+
+
+def clean_texts(texts: List[Optional[str]]) -> List[str]:
+    """
+    Clean a batch of texts.
+
+    Args:
+        texts (list): Raw titles or selftexts (None is treated as empty)
+
+    Returns:
+        list: Cleaned single-line texts, in the same order
+
+    Example:
+        >>> clean_texts(["# Hello *world*", "See https://example.com `now`"])
+        ['Hello world', 'See now']
+    """
+    cleaned: Dict[str, str] = {}
+    results = []
+    for text in texts:
+        text = text or ''
+        result = cleaned.get(text)
+        if result is None:
+            result = cleaned[text] = clean_text(text)
+        results.append(result)
+    return results
+
+
+def benchmark(texts: Optional[List[str]] = None, repeat: int = 5) -> Dict[str, float]:
+    """
+    Measure cleaning throughput.
+
+    Args:
+        texts (list, optional): Texts to clean. Defaults to 10,000 synthetic posts,
+            a third of them markdown-heavy and the rest plain prose.
+        repeat (int, optional): Number of runs; the fastest is reported. Defaults to 5.
+
+    Returns:
+        dict: 'texts_per_second' and 'megabytes_per_second'
+
+    Example:
+        >>> benchmark()
+        {'texts_per_second': 52000.0, 'megabytes_per_second': 14.1}
+    """
+    if texts is None:
+        prose = (
+            "I made a small tool that helps teachers plan lessons for the week. It is free "
+            "and I would love feedback on the interface and the onboarding flow. "
+        )
+        markdown = (
+            "## I built a **habit tracker** with [Next.js](https://nextjs.org)\n\n"
+            "- Syncs with `supabase`\n- Works offline\n> Feedback welcome!\n\n"
+            "```js\nconst x = 1;\n```\nDemo: https://example.com/demo ~~beta~~"
+        )
+        # Numbered so clean_texts() cannot skip them as repeats
+        texts = [f"{markdown if i % 3 == 0 else prose * 2} {i}" for i in range(10000)]
+
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        clean_texts(texts)
+        best = min(best, time.perf_counter() - started)
+
+    size = sum(len(text.encode('utf-8')) for text in texts)
+    return {
+        'texts_per_second': round(len(texts) / best, 1),
+        'megabytes_per_second': round(size / best / 1e6, 1),
+    }
+
+
+if __name__ == '__main__':
+    for name, value in benchmark().items():
+        print(f"{name}: {value:,.1f}")